@@ -0,0 +1,114 @@
+"""
+bench_ats_replay.py
+===================
+Offline ATS scoring throughput through the ``replay`` LLM provider.
+
+A synthetic capture (one canned reply per job description, as a
+``LLM_REPLAY_MODE = 'record'`` run would have saved) is replayed with a fixed
+per-call latency: sequentially via ``ATSScorer.score_job``, concurrently via
+``ATSScorer.ascore_job`` calls gathered together and batched via
+``ATSScorer.score_jobs``.
+No network is used. A batched reply is replayed with the same latency as a
+single one, whereas a real provider takes longer to write it, so the batched
+figure is an upper bound.
+
+Usage:
+  python benchmarks/bench_ats_replay.py [--jobs 40] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from langchain_core.messages.ai import AIMessage
+
+import config as cfg
+from src.libs.ats_scorer import ATSScorer
+from src.libs.llm_async import run_sync
+from src.libs.llm_manager import AIAdapter
+from src.libs.llm_replay import get_replay_store
+from src.libs.prompt_cache import prepare_prompt
+
+RESUME = Path(__file__).resolve().parents[1] / "data_folder_example" / "plain_text_resume.yaml"
+REPLY = json.dumps({
+    "score": 72,
+    "match_summary": "Solid operations background.",
+    "missing_keywords": ["SAP"],
+    "strong_points": ["inventory"],
+    "survival_tweaks": ["Quantify savings"],
+})
+
+
+def _scorer() -> ATSScorer:
+    cfg.LLM_MODEL_TYPE = "replay"
+    cfg.LLM_REPLAY_MODE = "replay"
+    return ATSScorer(AIAdapter({}, ""))
+
+
+def _batch_reply(count: int) -> str:
+    item = json.loads(REPLY)
+    return json.dumps({"results": [{**item, "job": n} for n in range(1, count + 1)]})
+
+
+def _job(i: int) -> str:
+    return f"Job {i}: Operations manager for warehouse {i}, inventory planning, vendor management, S&OP."
+
+
+async def _gather(coroutines):
+    return await asyncio.gather(*coroutines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="synthetic seconds per replayed call")
+    args = parser.parse_args()
+
+    cfg.LLM_CACHE_ENABLED = False
+    cfg.ATS_CACHE_ENABLED = False          # every mode must reach the provider
+    cfg.LLM_MODEL_TIERS = {}
+    # Measure scoring, not the default 60 rpm bucket
+    cfg.LLM_RATE_LIMITS = {"replay": {"rpm": 100_000, "tpm": 100_000_000}}
+    cfg.LLM_REPLAY_PATH = str(Path(tempfile.mkdtemp()) / "ats_replay.jsonl")
+    jobs = [_job(i) for i in range(args.jobs)]
+
+    store = get_replay_store()
+    resume = RESUME.read_text()
+    for jd in jobs:
+        store.record(prepare_prompt(ATSScorer._build_prompt(resume, jd)), AIMessage(content=REPLY), args.latency)
+
+    cfg.LLM_REPLAY_LATENCY_SECONDS = args.latency
+    player = _scorer()
+    batches = player._pack(resume, jobs)
+    for batch in batches:
+        prompt = prepare_prompt(ATSScorer._build_batch_prompt(resume, batch))
+        store.record(prompt, AIMessage(content=_batch_reply(len(batch))), args.latency)
+
+    started = time.perf_counter()
+    for jd in jobs:
+        player.score_job(RESUME, jd)
+    sequential = time.perf_counter() - started
+
+    started = time.perf_counter()
+    run_sync(_gather(player.ascore_job(RESUME, jd) for jd in jobs))
+    concurrent = time.perf_counter() - started
+
+    started = time.perf_counter()
+    player.score_jobs(RESUME, jobs)
+    batched = time.perf_counter() - started
+
+    print(f"jobs: {args.jobs}, replay latency: {args.latency:.2f}s, concurrency cap: {cfg.LLM_MAX_CONCURRENCY}")
+    print(f"sequential: {sequential:7.2f}s  ({args.jobs / sequential:6.1f} jobs/s)")
+    print(f"concurrent: {concurrent:7.2f}s  ({args.jobs / concurrent:6.1f} jobs/s)")
+    print(f"batched:    {batched:7.2f}s  ({args.jobs / batched:6.1f} jobs/s, {len(batches)} requests)")
+    print(f"replay store: {player.ai_adapter.model.store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
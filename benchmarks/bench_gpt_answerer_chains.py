@@ -0,0 +1,68 @@
+"""
+bench_gpt_answerer_chains.py
+============================
+Per-question chain preparation overhead in ``GPTAnswerer``.
+
+"before" rebuilds the 13 section chains plus the section classifier the way
+``answer_question_textual_wide_range`` used to on every question; "after"
+looks them up through ``PromptRegistry`` and the answerer's chain cache.
+No LLM is called.
+
+Usage:
+  python benchmarks/bench_gpt_answerer_chains.py [--questions 500]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+import config as cfg
+from src.libs.llm_manager import AIAdapter, GPTAnswerer, prompts
+
+
+def _answerer() -> GPTAnswerer:
+    cfg.LLM_CACHE_ENABLED = False
+    AIAdapter._create_model = lambda self, config, api_key: None
+    return GPTAnswerer({}, "bench")
+
+
+def before(answerer: GPTAnswerer, questions: int) -> float:
+    started = time.perf_counter()
+    for _ in range(questions):
+        for template_name in list(GPTAnswerer.SECTION_TEMPLATES.values()) + ["determine_section_template"]:
+            prompt = ChatPromptTemplate.from_template(getattr(prompts, template_name))
+            prompt | answerer.llm_cheap | StrOutputParser()
+    return time.perf_counter() - started
+
+
+def after(answerer: GPTAnswerer, questions: int) -> float:
+    started = time.perf_counter()
+    for _ in range(questions):
+        answerer._chain("determine_section_template")
+        answerer._chain(GPTAnswerer.SECTION_TEMPLATES["experience_details"])
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--questions", type=int, default=500)
+    args = parser.parse_args()
+
+    answerer = _answerer()
+    t_before = before(answerer, args.questions)
+    t_after = after(answerer, args.questions)
+    per_before = t_before / args.questions * 1e6
+    per_after = t_after / args.questions * 1e6
+    print(f"questions: {args.questions}")
+    print(f"before: {per_before:10.1f} us/question")
+    print(f"after:  {per_after:10.1f} us/question  ({per_before / max(per_after, 1e-9):.0f}x less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+bench_heuristic_scorer.py
+=========================
+Local (no LLM) ATS scoring throughput over synthetic job descriptions.
+
+Compares the token-overlap heuristic ``ATSScorer`` used before
+``src/libs/ats_heuristic.py``, the new index scoring one description at a
+time (``ResumeIndex.score``) and the vectorised ``ResumeIndex.score_many``.
+The first scoring pass builds the resume index; it is timed separately.
+
+Usage:
+  python benchmarks/bench_heuristic_scorer.py [--jobs 5000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.libs.ats_heuristic import ResumeIndex
+
+RESUME = Path(__file__).resolve().parents[1] / "data_folder_example" / "plain_text_resume.yaml"
+VOCABULARY = (
+    "inventory planning vendor management s&op demand forecasting warehouse operations sap erp lean six sigma "
+    "procurement logistics python kubernetes react aws microservices distributed systems ci cd pipelines "
+    "stakeholder communication budget ownership kpi reporting supplier negotiation transportation "
+    "continuous improvement data analysis sql tableau excel cross functional leadership"
+).split()
+BOILERPLATE = "We are looking for a {title} to join our growing team. You will"
+
+
+def _job(rng: random.Random) -> str:
+    title = rng.choice(["Operations Manager", "Supply Chain Analyst", "Software Engineer", "Buyer"])
+    sentences = [BOILERPLATE.format(title=title)]
+    for _sentence in range(rng.randint(8, 16)):
+        sentences.append(" ".join(rng.choice(VOCABULARY) for _word in range(rng.randint(6, 14))) + ".")
+    return " ".join(sentences)
+
+
+def _overlap_score(resume: str, jd: str) -> int:
+    """The previous heuristic: shared whitespace tokens, two points each."""
+    resume_tokens = set(resume.lower().replace("\n", " ").split())
+    jd_tokens = set(jd.lower().replace("\n", " ").split())
+    return int(min(100, len(resume_tokens & jd_tokens) * 2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [_job(rng) for _job_number in range(args.jobs)]
+    resume = RESUME.read_text()
+
+    started = time.perf_counter()
+    for jd in jobs:
+        _overlap_score(resume, jd)
+    overlap = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = ResumeIndex(resume)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for jd in jobs:
+        index.score(jd)
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = index.score_many(jobs)
+    many = time.perf_counter() - started
+
+    print(f"jobs: {args.jobs}, resume index: {index.resume_terms} terms built in {build * 1000:.1f} ms")
+    print(f"overlap (old):  {overlap:7.3f}s  ({args.jobs / overlap:9.0f} jobs/s, no keywords)")
+    print(f"index.score:    {single:7.3f}s  ({args.jobs / single:9.0f} jobs/s)")
+    print(f"score_many:     {many:7.3f}s  ({args.jobs / many:9.0f} jobs/s)")
+    print(f"sample: score {results[0]['score']}, missing {results[0]['missing_keywords'][:5]}")
+
+
+if __name__ == "__main__":
+    main()
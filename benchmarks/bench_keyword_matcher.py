@@ -0,0 +1,96 @@
+"""
+bench_keyword_matcher.py
+========================
+Dictionary matching over synthetic job descriptions: the per-keyword
+``keyword in text`` scans ``ATSScorer`` used before against the
+Aho-Corasick ``KeywordMatcher`` (``match_many`` and ``hit_matrix``).
+
+Runs the built-in alignment dictionaries (19 terms) and a synthetic
+dictionary of ``--terms`` one- to three-word terms. The scans also match
+inside words, so on real text their hit counts can be higher.
+
+Usage:
+  python benchmarks/bench_keyword_matcher.py [--jobs 2000] [--terms 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.libs.ats_scorer import DEFAULT_DICTIONARIES
+from src.libs.keyword_matcher import KeywordMatcher
+
+WORDS = (
+    "inventory planning vendor management demand forecasting warehouse operations sap erp lean six sigma "
+    "procurement logistics python kubernetes react aws microservices distributed systems backend frontend "
+    "stakeholder communication budget kpi reporting supplier negotiation transportation clinical trials "
+    "continuous improvement data analysis sql tableau excel cross functional leadership supply chain s&op"
+).split()
+
+
+def _dictionary(rng: random.Random, size: int):
+    terms = set()
+    while len(terms) < size:
+        terms.add(" ".join(rng.choice(WORDS) for _word in range(rng.randint(1, 3))))
+    terms = sorted(terms)
+    return {"in_scope": terms[: size // 2], "out_of_scope": terms[size // 2:]}
+
+
+def _job(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _word in range(rng.randint(150, 400))).capitalize() + "."
+
+
+def _scan(dictionaries, texts):
+    """The previous approach: one substring scan per keyword per text."""
+    hits = 0
+    for text in texts:
+        lowered = text.lower()
+        for terms in dictionaries.values():
+            hits += len([term for term in terms if term in lowered])
+    return hits
+
+
+def _compare(label, dictionaries, jobs) -> None:
+    started = time.perf_counter()
+    scan_hits = _scan(dictionaries, jobs)
+    scan = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher(dictionaries)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matched = matcher.match_many(jobs)
+    many = time.perf_counter() - started
+    match_hits = sum(len(terms) for hits in matched for terms in hits.values())
+
+    started = time.perf_counter()
+    matcher.hit_matrix(jobs)
+    matrix = time.perf_counter() - started
+
+    print(f"{label}: {len(matcher.terms)} terms, automaton built in {build * 1000:.1f} ms")
+    print(f"  substring scans: {scan:7.3f}s  ({len(jobs) / scan:8.0f} jobs/s, {scan_hits} hits)")
+    print(f"  match_many:      {many:7.3f}s  ({len(jobs) / many:8.0f} jobs/s, {match_hits} hits)")
+    print(f"  hit_matrix:      {matrix:7.3f}s  ({len(jobs) / matrix:8.0f} jobs/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--terms", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [_job(rng) for _job_number in range(args.jobs)]
+    print(f"jobs: {args.jobs}")
+    _compare("built-in dictionaries", DEFAULT_DICTIONARIES, jobs)
+    _compare("synthetic dictionary", _dictionary(rng, args.terms), jobs)
+
+
+if __name__ == "__main__":
+    main()
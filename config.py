@@ -18,8 +18,149 @@ JOB_MAX_APPLICATIONS = 5
 JOB_MIN_APPLICATIONS = 1
 
 # Selectable LLM provider: 'gemini' | 'openai' | 'claude' | 'ollama' | 'huggingface' | 'perplexity'
+# ('stub' answers offline without network access, for tests and dry runs; 'replay' records or
+#  replays real replies, see LLM_REPLAY_* below)
 LLM_MODEL_TYPE = 'gemini'
 # Gemini 2.5 Flash is the baseline model; change to any model supported by the chosen provider
 LLM_MODEL = 'gemini-2.5-flash'
 # Only required for OLLAMA models
 LLM_API_URL = ''
+
+# Persistent LLM response cache shared by every AIAdapter (see src/libs/llm_cache.py)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = 'data_folder/output/llm_cache.sqlite3'
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+LLM_CACHE_MAX_ENTRIES = 5000
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Async LLM calls: max in-flight requests per provider and size of the shared HTTP pool
+LLM_MAX_CONCURRENCY = 4
+LLM_PROVIDER_CONCURRENCY = {'ollama': 1}
+LLM_HTTP_MAX_CONNECTIONS = 20
+
+# Provider rate limits (requests / tokens per minute) and the shared retry policy
+# used by every LLM call (see src/libs/llm_rate_limiter.py)
+LLM_RATE_LIMITS = {
+    'gemini': {'rpm': 10, 'tpm': 250_000},
+    'openai': {'rpm': 500, 'tpm': 200_000},
+    'claude': {'rpm': 50, 'tpm': 40_000},
+    'perplexity': {'rpm': 50, 'tpm': 100_000},
+    'huggingface': {'rpm': 60, 'tpm': 100_000},
+    'ollama': {'rpm': 600, 'tpm': 10_000_000},
+}
+LLM_MAX_RETRIES = 5
+LLM_CALL_DEADLINE_SECONDS = 180
+LLM_CIRCUIT_BREAKER_THRESHOLD = 5
+LLM_CIRCUIT_BREAKER_RESET_SECONDS = 60
+
+# Provider failover (see src/libs/llm_failover.py); fallbacks are the ordered `llm_providers`
+# list in secrets.yaml. These apply only when at least one fallback is configured.
+LLM_FAILOVER_MAX_RETRIES = 1          # retries per provider before failing over
+LLM_FAILOVER_TIMEOUT_SECONDS = 60     # per-provider time limit for one call
+LLM_HEDGE_ENABLED = False             # race the next provider once a call exceeds its p95 latency
+LLM_HEDGE_MIN_SAMPLES = 20            # calls needed before a provider's p95 is trusted
+
+# Record/replay provider for offline benchmarks and tests (LLM_MODEL_TYPE = 'replay';
+# see src/libs/llm_replay.py)
+LLM_REPLAY_MODE = 'replay'                     # 'record' calls LLM_REPLAY_UPSTREAM and saves replies
+LLM_REPLAY_PATH = 'data_folder/output/llm_replay.jsonl'
+LLM_REPLAY_UPSTREAM = ('gemini', 'gemini-2.5-flash')   # (provider, model) called in 'record' mode
+LLM_REPLAY_ON_MISS = 'error'                   # 'error' | 'stub' for prompts never recorded
+LLM_REPLAY_LATENCY_SECONDS = None              # None replays the recorded latency
+LLM_REPLAY_OUTPUT_TOKENS_PER_SECOND = 0        # >0 adds output_tokens / rate to each reply's delay
+LLM_REPLAY_TOKEN_SCALE = 1.0                   # multiplies the replayed token counts
+
+# LLM call log (JSONL, written by a background thread; see src/libs/llm_call_log.py)
+LLM_CALL_LOG_PATH = 'data_folder/output/open_ai_calls.jsonl'
+LLM_CALL_LOG_MAX_BYTES = 20 * 1024 * 1024   # rotate the active file past this size
+LLM_CALL_LOG_BACKUPS = 5                    # rotated files to keep
+LLM_CALL_LOG_COMPRESS = False               # zstd-compress rotated files (set True after `pip install zstandard`)
+# Per-model USD prices per token as (prompt, completion); unknown models use the gpt-4o-mini rates
+LLM_PRICING = {
+    'gpt-4o-mini': (0.00000015, 0.0000006),
+}
+# Share of the prompt price saved on input tokens served from the provider's prompt cache
+LLM_CACHED_INPUT_DISCOUNTS = {'openai': 0.5, 'claude': 0.9, 'gemini': 0.75}
+
+# Local section router for form questions (see src/libs/section_router.py)
+SECTION_ROUTER_ENABLED = True
+SECTION_ROUTER_CONFIDENCE = 0.5     # below this margin the LLM classifier decides
+SECTION_ROUTER_AUDIT_RATE = 0.0     # share of confident routes also checked by the LLM
+SECTION_ROUTER_LOG_PATH = 'data_folder/output/section_routes.jsonl'
+
+# Cross-job answer memory for recurring form questions (see src/libs/answer_memory.py)
+ANSWER_MEMORY_ENABLED = True
+ANSWER_MEMORY_PATH = 'data_folder/output/answer_memory.sqlite3'
+ANSWER_MEMORY_MAX_DISTANCE = 0.2    # max Levenshtein distance as a share of question length
+
+# Job description summaries (see src/libs/job_summarizer.py)
+JOB_SUMMARY_CACHE_PATH = 'data_folder/output/job_summaries.sqlite3'
+JOB_SUMMARY_CACHE_TTL_SECONDS = 30 * 24 * 3600
+JOB_SUMMARY_BATCH_TOKEN_BUDGET = 12000   # estimated input tokens per batched request
+JOB_SUMMARY_BATCH_MAX_JOBS = 8           # descriptions per batched request
+
+# Batched ATS scoring (see ATSScorer.score_jobs)
+ATS_BATCH_TOKEN_BUDGET = 12000           # estimated input tokens per batched request
+ATS_BATCH_MAX_JOBS = 10                  # job descriptions per batched request
+
+# Job funnel in BotManager.run_batch (see src/libs/job_funnel.py)
+ATS_FUNNEL_TOP_K = 10                    # jobs per search page sent on to LLM scoring
+ATS_FUNNEL_MIN_SCORE = 15                # local heuristic score below which a job is dropped
+
+# ATS alignment dictionaries: YAML mapping of category -> terms (see src/libs/keyword_matcher.py).
+# 'in_scope' and 'out_of_scope' replace the built-in lists; other categories are reported as hits.
+ATS_DICTIONARIES_PATH = "data_folder/keyword_dictionaries.yaml"
+
+# Persistent ATS result cache (see src/libs/ats_cache.py)
+ATS_CACHE_ENABLED = True
+ATS_CACHE_PATH = 'data_folder/output/ats_cache.sqlite3'
+ATS_CACHE_TTL_SECONDS = 30 * 24 * 3600
+ATS_CACHE_MAX_ENTRIES = 20000
+
+# Near-duplicate job postings across searches, platforms and runs (see src/libs/job_dedup.py)
+JOB_DEDUP_ENABLED = True
+JOB_DEDUP_PATH = 'data_folder/output/job_index.sqlite3'
+JOB_DEDUP_MAX_DISTANCE = 3               # SimHash bits two descriptions of the same posting may differ by
+JOB_DEDUP_TTL_SECONDS = 30 * 24 * 3600   # how long a seen posting keeps later copies out
+
+# Relevance-trimmed resume context in prompts (see src/libs/resume_context.py)
+RESUME_CONTEXT_ENABLED = True
+RESUME_CONTEXT_DEFAULT_TOKENS = 800      # resume tokens per prompt for tasks not listed below
+RESUME_CONTEXT_TOKEN_BUDGETS = {
+    'options_matching': 400,
+    'ats_scoring': 1500,
+    'cover_letter': 1200,
+}
+# Tasks that repeat the resume for every job send the same query-independent text, so the
+# provider's prompt cache can reuse it (see src/libs/prompt_cache.py)
+RESUME_CONTEXT_STABLE_TASKS = ('ats_scoring', 'cover_letter')
+
+# Task-based model routing (see src/libs/model_router.py): task -> tier -> {provider: model}.
+# A tier without a model for LLM_MODEL_TYPE uses LLM_MODEL; unlisted tasks use 'standard'.
+LLM_TASK_TIERS = {
+    'section_classification': 'fast',
+    'resume_or_cover': 'fast',
+    'options_matching': 'fast',
+    'numeric_answer': 'fast',
+    'job_summary': 'fast',
+    'job_parsing': 'standard',
+    'ats_scoring': 'standard',
+    'textual_answer': 'standard',
+    'briefing': 'standard',
+    'tailoring': 'strong',
+    'resume_generation': 'strong',
+    'cover_letter': 'strong',
+}
+LLM_MODEL_TIERS = {
+    'fast': {
+        'gemini': 'gemini-2.5-flash-lite',
+        'openai': 'gpt-4o-mini',
+        'claude': 'claude-3-5-haiku-latest',
+    },
+    'standard': {},
+    'strong': {
+        'gemini': 'gemini-2.5-pro',
+        'openai': 'gpt-4o',
+        'claude': 'claude-sonnet-4-0',
+    },
+}
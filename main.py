@@ -7,20 +7,10 @@ from typing import List, Optional, Tuple, Dict
 import click
 import inquirer
 import yaml
-from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 import re
 import json
-from src.libs.resume_and_cover_builder import ResumeFacade, ResumeGenerator, StyleManager
-from src.inbox.service import InboxScanService
 from src.application_stats import ApplicationStatsService
-from src.bots.bot_manager import BotManager
-from src.resume_schemas.job_application_profile import JobApplicationProfile
-from src.resume_schemas.resume import Resume
-from src.logging import logger
-from src.utils.chrome_utils import init_browser
+from src.logging import init_logging, logger
 from src.utils.constants import (
     PLAIN_TEXT_RESUME_YAML,
     SECRETS_YAML,
@@ -204,8 +194,10 @@ class ConfigValidator:
         if "llm_api_key" in secrets and secrets["llm_api_key"]:
             return secrets["llm_api_key"]
 
-        # Ollama doesn't need an API key
-        if model_type == "ollama":
+        # Ollama and the offline stub/replay providers don't need an API key
+        if model_type in ("ollama", "stub") or (
+            model_type == "replay" and getattr(cfg, "LLM_REPLAY_MODE", "replay") == "replay"
+        ):
             return ""
 
         key_name = specific_key or "llm_api_key"
@@ -262,6 +254,10 @@ def create_cover_letter(parameters: dict, llm_api_key: str):
         with open(parameters["uploads"]["plainTextResume"], "r", encoding="utf-8") as file:
             plain_text_resume = file.read()
 
+        from src.libs.resume_and_cover_builder import ResumeFacade, ResumeGenerator, StyleManager
+        from src.resume_schemas.resume import Resume
+        from src.utils.chrome_utils import init_browser
+
         style_manager = StyleManager()
         available_styles = style_manager.get_styles()
 
@@ -349,6 +345,10 @@ def create_resume_pdf_job_tailored(parameters: dict, llm_api_key: str):
         with open(parameters["uploads"]["plainTextResume"], "r", encoding="utf-8") as file:
             plain_text_resume = file.read()
 
+        from src.libs.resume_and_cover_builder import ResumeFacade, ResumeGenerator, StyleManager
+        from src.resume_schemas.resume import Resume
+        from src.utils.chrome_utils import init_browser
+
         style_manager = StyleManager()
         available_styles = style_manager.get_styles()
 
@@ -434,6 +434,10 @@ def create_resume_pdf(parameters: dict, llm_api_key: str):
         with open(parameters["uploads"]["plainTextResume"], "r", encoding="utf-8") as file:
             plain_text_resume = file.read()
 
+        from src.libs.resume_and_cover_builder import ResumeFacade, ResumeGenerator, StyleManager
+        from src.resume_schemas.resume import Resume
+        from src.utils.chrome_utils import init_browser
+
         # Initialize StyleManager
         style_manager = StyleManager()
         available_styles = style_manager.get_styles()
@@ -529,6 +533,8 @@ def scan_email_inbox(parameters: dict):
         if not secrets_file:
             raise ConfigError("Missing secrets file path in runtime parameters")
 
+        from src.inbox.service import InboxScanService
+
         secrets = ConfigValidator.load_yaml(secrets_file)
         scanner = InboxScanService(output_directory=Path(parameters["outputFileDirectory"]))
         summary = scanner.run_scan(secrets=secrets, lookback_hours=lookback_hours)
@@ -566,9 +572,9 @@ def generate_recruiter_briefing(parameters: dict, llm_api_key: str):
             return
 
         from src.libs.recruiter_prep import RecruiterPrepEngine
-        from src.libs.llm_manager import AIAdapter
+        from src.libs.model_router import BRIEFING, ModelRouter
         
-        ai_adapter = AIAdapter(parameters, llm_api_key)
+        ai_adapter = ModelRouter(parameters, llm_api_key).for_task(BRIEFING)
         engine = RecruiterPrepEngine(ai_adapter)
         
         resume_path = parameters["uploads"]["plainTextResume"]
@@ -622,9 +628,9 @@ def analyze_job_match(parameters: dict, llm_api_key: str):
             return
 
         from src.libs.ats_scorer import ATSScorer
-        from src.libs.llm_manager import AIAdapter
+        from src.libs.model_router import ATS_SCORING, ModelRouter
         
-        ai_adapter = AIAdapter(parameters, llm_api_key)
+        ai_adapter = ModelRouter(parameters, llm_api_key).for_task(ATS_SCORING)
         scorer = ATSScorer(ai_adapter)
         
         resume_path = parameters["uploads"]["plainTextResume"]
@@ -689,7 +695,9 @@ def run_application_bot(parameters: dict, llm_api_key: str):
             
         secrets_file = parameters.get("secretsFile")
         secrets = ConfigValidator.load_yaml(secrets_file)
-        
+
+        from src.bots.bot_manager import BotManager
+
         manager = BotManager(secrets=secrets, config=parameters, llm_api_key=llm_api_key)
         
         if platform == "LinkedIn":
@@ -799,6 +807,7 @@ def prompt_user_action() -> str:
 
 def main():
     """Main entry point for the AIHawk Job Application Bot."""
+    init_logging()
     try:
         # Define and validate the data folder
         data_folder = Path("data_folder")
@@ -5,10 +5,13 @@ user_site = site.getusersitepackages()
 if user_site and user_site not in sys.path:
     sys.path.append(user_site)
 
+from src.logging import init_logging
 from src.web.server import app
 
 
 if __name__ == "__main__":
     import uvicorn
 
+    init_logging()
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -3,14 +3,14 @@ import os
 from typing import List, Dict, Any
 from pathlib import Path
 
-from src.bots.linkedin_bot import LinkedInBot
-from src.bots.indeed_bot import IndeedBot
 from src.job_application import JobApplication
 from src.job_application_saver import ApplicationSaver
 from src.logging import logger
 from src.application_stats import ApplicationStatsService
 from src.libs.ats_scorer import ATSScorer
-from src.libs.llm_manager import AIAdapter
+from src.libs.job_dedup import JobIndex, get_job_index
+from src.libs.job_funnel import JobFunnel, job_text
+from src.libs.model_router import ATS_SCORING, TAILORING, ModelRouter
 from src.libs.resume_parser import extract_positions, extract_skills
 from src.libs.resume_tailor import ResumeTailor
 
@@ -22,19 +22,27 @@ class BotManager:
         self.applications_dir = Path("job_applications")
         self.applications_dir.mkdir(exist_ok=True)
         self.ai_adapter = None
+        tailor_adapter = None
         selected_key = llm_api_key or secrets.get("llm_api_key", "")
         if selected_key:
             try:
-                self.ai_adapter = AIAdapter(config, selected_key)
+                router = ModelRouter(config, selected_key)
+                self.ai_adapter = router.for_task(ATS_SCORING)
+                tailor_adapter = router.for_task(TAILORING)
             except Exception as exc:
                 logger.warning(f"LLM adapter unavailable, using heuristic ATS scoring: {exc}")
         self.scorer = ATSScorer(self.ai_adapter)
-        self.tailor = ResumeTailor(self.ai_adapter)
+        self.tailor = ResumeTailor(tailor_adapter)
         self.resume_path = config.get("uploads", {}).get("plainTextResume", Path("data_folder/plain_text_resume.yaml"))
+        self.funnel = JobFunnel(self.scorer, config, self.resume_path)
 
     def run_batch(self, platform: str = "linkedin", count: int = 5):
         logger.info(f"Starting {platform} batch for {count} jobs")
         
+        # The bots pull in selenium; only a batch run needs them
+        from src.bots.indeed_bot import IndeedBot
+        from src.bots.linkedin_bot import LinkedInBot
+
         bot = None
         if platform.lower() == "linkedin":
             bot = LinkedInBot(self.secrets)
@@ -49,6 +57,11 @@ class BotManager:
             bot.login()
         else:
             logger.info("Dry-run enabled: skipping browser login and submitting simulated applications.")
+
+        # Postings applied to in earlier runs, or already returned by an earlier search in
+        # this run, are dropped before scoring. Dry runs do not record applications.
+        job_index = None if dry_run else get_job_index()
+        seen_this_run = JobIndex(path=None)
         
         # Derive search positions from the user's resume.
         # config["positions"] (passed from the UI or CLI) takes precedence;
@@ -76,15 +89,17 @@ class BotManager:
                 logger.info(f"Searching for '{position}' in '{location}'")
                 remaining = count - applied_count
                 jobs = bot.search_jobs(position, location, count=remaining)
-                
-                for job in jobs:
+                jobs = (seen_this_run if job_index is None else job_index).deduplicate(jobs, batch=seen_this_run)
+
+                # ATS Scoring: blacklists and the local scorer first, the LLM only for the top-K
+                logger.info(f"Scoring {len(jobs)} jobs for '{position}' in '{location}'")
+                funnel = self.funnel.run(jobs)
+
+                for job, analysis in funnel.candidates:
                     if applied_count >= count:
                         break
                     
                     try:
-                        # ATS Scoring
-                        logger.info(f"Scoring job: {job.role} at {job.company}")
-                        analysis = self.scorer.score_job(self.resume_path, job.description or f"{job.role} at {job.company}")
                         score = analysis.get("score", 0)
                         
                         from config import JOB_SUITABILITY_SCORE
@@ -101,7 +116,7 @@ class BotManager:
                             logger.info(f"Tailoring resume for {job.role} at {job.company}")
                             tailored = self.tailor.tailor(
                                 base_resume_path=self.resume_path,
-                                job_description=job.description or f"{job.role} at {job.company}",
+                                job_description=job_text(job),
                                 ats_analysis=analysis,
                                 job_id=f"{job.company}_{job.role}".replace(" ", "_").lower(),
                                 job_title=job.role,
@@ -126,6 +141,8 @@ class BotManager:
                             self.tailor._save_metadata(tailored)
 
                         ApplicationSaver.save(application)
+                        if job_index is not None and application.status == "applied":
+                            job_index.record(job)
                         applied_count += 1
                         logger.info(f"Successfully applied to {job.role} at {job.company} | tailored_resume={'yes' if tailored else 'no'}")
                     except Exception as e:
@@ -13,6 +13,7 @@ class Job:
     recruiter_link: str = ""
     resume_path: str = ""
     cover_letter_path: str = ""
+    cluster_id: str = ""  # shared by near-duplicate postings (see src/libs/job_dedup.py)
 
     @property
     def id(self):
@@ -22,6 +23,9 @@ class Job:
     def title(self):
         return self.role
 
+    def set_summarize_job_description(self, summarize_job_description: str):
+        self.summarize_job_description = summarize_job_description
+
     def formatted_job_information(self):
         """
         Formats the job information as a markdown string.
@@ -0,0 +1,244 @@
+"""
+answer_memory.py
+================
+Persistent memory of answers to application-form questions, shared across
+jobs so recurring questions ("years of experience with X", "authorized to
+work in the US", "expected salary") are answered without an LLM call.
+
+Key
+---
+  (kind, normalised option set, normalised question, profile fingerprint)
+
+``kind`` is ``numeric``, ``options`` or ``textual``. The profile fingerprint
+hashes the resume and ``job_application_profile``; answers recorded against a
+different fingerprint are never returned and are purged when the profile
+changes.
+
+Near-duplicate wording is matched with Levenshtein distance over the
+normalised question. A fuzzy match also has to mention the same subject
+terms (up to single-character typos), so "experience with Java" never
+answers "experience with JavaScript" and "C" never answers "R".
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from Levenshtein import distance
+
+from src.logging import logger
+
+
+DEFAULT_MEMORY_PATH = Path("data_folder/output/answer_memory.sqlite3")
+DEFAULT_MAX_DISTANCE = 0.2
+
+_FILLER_WORDS = frozenset(
+    "a an and any are as at be been by can currently did do does for from have "
+    "how i if in is it many me much of on or please s select the this to what "
+    "which will with would you your".split()
+)
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, drop punctuation/required-field markers and collapse spaces."""
+    return " ".join(_NON_WORD_RE.sub(" ", (text or "").lower()).split())
+
+
+def normalize_options(options: Optional[Iterable[str]]) -> str:
+    if not options:
+        return ""
+    return "|".join(sorted(normalize_question(option) for option in options))
+
+
+def subject_terms(normalized_question: str) -> frozenset:
+    terms = set()
+    for token in normalized_question.split():
+        if token in _FILLER_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.add(token)
+    return frozenset(terms)
+
+
+def profile_fingerprint(*objects: Any) -> str:
+    """Stable hash of the resume / application profile objects."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        if obj is None:
+            rendered = ""
+        elif hasattr(obj, "model_dump_json"):
+            rendered = obj.model_dump_json()
+        else:
+            rendered = repr(obj)
+        digest.update(rendered.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+
+def _same_subject(a: frozenset, b: frozenset) -> bool:
+    only_a, only_b = a - b, b - a
+    if len(only_a) != len(only_b):
+        return False
+    for term in only_a:
+        if not any(
+            min(len(term), len(other)) >= 5 and distance(term, other, score_cutoff=1) <= 1
+            for other in only_b
+        ):
+            return False
+    return True
+
+
+class AnswerMemory:
+    """SQLite-backed answer store with an in-memory index per profile."""
+
+    def __init__(self, path: Path = DEFAULT_MEMORY_PATH, max_distance: float = DEFAULT_MAX_DISTANCE):
+        self.path = Path(path)
+        self.max_distance = max_distance
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[str] = None
+        # (kind, options_key) -> {normalised question: (answer, subject terms)}
+        self._index: Dict[Tuple[str, str], Dict[str, Tuple[str, frozenset]]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                kind TEXT NOT NULL,
+                options_key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                raw_question TEXT,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, options_key, question, fingerprint)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def set_profile(self, fingerprint: str) -> None:
+        """Switch to ``fingerprint``; answers recorded for other profiles are dropped."""
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return
+            purged = self._conn.execute(
+                "DELETE FROM answers WHERE fingerprint != ?", (fingerprint,)
+            ).rowcount
+            self._conn.commit()
+            if purged:
+                logger.info(f"Answer memory: profile changed, dropped {purged} stale answers")
+            self._fingerprint = fingerprint
+            self._index = {}
+            for kind, options_key, question, answer in self._conn.execute(
+                "SELECT kind, options_key, question, answer FROM answers WHERE fingerprint = ?",
+                (fingerprint,),
+            ):
+                self._index.setdefault((kind, options_key), {})[question] = (answer, subject_terms(question))
+
+    def recall(self, kind: str, question: str, options: Optional[Sequence[str]] = None) -> Optional[str]:
+        if self._fingerprint is None:
+            return None
+        normalized = normalize_question(question)
+        with self._lock:
+            bucket = self._index.get((kind, normalize_options(options)))
+            if not bucket:
+                self.misses += 1
+                return None
+            exact = bucket.get(normalized)
+            if exact is not None:
+                self.hits += 1
+                return exact[0]
+            answer = self._fuzzy_lookup(bucket, normalized)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.fuzzy_hits += 1
+            return answer
+
+    def remember(self, kind: str, question: str, answer: str, options: Optional[Sequence[str]] = None) -> None:
+        if self._fingerprint is None or not answer:
+            return
+        normalized = normalize_question(question)
+        options_key = normalize_options(options)
+        with self._lock:
+            self._index.setdefault((kind, options_key), {})[normalized] = (answer, subject_terms(normalized))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers "
+                "(kind, options_key, question, fingerprint, answer, raw_question, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, options_key, normalized, self._fingerprint, answer, question, time.time()),
+            )
+            self._conn.commit()
+
+    def _fuzzy_lookup(self, bucket: Dict[str, Tuple[str, frozenset]], normalized: str) -> Optional[str]:
+        terms = subject_terms(normalized)
+        best: Optional[Tuple[int, str]] = None
+        for candidate, (answer, candidate_terms) in bucket.items():
+            budget = int(self.max_distance * max(len(candidate), len(normalized)))
+            if abs(len(candidate) - len(normalized)) > budget:
+                continue
+            dist = distance(normalized, candidate, score_cutoff=budget)
+            if dist > budget or not _same_subject(terms, candidate_terms):
+                continue
+            if best is None or dist < best[0]:
+                best = (dist, answer)
+        return best[1] if best else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = sum(len(bucket) for bucket in self._index.values())
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+            self._index = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_memory: Optional[AnswerMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_answer_memory() -> Optional[AnswerMemory]:
+    """Process-wide answer memory built from config, or None when disabled."""
+    global _memory
+    import config as cfg
+
+    if not getattr(cfg, "ANSWER_MEMORY_ENABLED", True):
+        return None
+    with _memory_lock:
+        if _memory is None:
+            try:
+                _memory = AnswerMemory(
+                    path=Path(getattr(cfg, "ANSWER_MEMORY_PATH", DEFAULT_MEMORY_PATH)),
+                    max_distance=getattr(cfg, "ANSWER_MEMORY_MAX_DISTANCE", DEFAULT_MAX_DISTANCE),
+                )
+            except Exception as exc:
+                logger.warning(f"Answer memory disabled: {exc}")
+                return None
+        return _memory
@@ -0,0 +1,194 @@
+"""
+ats_cache.py
+============
+Persistent cache of finished ATS analyses.
+
+The same posting turns up under several position/location searches, as a
+repost and again after a restart, and each time ``ATSScorer`` paid for an LLM
+call. Scored results are now stored in SQLite under
+
+  sha256( resume content hash | normalised job description hash | scorer version )
+
+where the scorer version covers the prompt revision (``ATS_SCORER_VERSION``),
+the alignment dictionaries and the model. Editing the resume, changing the
+alignment rules or switching models therefore misses instead of returning a
+stale score. Stale entries are never read again and age out through the TTL
+and LRU limits.
+
+The stored value is the full analysis dict, alignment adjustments,
+``missing_keywords`` and ``survival_tweaks`` included. Only successful LLM
+analyses are stored; heuristic and fallback results are cheap or temporary.
+``get_ats_cache()`` returns the shared instance configured by the
+``ATS_CACHE_*`` keys in config.py, or None when disabled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.logging import logger
+
+
+DEFAULT_CACHE_PATH = Path("data_folder/output/ats_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 20000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalise_description(job_description: str) -> str:
+    """Case and whitespace differences between copies of a posting do not change its key."""
+    return _WHITESPACE_RE.sub(" ", (job_description or "").lower()).strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_key(resume_content: str, job_description: str, version: str) -> str:
+    material = "|".join((text_hash(resume_content), text_hash(normalise_description(job_description)), version))
+    return text_hash(material)
+
+
+class ATSResultCache:
+    """SQLite-backed ATS analysis cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ats_results (
+                key TEXT PRIMARY KEY,
+                version TEXT,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ats_results_last_access ON ats_results(last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The stored analysis for ``key`` (a fresh dict), or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM ats_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM ats_results WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE ats_results SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, analysis: Dict[str, Any], version: str = "") -> None:
+        payload = json.dumps(analysis, ensure_ascii=False, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ats_results (key, version, payload, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, version, payload, now, now),
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the least recently used rows above ``max_entries``."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM ats_results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM ats_results WHERE key IN "
+                "(SELECT key FROM ats_results ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ats_results")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM ats_results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_shared_cache: Optional[ATSResultCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_ats_cache() -> Optional[ATSResultCache]:
+    """Return the shared cache configured in config.py (None when disabled)."""
+    global _shared_cache
+    import config as cfg
+
+    if not getattr(cfg, "ATS_CACHE_ENABLED", True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = ATSResultCache(
+                    path=Path(getattr(cfg, "ATS_CACHE_PATH", DEFAULT_CACHE_PATH)),
+                    ttl_seconds=getattr(cfg, "ATS_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                    max_entries=getattr(cfg, "ATS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                )
+            except Exception as exc:
+                logger.warning(f"ATS result cache unavailable: {exc}")
+                return None
+        return _shared_cache
+
+
+def ats_cache_stats() -> Dict[str, Any]:
+    """Stats of the shared cache; ``{"enabled": False}`` when it is off."""
+    cache = get_ats_cache()
+    return {"enabled": True, **cache.stats()} if cache is not None else {"enabled": False}
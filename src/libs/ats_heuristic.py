@@ -0,0 +1,259 @@
+"""
+ats_heuristic.py
+================
+Local ATS scoring: the fast path when no LLM is configured and the cheap
+pre-filter in front of it.
+
+  index = resume_index(resume_yaml_text)        # built once per resume text
+  index.score(job_description)                   -> result dict
+  index.score_many(job_descriptions)             -> one result dict per description
+
+Texts are tokenised with stopwords and recruiting boilerplate ("experience",
+"team", "ability", ...) removed and a light suffix stemmer applied. A job
+description contributes unigram and bigram (phrase) terms; each gets a
+BM25-saturated weight (term frequency with diminishing returns, normalised
+by the description's length), and phrases weigh more than single words. The
+score is the weighted share of the job's terms the resume covers; the
+heaviest terms it does not cover are the missing keywords.
+
+The resume's terms take the first columns of the index vocabulary, so a term
+is covered when its column is below ``resume_terms``. ``score_many`` collects
+every description's (row, column, weight) entries into flat NumPy arrays and
+reduces them with ``numpy.bincount``, so thousands of descriptions are scored
+in one pass.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
+
+from src.logging import logger
+
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+REFERENCE_LENGTH = 300        # content tokens in a typical job description
+PHRASE_WEIGHT = 1.5
+MISSING_KEYWORDS = 10
+STRONG_POINTS = 5
+MAX_VOCABULARY = 200_000      # job terms kept in the vocabulary before it is reset
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#&.]*[a-z0-9+#]|[a-z0-9]")
+_SEGMENT_RE = re.compile(r"[\n.;:,()\[\]/|•\-–—]+\s")
+_STOPWORDS = frozenset(
+    "a about above after all also am an and any are as at be been being both but by can could did do does "
+    "doing during each for from further had has have having he her here him his how i if in into is it its "
+    "me more most my no nor not of off on once only or other our out over own same she should so some such "
+    "than that the their them then there these they this those through to too under until up very was we "
+    "were what when where which while who whom why will with would you your".split()
+)
+_BOILERPLATE = frozenset(
+    "ability able across apply candidate candidates company day days desired duties ensure environment "
+    "etc excellent experience experienced familiarity good great help ideal including job join knowledge "
+    "looking must need needs new offer opportunity plus position preferred provide related required requirement "
+    "requirements responsibilities responsibility responsible role seek seeking skill skills strong successful "
+    "team teams understanding using well within work working year years".split()
+)
+
+
+def stem(token: str) -> str:
+    """Light suffix stripping: plans/planned/planning -> plan, supplies -> supply."""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    for suffix, min_length in (("ing", 6), ("ed", 5)):
+        if token.endswith(suffix) and len(token) >= min_length:
+            base = token[: -len(suffix)]
+            if len(base) > 2 and base[-1] == base[-2] and base[-1] not in "lsz":
+                base = base[:-1]
+            return base
+    if token.endswith("es") and len(token) > 4 and (token[-3] in "sxz" or token[-4:-2] in ("ch", "sh")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+_DROPPED = _STOPWORDS | _BOILERPLATE
+
+
+@lru_cache(maxsize=65536)
+def _term(token: str) -> Optional[str]:
+    """The stemmed term for a token, or None for stopwords, boilerplate and numbers."""
+    if token in _DROPPED or token.isdigit():
+        return None
+    return stem(token)
+
+
+def extract_terms(text: str) -> Tuple[Dict[str, int], Dict[str, str], int]:
+    """
+    ``(term counts, term -> first surface form, content token count)``.
+    Bigrams only join words that are adjacent in the text.
+    """
+    counts: Dict[str, int] = {}
+    surfaces: Dict[str, str] = {}
+    length = 0
+    for segment in _SEGMENT_RE.split((text or "").lower()):
+        previous_term = previous_raw = None
+        for raw in _TOKEN_RE.findall(segment):
+            term = _term(raw)
+            if term is None:
+                previous_term = None
+                continue
+            length += 1
+            if term not in surfaces:
+                surfaces[term] = raw
+            counts[term] = counts.get(term, 0) + 1
+            if previous_term is not None:
+                phrase = f"{previous_term} {term}"
+                if phrase not in surfaces:
+                    surfaces[phrase] = f"{previous_raw} {raw}"
+                counts[phrase] = counts.get(phrase, 0) + 1
+            previous_term, previous_raw = term, raw
+    return counts, surfaces, length
+
+
+def _resume_text(resume_content: str) -> str:
+    """The resume's values without YAML keys, which would otherwise match 'company', 'position', ..."""
+    try:
+        data = yaml.safe_load(resume_content)
+    except yaml.YAMLError:
+        return resume_content
+    if not isinstance(data, (dict, list)):
+        return resume_content
+    values: List[str] = []
+
+    def _walk(node: Any) -> None:
+        if isinstance(node, dict):
+            for value in node.values():
+                _walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                _walk(value)
+        elif node is not None:
+            values.append(str(node))
+
+    _walk(data)
+    return "\n".join(values)
+
+
+class ResumeIndex:
+    """A resume's terms plus the vocabulary job descriptions are mapped into."""
+
+    def __init__(self, resume_content: str):
+        counts, _surfaces, _length = extract_terms(_resume_text(resume_content))
+        self.resume_terms = len(counts)
+        self.terms: List[str] = list(counts)
+        self.vocabulary: Dict[str, int] = {term: column for column, term in enumerate(self.terms)}
+        self._lock = threading.Lock()
+
+    def covers(self, term: str) -> bool:
+        column = self.vocabulary.get(term)
+        return column is not None and column < self.resume_terms
+
+    def score(self, job_description: str) -> Dict[str, Any]:
+        return self.score_many([job_description])[0]
+
+    def score_many(self, job_descriptions: Sequence[str]) -> List[Dict[str, Any]]:
+        """Score every description at once; results keep the input order."""
+        import numpy as np
+
+        sizes: List[int] = []
+        columns: List[int] = []
+        frequencies: List[int] = []
+        lengths: List[int] = []
+        surfaces: List[Dict[str, str]] = []
+        with self._lock:
+            if len(self.vocabulary) > self.resume_terms + MAX_VOCABULARY:
+                del self.terms[self.resume_terms:]
+                self.vocabulary = {term: column for column, term in enumerate(self.terms)}
+            vocabulary, terms = self.vocabulary, self.terms
+            for job_description in job_descriptions:
+                counts, surface, length = extract_terms(job_description)
+                lengths.append(length)
+                surfaces.append(surface)
+                sizes.append(len(counts))
+                for term in counts:
+                    if term not in vocabulary:
+                        vocabulary[term] = len(terms)
+                        terms.append(term)
+                columns.extend(map(vocabulary.__getitem__, counts))
+                frequencies.extend(counts.values())
+            terms = list(terms)
+
+        count = len(job_descriptions)
+        if not columns:
+            return [self._result(0.0, [], []) for _ in range(count)]
+        row_index = np.repeat(np.arange(count), sizes)
+        column_index = np.asarray(columns)
+        is_phrase = np.fromiter((" " in terms[column] for column in columns), dtype=bool, count=len(columns))
+        tf = np.asarray(frequencies, dtype=float)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * np.asarray(lengths, dtype=float)[row_index] / REFERENCE_LENGTH)
+        weights = tf * (BM25_K1 + 1) / (tf + norm) * np.where(is_phrase, PHRASE_WEIGHT, 1.0)
+        covered = column_index < self.resume_terms
+
+        matched = np.bincount(row_index, weights=weights * covered, minlength=count)
+        total = np.bincount(row_index, weights=weights, minlength=count)
+        coverage = np.divide(matched, total, out=np.zeros(count), where=total > 0)
+
+        # Entries are grouped by row: sort each row's slice by descending weight in one pass
+        order = np.lexsort((-weights, row_index))
+        ranked_columns = column_index[order].tolist()
+        ranked_covered = covered[order].tolist()
+        bounds = np.concatenate(([0], np.cumsum(sizes))).tolist()
+        results = []
+        for row in range(count):
+            ranked = range(bounds[row], bounds[row + 1])
+            missing = _keywords((terms[ranked_columns[i]] for i in ranked if not ranked_covered[i]), surfaces[row], MISSING_KEYWORDS)
+            strong = _keywords((terms[ranked_columns[i]] for i in ranked if ranked_covered[i]), surfaces[row], STRONG_POINTS)
+            results.append(self._result(float(coverage[row]), missing, strong))
+        return results
+
+    @staticmethod
+    def _result(coverage: float, missing: List[str], strong: List[str]) -> Dict[str, Any]:
+        return {
+            # Square root so a resume covering half of a posting's weighted terms scores ~70
+            "score": int(round(100 * coverage ** 0.5)),
+            "match_summary": f"Local ATS estimate: the resume covers {coverage:.0%} of the job's weighted keywords.",
+            "missing_keywords": missing,
+            "strong_points": strong,
+        }
+
+
+def _keywords(terms: Iterable[str], surfaces: Dict[str, str], limit: int) -> List[str]:
+    """Surface forms of the first ``limit`` terms, skipping words already inside a chosen phrase."""
+    chosen: List[str] = []
+    words = set()
+    for term in terms:
+        if " " not in term and term in words:
+            continue
+        chosen.append(surfaces.get(term, term))
+        words.update(term.split())
+        if len(chosen) >= limit:
+            break
+    return chosen
+
+
+_indexes: Dict[int, ResumeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def resume_index(resume_content: str) -> ResumeIndex:
+    """``ResumeIndex`` memoised on the resume text."""
+    key = hash(resume_content)
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is None:
+        index = ResumeIndex(resume_content)
+        logger.debug(f"Indexed resume for local ATS scoring: {index.resume_terms} terms")
+        with _indexes_lock:
+            if len(_indexes) >= 8:
+                _indexes.clear()
+            _indexes[key] = index
+    return index
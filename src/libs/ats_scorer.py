@@ -1,10 +1,35 @@
-import json
+import asyncio
 import yaml
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, Field
+from src.libs.ats_cache import get_ats_cache, make_key
+from src.libs.ats_heuristic import resume_index
+from src.libs.keyword_matcher import KeywordMatcher, dictionary_matcher
+from src.libs.llm_async import run_sync
+from src.libs.llm_rate_limiter import estimate_tokens
+from src.libs.model_router import ATS_SCORING
+from src.libs.prompt_cache import CACHE_BREAKPOINT
+from src.libs.resume_context import context_enabled, context_for_yaml
+from src.libs.resume_snapshot import resume_snapshot
+from src.libs.structured_output import StructuredOutput, StructuredOutputError
 from src.logging import logger
 
 
+DEFAULT_BATCH_TOKEN_BUDGET = 12000
+DEFAULT_BATCH_MAX_JOBS = 10
+BATCH_INSTRUCTION_TOKENS = 300
+
+# Part of every cached result's key: bump when the prompt or the result fields change
+ATS_SCORER_VERSION = "1"
+
+HEURISTIC_TWEAKS = [
+    "Use role-specific keywords from the job posting in your experience bullets.",
+    "Quantify outcomes in operations/supply chain terms (cost, cycle time, fill rate).",
+    "Place the exact role title in your headline if it matches your target role.",
+]
+
+
 DEFAULT_IN_SCOPE_KEYWORDS = [
     "supply chain",
     "operations",
@@ -31,32 +56,272 @@ DEFAULT_OUT_OF_SCOPE_KEYWORDS = [
 ]
 
 
+# Built-in alignment dictionaries; a profile's ATS_DICTIONARIES_PATH file can replace or extend them
+DEFAULT_DICTIONARIES = {
+    "in_scope": DEFAULT_IN_SCOPE_KEYWORDS,
+    "out_of_scope": DEFAULT_OUT_OF_SCOPE_KEYWORDS,
+}
+
+
+class ATSScoreResult(BaseModel):
+    score: float = Field(ge=0, le=100)
+    match_summary: str = ""
+    missing_keywords: List[str] = []
+    strong_points: List[str] = []
+    survival_tweaks: List[str] = []
+
+
+class ATSBatchItem(ATSScoreResult):
+    job: int = Field(ge=1)
+
+
+class ATSBatchResult(BaseModel):
+    results: List[ATSBatchItem]
+
+
 class ATSScorer:
     def __init__(self, ai_adapter):
+        import config as cfg
+
         self.ai_adapter = ai_adapter
+        self.structured = StructuredOutput(ATSScoreResult, ATS_SCORING)
+        self.structured_batch = StructuredOutput(ATSBatchResult, ATS_SCORING)
+        self.batch_token_budget = getattr(cfg, "ATS_BATCH_TOKEN_BUDGET", DEFAULT_BATCH_TOKEN_BUDGET)
+        self.batch_max_jobs = getattr(cfg, "ATS_BATCH_MAX_JOBS", DEFAULT_BATCH_MAX_JOBS)
+        self.requests = 0
+        self.batched_jobs = 0
+        self.dictionaries_path = getattr(cfg, "ATS_DICTIONARIES_PATH", None)
+        self._resume_hits: Dict[Any, Dict[str, List[str]]] = {}
 
     def score_job(self, resume_yaml_path: Path, job_description: str) -> Dict[str, Any]:
         """
         Scores a job description against a resume and provides actionable feedback.
         """
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
+            return self._error_response("Could not read resume file.")
+
+        if self.ai_adapter is None:
+            data = self._heuristic_score_data(resume_content, job_description)
+            return self._apply_alignment_adjustments(data, resume_content, job_description)
+        cached = self._cached(resume_content, job_description)
+        if cached is not None:
+            return cached
+
         try:
-            with open(resume_yaml_path, 'r') as f:
-                resume_content = f.read()
+            logger.info("Requesting ATS score from LLM...")
+            self.requests += 1
+            result = self.structured.invoke(self.ai_adapter, self._build_prompt(resume_content, job_description))
+            data = self._apply_alignment_adjustments(result.model_dump(), resume_content, job_description)
+            return self._remember(resume_content, job_description, data)
         except Exception as e:
-            logger.error(f"Failed to read resume at {resume_yaml_path}: {e}")
+            return self._llm_failure_response(e, resume_content, job_description)
+
+    async def ascore_job(self, resume_yaml_path: Path, job_description: str) -> Dict[str, Any]:
+        """Async variant of ``score_job`` that overlaps with other LLM calls."""
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
             return self._error_response("Could not read resume file.")
-        
-        prompt = f"""
+
+        if self.ai_adapter is None:
+            data = self._heuristic_score_data(resume_content, job_description)
+            return self._apply_alignment_adjustments(data, resume_content, job_description)
+        return await self._ascore_content(resume_content, job_description)
+
+    async def _ascore_content(self, resume_content: str, job_description: str) -> Dict[str, Any]:
+        cached = self._cached(resume_content, job_description)
+        if cached is not None:
+            return cached
+        try:
+            logger.info("Requesting ATS score from LLM...")
+            result = await self.structured.ainvoke(self.ai_adapter, self._build_prompt(resume_content, job_description))
+            data = self._apply_alignment_adjustments(result.model_dump(), resume_content, job_description)
+            return self._remember(resume_content, job_description, data)
+        except Exception as e:
+            return self._llm_failure_response(e, resume_content, job_description)
+
+    def score_jobs(self, resume_yaml_path: Path, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Score many job descriptions with a few requests: descriptions are packed
+        into batches under ``ATS_BATCH_TOKEN_BUDGET`` / ``ATS_BATCH_MAX_JOBS``
+        that share the resume as the prompt prefix. Results keep the input
+        order and have the same fields as ``score_job``.
+        """
+        if self.ai_adapter is None:
+            return self.heuristic_scores(resume_yaml_path, job_descriptions)
+        if not hasattr(self.ai_adapter, "ainvoke"):
+            return [self.score_job(resume_yaml_path, jd) for jd in job_descriptions]
+        return run_sync(self.ascore_jobs(resume_yaml_path, job_descriptions))
+
+    async def ascore_jobs(self, resume_yaml_path: Path, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """Async variant of ``score_jobs``; the batches run concurrently."""
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
+            return [self._error_response("Could not read resume file.") for _jd in job_descriptions]
+        if self.ai_adapter is None:
+            return self._heuristic_results(resume_content, job_descriptions)
+
+        scored: Dict[str, Dict[str, Any]] = {}
+        unique = []
+        for jd in dict.fromkeys(job_descriptions):
+            cached = self._cached(resume_content, jd)
+            if cached is not None:
+                scored[jd] = cached
+            else:
+                unique.append(jd)
+        batches = self._pack(resume_content, unique)
+        if scored:
+            logger.info(f"{len(scored)} ATS score(s) served from the result cache")
+        if batches:
+            logger.info(f"Requesting ATS scores for {len(unique)} jobs in {len(batches)} request(s)...")
+        for part in await asyncio.gather(*(self._ascore_batch(resume_content, batch) for batch in batches)):
+            scored.update(part)
+        # Duplicate descriptions share one score, but each caller gets its own dict
+        return [dict(scored[jd]) for jd in job_descriptions]
+
+    async def _ascore_batch(self, resume_content: str, batch: List[str]) -> Dict[str, Dict[str, Any]]:
+        if len(batch) == 1:
+            return {batch[0]: await self._ascore_content(resume_content, batch[0])}
+        try:
+            self.requests += 1
+            reply = await self.structured_batch.ainvoke(self.ai_adapter, self._build_batch_prompt(resume_content, batch))
+        except StructuredOutputError as e:
+            logger.warning(f"ATS batch of {len(batch)} jobs did not validate ({e}); splitting it")
+            return await self._ascore_halves(resume_content, batch)
+        except Exception as e:
+            return {jd: self._llm_failure_response(e, resume_content, jd) for jd in batch}
+
+        scored: Dict[str, Dict[str, Any]] = {}
+        for item in reply.results:
+            if item.job <= len(batch) and batch[item.job - 1] not in scored:
+                jd = batch[item.job - 1]
+                data = item.model_dump(exclude={"job"})
+                scored[jd] = self._remember(resume_content, jd, self._apply_alignment_adjustments(data, resume_content, jd))
+        self.batched_jobs += len(scored)
+        missing = [jd for jd in batch if jd not in scored]
+        if len(missing) == len(batch):
+            logger.warning(f"ATS batch reply scored none of its {len(batch)} jobs; splitting it")
+            return await self._ascore_halves(resume_content, batch)
+        if missing:
+            logger.warning(f"ATS batch reply left out {len(missing)} of {len(batch)} jobs; scoring them again")
+            scored.update(await self._ascore_batch(resume_content, missing))
+        return scored
+
+    async def _ascore_halves(self, resume_content: str, batch: List[str]) -> Dict[str, Dict[str, Any]]:
+        half = len(batch) // 2
+        left, right = await asyncio.gather(
+            self._ascore_batch(resume_content, batch[:half]),
+            self._ascore_batch(resume_content, batch[half:]),
+        )
+        return {**left, **right}
+
+    def _cache_version(self) -> str:
+        model = f"{getattr(self.ai_adapter, 'provider', '')}/{getattr(self.ai_adapter, 'model_name', '')}"
+        return f"{ATS_SCORER_VERSION}:{self.keyword_matcher().fingerprint}:{model}"
+
+    def _cached(self, resume_content: str, job_description: str) -> Optional[Dict[str, Any]]:
+        """A stored LLM analysis for this resume, description and scorer version."""
+        cache = get_ats_cache()
+        if cache is None:
+            return None
+        return cache.get(make_key(resume_content, job_description, self._cache_version()))
+
+    def _remember(self, resume_content: str, job_description: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        cache = get_ats_cache()
+        if cache is not None:
+            version = self._cache_version()
+            cache.put(make_key(resume_content, job_description, version), data, version)
+        return data
+
+    def _pack(self, resume_content: str, job_descriptions: List[str]) -> List[List[str]]:
+        """Greedy packing under the token budget and the per-request job cap."""
+        # Upper bound: the raw resume plus the instructions
+        prefix_tokens = estimate_tokens(resume_content) + BATCH_INSTRUCTION_TOKENS
+        batches: List[List[str]] = []
+        current: List[str] = []
+        used = prefix_tokens
+        for jd in job_descriptions:
+            cost = estimate_tokens(jd) + 16
+            if current and (used + cost > self.batch_token_budget or len(current) >= self.batch_max_jobs):
+                batches.append(current)
+                current, used = [], prefix_tokens
+            current.append(jd)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "batched_jobs": self.batched_jobs}
+
+    def heuristic_scores(self, resume_yaml_path: Path, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Score job descriptions locally, without the LLM, in one vectorised pass
+        (``ats_heuristic.ResumeIndex.score_many``). Results have the same
+        fields as ``score_job``; this is the fast path with no adapter and the
+        cheap pre-filter in front of it.
+        """
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
+            return [self._error_response("Could not read resume file.") for _jd in job_descriptions]
+        return self._heuristic_results(resume_content, job_descriptions)
+
+    def _heuristic_results(self, resume_content: str, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        scored = resume_index(resume_content).score_many(job_descriptions)
+        return [
+            self._apply_alignment_adjustments(self._with_tweaks(data), resume_content, jd)
+            for data, jd in zip(scored, job_descriptions)
+        ]
+
+    @staticmethod
+    def _read_resume(resume_yaml_path: Path) -> Optional[str]:
+        try:
+            return resume_snapshot(resume_yaml_path).text
+        except Exception as e:
+            logger.error(f"Failed to read resume at {resume_yaml_path}: {e}")
+            return None
+
+    @staticmethod
+    def _build_prompt(resume_content: str, job_description: str) -> str:
+        if context_enabled():
+            # Compact resume; the same text for every job, so providers can cache the prefix
+            resume_content = context_for_yaml(resume_content).select(job_description, ATS_SCORING)
+        # Everything up to the breakpoint is identical across jobs
+        return f"""
         You are an expert ATS (Applicant Tracking System) and Technical Recruiter.
-        Analyze the following Resume (in YAML format) against the Job Description.
+        Analyze the candidate's Resume against the Job Description that follows it.
+
+        Provide a JSON response with the following fields:
+        - score: A number from 0-100 indicating match.
+        - match_summary: A 2-3 sentence summary of why the candidate matches or not.
+        - missing_keywords: A list of key skills or technologies from the job description missing in the resume.
+        - strong_points: A list of areas where the resume strongly matches the job.
+        - survival_tweaks: 3-5 specific, actionable changes to the resume (e.g., rephrasing a bullet point) to increase the ATS score.
+
+        Return ONLY the JSON.
 
         RESUME:
         {resume_content}
-
+{CACHE_BREAKPOINT}
         JOB DESCRIPTION:
         {job_description}
+        """
 
-        Provide a JSON response with the following fields:
+    @staticmethod
+    def _build_batch_prompt(resume_content: str, job_descriptions: List[str]) -> str:
+        if context_enabled():
+            resume_content = context_for_yaml(resume_content).select("\n".join(job_descriptions), ATS_SCORING)
+        jobs = "".join(
+            f"\n        === JOB DESCRIPTION {index} ===\n        {jd.strip()}\n"
+            for index, jd in enumerate(job_descriptions, start=1)
+        )
+        # Instructions and resume come first and are the same for every batch
+        return f"""
+        You are an expert ATS (Applicant Tracking System) and Technical Recruiter.
+        Analyze the candidate's Resume separately against each of the numbered Job Descriptions that follow it.
+
+        Provide a JSON object with a "results" list holding one entry per job description, each with these fields:
+        - job: The number of the job description.
         - score: A number from 0-100 indicating match.
         - match_summary: A 2-3 sentence summary of why the candidate matches or not.
         - missing_keywords: A list of key skills or technologies from the job description missing in the resume.
@@ -64,34 +329,16 @@ class ATSScorer:
         - survival_tweaks: 3-5 specific, actionable changes to the resume (e.g., rephrasing a bullet point) to increase the ATS score.
 
         Return ONLY the JSON.
-        """
 
-        if self.ai_adapter is None:
-            data = self._heuristic_score_data(resume_content, job_description)
-            return self._apply_alignment_adjustments(data, resume_content, job_description)
-        
-        try:
-            logger.info("Requesting ATS score from LLM...")
-            response = self.ai_adapter.invoke(prompt)
-            
-            # Extract content from response (handling LangChain message objects)
-            content = getattr(response, 'content', str(response))
-                
-            # Clean JSON if it has markdown blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            # Ensure it's valid JSON
-            data = json.loads(content)
-            data = self._apply_alignment_adjustments(data, resume_content, job_description)
-            return data
-        except Exception as e:
-            logger.error(f"Error scoring job with LLM: {e}")
-            fallback = self._heuristic_score_data(resume_content, job_description)
-            fallback["match_summary"] = f"LLM unavailable, used heuristic scoring. Reason: {e}"
-            return self._apply_alignment_adjustments(fallback, resume_content, job_description)
+        RESUME:
+        {resume_content}
+{CACHE_BREAKPOINT}{jobs}"""
+
+    def _llm_failure_response(self, error: Exception, resume_content: str, job_description: str) -> Dict[str, Any]:
+        logger.error(f"Error scoring job with LLM: {error}")
+        fallback = self._heuristic_score_data(resume_content, job_description)
+        fallback["match_summary"] = f"LLM unavailable, used heuristic scoring. Reason: {error}"
+        return self._apply_alignment_adjustments(fallback, resume_content, job_description)
 
     def _apply_alignment_adjustments(
         self,
@@ -113,14 +360,24 @@ class ATSScorer:
         score_data["score"] = adjusted_score
         return score_data
 
+    def keyword_matcher(self) -> KeywordMatcher:
+        """The alignment dictionaries' matcher, rebuilt when the dictionary file changes."""
+        return dictionary_matcher(self.dictionaries_path, DEFAULT_DICTIONARIES)
+
     def _compute_role_alignment(self, resume_content: str, job_description: str) -> Dict[str, Any]:
-        resume_text = resume_content.lower()
-        jd_text = job_description.lower()
+        matcher = self.keyword_matcher()
+        jd_hits = matcher.match(job_description)
+        # The resume is the same for every job in a run
+        resume_key = (id(matcher), hash(resume_content))
+        resume_hits = self._resume_hits.get(resume_key)
+        if resume_hits is None:
+            self._resume_hits = {resume_key: matcher.match(resume_content)}
+            resume_hits = self._resume_hits[resume_key]
 
-        in_scope_hits = [keyword for keyword in DEFAULT_IN_SCOPE_KEYWORDS if keyword in jd_text]
-        out_scope_hits = [keyword for keyword in DEFAULT_OUT_OF_SCOPE_KEYWORDS if keyword in jd_text]
+        in_scope_hits = jd_hits.get("in_scope", [])
+        out_scope_hits = jd_hits.get("out_of_scope", [])
 
-        resume_strength_hits = [keyword for keyword in DEFAULT_IN_SCOPE_KEYWORDS if keyword in resume_text]
+        resume_strength_hits = resume_hits.get("in_scope", [])
 
         adjustment = min(len(in_scope_hits) * 3, 15)
         adjustment -= min(len(out_scope_hits) * 8, 32)
@@ -136,6 +393,9 @@ class ATSScorer:
             "resume_strength_hits": resume_strength_hits,
             "hard_mismatch": hard_mismatch,
         }
+        extra = {category: hits for category, hits in jd_hits.items() if category not in DEFAULT_DICTIONARIES}
+        if extra:
+            notes["dictionary_hits"] = extra
 
         return {"adjustment": adjustment, "hard_mismatch": hard_mismatch, "notes": notes}
 
@@ -147,23 +407,15 @@ class ATSScorer:
             return 0
 
     def _heuristic_score_data(self, resume_content: str, job_description: str) -> Dict[str, Any]:
-        resume_tokens = set(resume_content.lower().replace("\n", " ").split())
-        jd_tokens = set(job_description.lower().replace("\n", " ").split())
-
-        overlap = len(resume_tokens & jd_tokens)
-        coverage = int(min(100, overlap * 2))
+        return self._with_tweaks(resume_index(resume_content).score(job_description))
 
-        return {
-            "score": coverage,
-            "match_summary": "Heuristic ATS estimate based on token overlap.",
-            "missing_keywords": [],
-            "strong_points": [],
-            "survival_tweaks": [
-                "Use role-specific keywords from the job posting in your experience bullets.",
-                "Quantify outcomes in operations/supply chain terms (cost, cycle time, fill rate).",
-                "Place the exact role title in your headline if it matches your target role.",
-            ],
-        }
+    @staticmethod
+    def _with_tweaks(data: Dict[str, Any]) -> Dict[str, Any]:
+        tweaks = list(HEURISTIC_TWEAKS)
+        if data["missing_keywords"]:
+            tweaks.insert(0, f"Work these posting keywords into your resume where true: {', '.join(data['missing_keywords'][:5])}.")
+        data["survival_tweaks"] = tweaks
+        return data
 
     def _error_response(self, message: str) -> Dict[str, Any]:
         return {
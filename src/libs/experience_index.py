@@ -0,0 +1,225 @@
+"""
+experience_index.py
+===================
+Deterministic "years of experience" answers built from the resume.
+
+``ExperienceIndex.from_resume`` parses each ``ExperienceDetails.employment_period``
+("06/2019 - Present", "Jan 2014 – May 2015", "2016-2018", ...) into a date
+interval and indexes it under every ``skills_acquired`` entry, the
+``industry`` and the ``position``. Overlapping intervals are merged before
+counting, so two concurrent jobs using Python count once.
+
+``answer(question)`` returns whole years for questions such as
+"How many years of experience do you have with React?" or "Years of
+professional experience?". It returns None when the question is not about
+years of experience, or names something the index does not know, so the
+caller can fall back to the LLM.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.logging import logger
+
+
+Interval = Tuple[date, date]  # [start, end)
+
+_MONTHS = {
+    name: index
+    for index, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+         ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+         ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1,
+    )
+    for name in names
+}
+
+_DATE_TOKEN_RE = re.compile(
+    r"(?P<mm_yyyy>\b\d{1,2}\s*/\s*\d{4}\b)"
+    r"|(?P<yyyy_mm>\b\d{4}[-/.]\d{1,2}\b)"
+    r"|(?P<month_yyyy>\b[a-z]{3,9}\.?,?\s+\d{4}\b)"
+    r"|(?P<yyyy>\b\d{4}\b)"
+    r"|(?P<ongoing>\b(?:present|current|currently|now|today|ongoing)\b)",
+    re.IGNORECASE,
+)
+
+# Common spellings mapped to one canonical term
+TERM_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "golang": "go",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "ml": "machine learning",
+}
+
+_QUESTION_SCAFFOLD = frozenset(
+    "how many much years year yrs yr of experience experienced do does you your have has had "
+    "with in using on as the a an total overall professional relevant work working worked "
+    "industry field hands hand practical commercial number please enter what is are "
+    "level been role roles".split()
+)
+_YEARS_RE = re.compile(r"\b(years?|yrs?)\b", re.IGNORECASE)
+_TERM_SPLIT_RE = re.compile(r"[^a-z0-9+#.]+")
+# Term boundaries: "c" must not match inside "c++", nor "node" inside "node.js"
+_BEFORE = r"(?<![a-z0-9+#.])"
+_AFTER = r"(?![a-z0-9+#]|\.[a-z0-9])"
+
+
+def normalize_term(term: str) -> str:
+    text = " ".join(_TERM_SPLIT_RE.sub(" ", (term or "").lower()).split()).strip(".")
+    return TERM_ALIASES.get(text, text)
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year, max(1, min(12, month)), 1)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + (day.month == 12), day.month % 12 + 1, 1)
+
+
+def _parse_date_token(match: re.Match, today: date, is_end: bool) -> Optional[date]:
+    text = match.group(0).lower()
+    if match.group("ongoing"):
+        return today
+    if match.group("mm_yyyy"):
+        month, year = (int(p) for p in re.split(r"\s*/\s*", text))
+        start = _month_start(year, month)
+    elif match.group("yyyy_mm"):
+        year, month = (int(p) for p in re.split(r"[-/.]", text))
+        start = _month_start(year, month)
+    elif match.group("month_yyyy"):
+        name, year = re.split(r"\.?,?\s+", text)
+        month = _MONTHS.get(name)
+        if month is None:
+            # "since 2019" and the like: only the year is meaningful
+            return date(int(year) + 1, 1, 1) if is_end else date(int(year), 1, 1)
+        start = _month_start(int(year), month)
+    else:
+        year = int(text)
+        if is_end:
+            return date(year + 1, 1, 1)
+        return date(year, 1, 1)
+    return _next_month(start) if is_end else start
+
+
+def parse_employment_period(period: Optional[str], today: Optional[date] = None) -> Optional[Interval]:
+    """Parse "06/2019 - Present" style ranges into a half-open [start, end) interval."""
+    if not period:
+        return None
+    today = today or date.today()
+    matches = list(_DATE_TOKEN_RE.finditer(period))
+    if not matches:
+        return None
+    start = _parse_date_token(matches[0], today, is_end=False)
+    if start is None:
+        return None
+    end = _parse_date_token(matches[-1], today, is_end=True) if len(matches) > 1 else today
+    if end is None:
+        end = today
+    end = min(end, max(today, start))
+    if end <= start:
+        return None
+    return start, end
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def total_years(intervals: Iterable[Interval]) -> float:
+    return sum((end - start).days for start, end in merge_intervals(intervals)) / 365.25
+
+
+class ExperienceIndex:
+    """Years of experience per skill, technology, industry and position."""
+
+    def __init__(self, intervals_by_term: Dict[str, List[Interval]], all_intervals: List[Interval]):
+        self.intervals_by_term = intervals_by_term
+        self.all_intervals = all_intervals
+        # Longest terms first so "machine learning" wins over "learning"
+        self._terms = sorted(intervals_by_term, key=len, reverse=True)
+
+    @classmethod
+    def from_resume(cls, resume: Any, today: Optional[date] = None) -> "ExperienceIndex":
+        today = today or date.today()
+        intervals_by_term: Dict[str, List[Interval]] = {}
+        all_intervals: List[Interval] = []
+        for experience in _get(resume, "experience_details") or []:
+            interval = parse_employment_period(_get(experience, "employment_period"), today)
+            if interval is None:
+                logger.debug(f"Unparseable employment_period: {_get(experience, 'employment_period')!r}")
+                continue
+            all_intervals.append(interval)
+            terms = list(_get(experience, "skills_acquired") or [])
+            terms += [_get(experience, "industry"), _get(experience, "position")]
+            for term in terms:
+                key = normalize_term(term or "")
+                if key:
+                    intervals_by_term.setdefault(key, []).append(interval)
+        return cls(intervals_by_term, all_intervals)
+
+    @property
+    def total_years(self) -> float:
+        return total_years(self.all_intervals)
+
+    def years_for(self, term: str) -> Optional[float]:
+        intervals = self.intervals_by_term.get(normalize_term(term))
+        return total_years(intervals) if intervals else None
+
+    @staticmethod
+    def is_years_question(question: str) -> bool:
+        return bool(_YEARS_RE.search(question or ""))
+
+    def answer(self, question: str) -> Optional[int]:
+        """Whole years for a years-of-experience question, or None to defer to the LLM."""
+        if not self.all_intervals or not self.is_years_question(question):
+            return None
+        text = f" {normalize_term(question)} "
+        for alias, canonical in TERM_ALIASES.items():
+            text = re.sub(_BEFORE + re.escape(alias) + _AFTER, canonical, text)
+
+        matched: List[str] = []
+        remainder = text
+        for term in self._terms:
+            pattern = _BEFORE + re.escape(term) + _AFTER
+            if re.search(pattern, remainder):
+                matched.append(term)
+                remainder = re.sub(pattern, " ", remainder)
+
+        tokens = (token.strip(".") for token in remainder.split())
+        leftover = [t for t in tokens if t and t not in _QUESTION_SCAFFOLD and not t.isdigit()]
+        if leftover:
+            # The question names something the resume index doesn't cover
+            return None
+        if matched:
+            intervals = [i for term in matched for i in self.intervals_by_term[term]]
+            years = total_years(intervals)
+        else:
+            years = self.total_years
+        return int(years + 0.5)
+
+
+def _get(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
@@ -0,0 +1,322 @@
+"""
+job_dedup.py
+============
+Near-duplicate detection for job postings across searches, platforms and runs.
+
+``BotManager.run_batch`` searches every position x location on LinkedIn and
+Indeed, so the same posting comes back many times. ``Job.id``
+(``company_role``) is no identity: two openings with the same title collide,
+and a repost whose title gained "(Remote)" does not match. ``JobIndex``
+recognises a posting by any of three keys:
+
+  url      — the canonical posting URL: tracking parameters dropped, LinkedIn
+             and Indeed job ids kept (``canonical_url``)
+  simhash  — a 64-bit SimHash over 3-word shingles of the normalised
+             description; postings within ``JOB_DEDUP_MAX_DISTANCE`` bits are
+             the same job. The 64 bits are split into bands so that any
+             match within the distance shares a band, and only same-band
+             entries are compared.
+  listing  — company, role, location and description verbatim, for postings
+             too short to fingerprint
+
+Looking a posting up and recording it are separate steps:
+
+  index.deduplicate(jobs, batch)  # drop postings in the index or already in ``batch``
+  index.record(job)               # once the posting has been applied to
+
+``deduplicate`` only adds new postings to ``batch``, an in-memory index the
+caller keeps for one run, so postings cut by the funnel or a failed apply
+come back in the next run. Every posting gets ``Job.cluster_id``; a duplicate
+carries the id of the posting it repeats. Recorded postings persist in SQLite
+(``JOB_DEDUP_PATH``) for ``JOB_DEDUP_TTL_SECONDS``. Lookups, duplicates per
+key and lookup latency are counted; see ``dedup_stats()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from src.logging import logger
+
+
+DEFAULT_INDEX_PATH = Path("data_folder/output/job_index.sqlite3")
+DEFAULT_MAX_DISTANCE = 3
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+SHINGLE_WORDS = 3
+MIN_FINGERPRINT_WORDS = 20       # shorter descriptions are matched by the listing key instead
+HASH_BITS = 64
+
+# Query parameters that identify a posting; all others (tracking, search context) are dropped
+_ID_PARAMS = frozenset({"jk", "vjk", "currentjobid", "jobid", "job_id", "id", "gh_jid", "lever-via"})
+_LINKEDIN_JOB_RE = re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)")
+_WORD_RE = re.compile(r"[a-z0-9+#&]+")
+
+
+def canonical_url(url: str) -> str:
+    """``host/path?id-params`` without scheme, ``www.``, tracking parameters or trailing slash."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    params = sorted((key.lower(), value) for key, value in parse_qsl(parts.query) if key.lower() in _ID_PARAMS)
+    linkedin = _LINKEDIN_JOB_RE.search(parts.path)
+    if host.endswith("linkedin.com") and (linkedin or params):
+        job_id = linkedin.group(1) if linkedin else dict(params).get("currentjobid", "")
+        if job_id:
+            return f"linkedin.com/jobs/view/{job_id}"
+    if host.endswith("indeed.com"):
+        job_key = dict(params).get("jk") or dict(params).get("vjk")
+        if job_key:
+            return f"indeed.com/viewjob?jk={job_key}"
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" + (f"?{urlencode(params)}" if params else "")
+
+
+def description_words(text: str) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def simhash(words: Sequence[str]) -> int:
+    """64-bit SimHash of the word shingles; the per-bit vote is one NumPy reduction."""
+    import numpy as np
+
+    size = min(SHINGLE_WORDS, len(words))
+    shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)} if size else set()
+    if not shingles:
+        return 0
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype="<u8",
+        count=len(shingles),
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1)
+    majority = (bits.sum(axis=0) * 2 > len(shingles)).astype(np.uint8)
+    return int(np.packbits(majority).view("<u8")[0])
+
+
+def _bands(fingerprint: int, count: int) -> List[Tuple[int, int]]:
+    """``count`` (band, value) slices of the fingerprint; a match within ``count - 1`` bits shares one."""
+    width = HASH_BITS // count
+    mask = (1 << width) - 1
+    return [(band, (fingerprint >> (band * width)) & mask) for band in range(count)]
+
+
+def _key_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _cluster_id(url_key: str, fingerprint: Optional[int], listing_key: str) -> str:
+    return "job-" + _key_hash(url_key or f"{fingerprint}|{listing_key}")
+
+
+class JobIndex:
+    """Seen postings by URL, SimHash and listing key; ``path=None`` keeps it in memory only."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_INDEX_PATH,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.path = Path(path) if path else None
+        self.max_distance = max_distance
+        self.band_count = min(max_distance + 1, HASH_BITS)
+        self.ttl_seconds = ttl_seconds
+        self._urls: Dict[str, str] = {}
+        self._listings: Dict[str, str] = {}
+        self._fingerprints: Dict[int, str] = {}
+        self._bands: Dict[Tuple[int, int], Set[int]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self._open()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_index (
+                cluster_id TEXT NOT NULL,
+                url_key TEXT,
+                simhash TEXT,
+                listing_key TEXT,
+                seen_at REAL NOT NULL
+            )
+            """
+        )
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM job_index WHERE seen_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+        rows = self._conn.execute("SELECT cluster_id, url_key, simhash, listing_key FROM job_index").fetchall()
+        for cluster_id, url_key, fingerprint, listing_key in rows:
+            self._remember(cluster_id, url_key, int(fingerprint, 16) if fingerprint else None, listing_key)
+        if rows:
+            logger.debug(f"Loaded {len(rows)} seen job postings from {self.path}")
+
+    def _remember(self, cluster_id: str, url_key: str, fingerprint: Optional[int], listing_key: str) -> None:
+        if url_key:
+            self._urls.setdefault(url_key, cluster_id)
+        if listing_key:
+            self._listings.setdefault(listing_key, cluster_id)
+        if fingerprint is not None and fingerprint not in self._fingerprints:
+            self._fingerprints[fingerprint] = cluster_id
+            for band in _bands(fingerprint, self.band_count):
+                self._bands.setdefault(band, set()).add(fingerprint)
+
+    @staticmethod
+    def keys(job: Any) -> Tuple[str, Optional[int], str]:
+        """``(url key, SimHash or None, listing key)`` for a job."""
+        words = description_words(job.description)
+        fingerprint = simhash(words) if len(words) >= MIN_FINGERPRINT_WORDS else None
+        listing = "|".join(
+            " ".join(description_words(value)) for value in (job.company, job.role, job.location, job.description)
+        )
+        return canonical_url(job.link), fingerprint, _key_hash(listing)
+
+    def _near(self, fingerprint: int) -> Optional[str]:
+        candidates: Set[int] = set()
+        for band in _bands(fingerprint, self.band_count):
+            candidates |= self._bands.get(band, set())
+        best = min(candidates, key=lambda seen: bin(seen ^ fingerprint).count("1"), default=None)
+        if best is not None and bin(best ^ fingerprint).count("1") <= self.max_distance:
+            return self._fingerprints[best]
+        return None
+
+    def check(self, job: Any) -> str:
+        """
+        Look the posting up without recording it and set ``job.cluster_id``.
+        Returns the key that matched a recorded posting ("url",
+        "near_duplicate", "listing"), or "" for a new one.
+        """
+        url_key, fingerprint, listing_key = self.keys(job)
+        with self._lock:
+            reason, cluster_id = "", None
+            if url_key and url_key in self._urls:
+                reason, cluster_id = "url", self._urls[url_key]
+            elif fingerprint is not None and (near := self._near(fingerprint)) is not None:
+                reason, cluster_id = "near_duplicate", near
+            elif listing_key in self._listings:
+                reason, cluster_id = "listing", self._listings[listing_key]
+        job.cluster_id = cluster_id or _cluster_id(url_key, fingerprint, listing_key)
+        return reason
+
+    def record(self, job: Any) -> None:
+        """Add the posting to the index (and its database) under ``job.cluster_id``."""
+        url_key, fingerprint, listing_key = self.keys(job)
+        cluster_id = job.cluster_id or _cluster_id(url_key, fingerprint, listing_key)
+        with self._lock:
+            self._remember(cluster_id, url_key, fingerprint, listing_key)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO job_index (cluster_id, url_key, simhash, listing_key, seen_at) VALUES (?, ?, ?, ?, ?)",
+                    (cluster_id, url_key, f"{fingerprint:016x}" if fingerprint is not None else None, listing_key, time.time()),
+                )
+                self._conn.commit()
+        job.cluster_id = cluster_id
+
+    def deduplicate(self, jobs: Sequence[Any], batch: Optional["JobIndex"] = None) -> List[Any]:
+        """
+        The jobs neither in this index nor in ``batch``, in order; those are
+        recorded in ``batch`` only. ``batch`` defaults to a new in-memory
+        index, which drops repeats within ``jobs``.
+        """
+        if batch is None:
+            batch = JobIndex(path=None, max_distance=self.max_distance)
+        fresh = []
+        for job in jobs:
+            started = time.perf_counter()
+            reason = self.check(job)
+            if not reason and batch is not self:
+                reason = batch.check(job)
+            if not reason:
+                batch.record(job)
+            _record(reason, time.perf_counter() - started)
+            if reason:
+                logger.info(f"Skipping duplicate posting {job.role} at {job.company} ({reason}, {job.cluster_id})")
+            else:
+                fresh.append(job)
+        return fresh
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(set(self._urls.values()) | set(self._fingerprints.values()) | set(self._listings.values()))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance and stats
+# ---------------------------------------------------------------------------
+
+_shared_index: Optional[JobIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_job_index() -> Optional[JobIndex]:
+    """Return the shared persistent index configured in config.py (None when disabled)."""
+    global _shared_index
+    import config as cfg
+
+    if not getattr(cfg, "JOB_DEDUP_ENABLED", True):
+        return None
+    with _shared_lock:
+        if _shared_index is None:
+            try:
+                _shared_index = JobIndex(
+                    path=Path(getattr(cfg, "JOB_DEDUP_PATH", DEFAULT_INDEX_PATH)),
+                    max_distance=getattr(cfg, "JOB_DEDUP_MAX_DISTANCE", DEFAULT_MAX_DISTANCE),
+                    ttl_seconds=getattr(cfg, "JOB_DEDUP_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                )
+            except Exception as exc:
+                logger.warning(f"Job dedup index unavailable: {exc}")
+                return None
+        return _shared_index
+
+
+_REASONS = ("url", "near_duplicate", "listing")
+_stats = {"lookups": 0, "duplicates": 0, **{reason: 0 for reason in _REASONS}, "seconds": 0.0, "max_seconds": 0.0}
+_stats_lock = threading.Lock()
+
+
+def _record(reason: str, elapsed: float) -> None:
+    with _stats_lock:
+        _stats["lookups"] += 1
+        if reason:
+            _stats["duplicates"] += 1
+            _stats[reason] += 1
+        _stats["seconds"] += elapsed
+        _stats["max_seconds"] = max(_stats["max_seconds"], elapsed)
+
+
+def dedup_stats() -> Dict[str, Any]:
+    """Lookups, duplicates per matching key, dedupe rate and lookup latency."""
+    with _stats_lock:
+        lookups = _stats["lookups"]
+        return {
+            "lookups": lookups,
+            "duplicates": _stats["duplicates"],
+            "by_key": {reason: _stats[reason] for reason in _REASONS},
+            "dedupe_rate": round(_stats["duplicates"] / lookups, 4) if lookups else 0.0,
+            "avg_lookup_ms": round(_stats["seconds"] / lookups * 1000, 3) if lookups else 0.0,
+            "max_lookup_ms": round(_stats["max_seconds"] * 1000, 3),
+        }
+
+
+def reset_dedup_stats() -> None:
+    with _stats_lock:
+        _stats.update(lookups=0, duplicates=0, seconds=0.0, max_seconds=0.0, **{reason: 0 for reason in _REASONS})
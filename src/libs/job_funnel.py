@@ -0,0 +1,186 @@
+"""
+job_funnel.py
+=============
+Staged funnel between job search and LLM ATS scoring.
+
+``BotManager.run_batch`` used to send every search result to the LLM,
+including postings it would then skip for a blacklisted company or cap at 45
+as out of scope. ``JobFunnel.run(jobs)`` works in stages instead:
+
+1. filter — drop jobs matching ``company_blacklist``, ``title_blacklist`` or
+   ``location_blacklist`` from work_preferences.yaml, then score the rest
+   locally (``ATSScorer.heuristic_scores``) and drop out-of-scope roles and
+   those below ``ATS_FUNNEL_MIN_SCORE``;
+2. rank   — order the survivors by heuristic score and keep the top
+   ``ATS_FUNNEL_TOP_K`` (``funnel_top_k`` in the run config takes precedence);
+3. score  — only the shortlist goes to the LLM, batched through
+   ``ATSScorer.score_jobs``. Without an LLM the heuristic analyses are final.
+
+Each run returns a ``FunnelResult`` with the candidates best first and its
+per-stage counts and seconds. The same figures accumulate process-wide,
+together with the LLM scorings the funnel avoided; see ``funnel_stats()``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+from src.logging import logger
+
+
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_SCORE = 15
+
+STAGES = ("filter", "rank", "score")
+REJECTIONS = ("company_blacklist", "title_blacklist", "location_blacklist", "out_of_scope", "low_score")
+
+
+def job_text(job: Any) -> str:
+    """What gets scored for a job: its description, or its title and company when that is empty."""
+    return job.description or f"{job.role} at {job.company}"
+
+
+@dataclass
+class FunnelResult:
+    candidates: List[Tuple[Any, Dict[str, Any]]]                # (job, analysis), best first
+    counts: Dict[str, int] = field(default_factory=dict)       # jobs entering each stage, and "candidates"
+    rejected: Dict[str, int] = field(default_factory=dict)     # jobs dropped by the filter, per reason
+    seconds: Dict[str, float] = field(default_factory=dict)    # time spent per stage
+
+    def summary(self) -> str:
+        counts = " -> ".join(f"{stage} {self.counts[stage]}" for stage in STAGES)
+        dropped = ", ".join(f"{reason} {n}" for reason, n in self.rejected.items() if n) or "none"
+        timings = ", ".join(f"{stage} {self.seconds[stage] * 1000:.0f} ms" for stage in STAGES)
+        return f"Job funnel: {counts} -> {self.counts['candidates']} candidates (dropped: {dropped}; {timings})"
+
+
+class JobFunnel:
+    def __init__(self, scorer: Any, config: Dict[str, Any], resume_path: Any):
+        import config as cfg
+
+        self.scorer = scorer
+        self.resume_path = resume_path
+        self.top_k = int(config.get("funnel_top_k") or getattr(cfg, "ATS_FUNNEL_TOP_K", DEFAULT_TOP_K))
+        self.min_score = getattr(cfg, "ATS_FUNNEL_MIN_SCORE", DEFAULT_MIN_SCORE)
+        self.company_blacklist = [name.lower() for name in config.get("company_blacklist") or [] if name]
+        self.title_blacklist = [
+            re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE) for word in config.get("title_blacklist") or [] if word
+        ]
+        self.location_blacklist = [place.lower() for place in config.get("location_blacklist") or [] if place]
+
+    def run(self, jobs: Sequence[Any]) -> FunnelResult:
+        rejected = {reason: 0 for reason in REJECTIONS}
+        seconds = {}
+
+        started = time.perf_counter()
+        allowed = []
+        for job in jobs:
+            reason = self._blacklisted(job)
+            if reason:
+                rejected[reason] += 1
+            else:
+                allowed.append(job)
+        survivors = []
+        for job, analysis in zip(allowed, self.scorer.heuristic_scores(self.resume_path, [job_text(j) for j in allowed])):
+            if analysis.get("alignment_notes", {}).get("hard_mismatch"):
+                rejected["out_of_scope"] += 1
+            elif analysis.get("score", 0) < self.min_score:
+                rejected["low_score"] += 1
+            else:
+                survivors.append((job, analysis))
+        seconds["filter"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        shortlist = sorted(survivors, key=lambda pair: pair[1].get("score", 0), reverse=True)[: self.top_k]
+        seconds["rank"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if self.scorer.ai_adapter is not None and shortlist:
+            shortlisted = [job for job, _heuristic in shortlist]
+            analyses = self.scorer.score_jobs(self.resume_path, [job_text(job) for job in shortlisted])
+            candidates = sorted(zip(shortlisted, analyses), key=lambda pair: pair[1].get("score", 0), reverse=True)
+            llm_scored = len(shortlisted)
+        else:
+            candidates = shortlist
+            llm_scored = 0
+        seconds["score"] = time.perf_counter() - started
+
+        result = FunnelResult(
+            candidates=candidates,
+            counts={"filter": len(jobs), "rank": len(survivors), "score": len(shortlist), "candidates": len(candidates)},
+            rejected=rejected,
+            seconds=seconds,
+        )
+        _record(result, llm_scored, llm_saved=len(jobs) - llm_scored if self.scorer.ai_adapter is not None else 0)
+        logger.info(result.summary())
+        return result
+
+    def _blacklisted(self, job: Any) -> str:
+        company = (job.company or "").lower()
+        if any(name in company for name in self.company_blacklist):
+            return "company_blacklist"
+        if any(pattern.search(job.role or "") for pattern in self.title_blacklist):
+            return "title_blacklist"
+        location = (job.location or "").lower()
+        if any(place in location for place in self.location_blacklist):
+            return "location_blacklist"
+        return ""
+
+
+# ---------------------------------------------------------------------------
+# Process-wide stats
+# ---------------------------------------------------------------------------
+
+_stats: Dict[str, Any] = {}
+_stats_lock = threading.Lock()
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {
+        "runs": 0,
+        "jobs": {stage: 0 for stage in (*STAGES, "candidates")},
+        "rejected": {reason: 0 for reason in REJECTIONS},
+        "seconds": {stage: 0.0 for stage in STAGES},
+        "llm_scored": 0,
+        "llm_saved": 0,
+    }
+
+
+_stats.update(_empty_stats())
+
+
+def _record(result: FunnelResult, llm_scored: int, llm_saved: int) -> None:
+    with _stats_lock:
+        _stats["runs"] += 1
+        for stage, count in result.counts.items():
+            _stats["jobs"][stage] += count
+        for reason, count in result.rejected.items():
+            _stats["rejected"][reason] += count
+        for stage, elapsed in result.seconds.items():
+            _stats["seconds"][stage] += elapsed
+        _stats["llm_scored"] += llm_scored
+        _stats["llm_saved"] += llm_saved
+
+
+def funnel_stats() -> Dict[str, Any]:
+    """Jobs entering each stage, rejections per reason, seconds per stage and LLM scorings saved."""
+    with _stats_lock:
+        considered = _stats["llm_scored"] + _stats["llm_saved"]
+        return {
+            "runs": _stats["runs"],
+            "jobs": dict(_stats["jobs"]),
+            "rejected": dict(_stats["rejected"]),
+            "seconds": {stage: round(elapsed, 4) for stage, elapsed in _stats["seconds"].items()},
+            "llm_scored": _stats["llm_scored"],
+            "llm_saved": _stats["llm_saved"],
+            "llm_saved_rate": round(_stats["llm_saved"] / considered, 4) if considered else 0.0,
+        }
+
+
+def reset_funnel_stats() -> None:
+    with _stats_lock:
+        _stats.update(_empty_stats())
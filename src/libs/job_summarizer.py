@@ -0,0 +1,294 @@
+"""
+job_summarizer.py
+=================
+Batched job-description summarisation with a shared, persistent cache.
+
+``JobSummarizer.summarize_many`` takes N descriptions and packs as many as fit
+in ``JOB_SUMMARY_BATCH_TOKEN_BUDGET`` (and ``JOB_SUMMARY_BATCH_MAX_JOBS``)
+into one request. The reply marks each summary with a ``### JOB <n>`` line
+and is split back per job. Jobs missing from a batch reply are retried one
+at a time with the original single-description prompt.
+
+Every summary lands in ``JobSummaryCache`` keyed by
+
+  sha256(template)[:16] : sha256(description)
+
+so any later consumer using the same summary template (``GPTAnswerer``,
+``LLMResumeJobDescription``, ``LLMCoverLetterJobDescription``) reuses it,
+across restarts. Different templates produce different summaries and are
+cached separately.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.libs.llm_rate_limiter import estimate_tokens
+from src.logging import logger
+
+
+DEFAULT_SUMMARY_CACHE_PATH = Path("data_folder/output/job_summaries.sqlite3")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_TOKEN_BUDGET = 12000
+DEFAULT_MAX_JOBS = 8
+
+_BATCH_PLACEHOLDER = "(see the numbered job descriptions below)"
+_JOB_MARKER_RE = re.compile(r"^[\W_]*JOB\s+(\d+)[\W_]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def description_hash(description: str) -> str:
+    normalized = " ".join((description or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def template_hash(template: str) -> str:
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+class JobSummaryCache:
+    """SQLite-backed summary store with an in-process front dict."""
+
+    def __init__(self, path: Path = DEFAULT_SUMMARY_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._memory.get(key)
+            if summary is None:
+                row = self._conn.execute(
+                    "SELECT summary, created_at FROM job_summaries WHERE key = ?", (key,)
+                ).fetchone()
+                if row and not (self.ttl_seconds and time.time() - row[1] > self.ttl_seconds):
+                    summary = row[0]
+                    self._memory[key] = summary
+            if summary is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return summary
+
+    def put(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._memory[key] = summary
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                (key, summary, time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[JobSummaryCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_job_summary_cache() -> Optional[JobSummaryCache]:
+    """Process-wide summary cache built from config, or None if it can't be opened."""
+    global _cache
+    import config as cfg
+
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = JobSummaryCache(
+                    path=Path(getattr(cfg, "JOB_SUMMARY_CACHE_PATH", DEFAULT_SUMMARY_CACHE_PATH)),
+                    ttl_seconds=getattr(cfg, "JOB_SUMMARY_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                )
+            except Exception as exc:
+                logger.warning(f"Job summary cache disabled: {exc}")
+                return None
+        return _cache
+
+
+class JobSummarizer:
+    """
+    Summarise job descriptions with ``template`` (a prompt with a ``{text}``
+    slot) through ``llm``, a callable or ``.invoke``-able chat model.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        template: str,
+        postprocess: Optional[Callable[[str], str]] = None,
+        cache: Optional[JobSummaryCache] = None,
+        token_budget: Optional[int] = None,
+        max_jobs_per_request: Optional[int] = None,
+    ):
+        import config as cfg
+
+        self.llm = llm
+        self.template = template
+        self.postprocess = postprocess
+        self.cache = cache if cache is not None else get_job_summary_cache()
+        self.token_budget = token_budget or getattr(cfg, "JOB_SUMMARY_BATCH_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+        self.max_jobs_per_request = max_jobs_per_request or getattr(
+            cfg, "JOB_SUMMARY_BATCH_MAX_JOBS", DEFAULT_MAX_JOBS
+        )
+        self.requests = 0
+        self.batched_jobs = 0
+
+        from langchain_core.prompts import ChatPromptTemplate
+
+        self._prompt = ChatPromptTemplate.from_template(template)
+        self._instructions = self._prompt.format_messages(text=_BATCH_PLACEHOLDER)[0].content
+        self._template_key = template_hash(template)
+        self._instruction_tokens = estimate_tokens(self._instructions)
+
+    # -- public API ----------------------------------------------------------
+
+    def summarize(self, description: str) -> str:
+        """Summary for one description, from the cache when possible."""
+        key = self._key(description)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+        summary = self._finish(self._call(self._prompt.invoke({"text": description})))
+        self._store(key, summary)
+        return summary
+
+    def summarize_many(self, descriptions: Sequence[str]) -> List[Optional[str]]:
+        """
+        Summaries aligned with ``descriptions``; cached ones cost nothing and
+        duplicates are summarised once. A job that fails both in its batch and
+        on its own retry gets None.
+        """
+        results: Dict[str, Optional[str]] = {}
+        pending: Dict[str, str] = {}
+        for description in descriptions:
+            key = self._key(description)
+            if key in results or key in pending:
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = description
+
+        for batch in self._pack(list(pending.items())):
+            if len(batch) == 1:
+                self._summarize_single(batch[0], results)
+                continue
+            try:
+                summaries = self._split_reply(self._call(self._batch_prompt(batch)), len(batch))
+            except Exception as exc:
+                logger.warning(f"Batched summary of {len(batch)} jobs failed, retrying one by one: {exc}")
+                summaries = {}
+            self.batched_jobs += len(summaries)
+            for index, item in enumerate(batch, start=1):
+                summary = summaries.get(index)
+                if summary:
+                    results[item[0]] = summary
+                    self._store(item[0], summary)
+                else:
+                    self._summarize_single(item, results)
+
+        return [results.get(self._key(description)) for description in descriptions]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"requests": self.requests, "batched_jobs": self.batched_jobs}
+        if self.cache:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    # -- internals -------------------------------------------------------------
+
+    def _key(self, description: str) -> str:
+        return f"{self._template_key}:{description_hash(description)}"
+
+    def _store(self, key: str, summary: str) -> None:
+        if self.cache and summary:
+            self.cache.put(key, summary)
+
+    def _finish(self, text: str) -> str:
+        text = text.strip()
+        return self.postprocess(text) if self.postprocess else text
+
+    def _call(self, prompt: Any) -> str:
+        self.requests += 1
+        reply = self.llm(prompt) if callable(self.llm) else self.llm.invoke(prompt)
+        return getattr(reply, "content", reply) or ""
+
+    def _summarize_single(self, item, results: Dict[str, Optional[str]]) -> None:
+        key, description = item
+        try:
+            summary = self._finish(self._call(self._prompt.invoke({"text": description})))
+        except Exception as exc:
+            logger.error(f"Job summary failed: {exc}")
+            results[key] = None
+            return
+        results[key] = summary
+        self._store(key, summary)
+
+    def _pack(self, items: List[tuple]) -> List[List[tuple]]:
+        """Greedy packing under the token budget and the per-request job cap."""
+        batches: List[List[tuple]] = []
+        current: List[tuple] = []
+        used = self._instruction_tokens
+        for item in items:
+            cost = estimate_tokens(item[1]) + 16
+            if current and (used + cost > self.token_budget or len(current) >= self.max_jobs_per_request):
+                batches.append(current)
+                current, used = [], self._instruction_tokens
+            current.append(item)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _batch_prompt(self, batch: List[tuple]) -> str:
+        parts = [
+            self._instructions.strip(),
+            "",
+            f"Apply the instructions above separately to each of the {len(batch)} job descriptions below.",
+            'Begin each result with a line containing only "### JOB <number>", using the number of '
+            "the job description it covers, and write nothing before the first marker.",
+        ]
+        for index, (_key, description) in enumerate(batch, start=1):
+            parts += ["", f"=== JOB DESCRIPTION {index} ===", description.strip()]
+        return "\n".join(parts)
+
+    def _split_reply(self, reply: str, expected: int) -> Dict[int, str]:
+        pieces = _JOB_MARKER_RE.split(reply)
+        summaries: Dict[int, str] = {}
+        # pieces = [preamble, n1, text1, n2, text2, ...]
+        for number, text in zip(pieces[1::2], pieces[2::2]):
+            index = int(number)
+            if 1 <= index <= expected and text.strip() and index not in summaries:
+                summaries[index] = self._finish(text)
+        return summaries
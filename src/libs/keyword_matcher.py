@@ -0,0 +1,205 @@
+"""
+keyword_matcher.py
+==================
+Multi-keyword matching against categorised dictionaries in one pass.
+
+``ATSScorer._compute_role_alignment`` used to run ``keyword in text`` once
+per keyword, which does not scale to the thousand-term skill and role
+dictionaries profiles can now load, and matched inside words ("erp" in
+"interpersonal"). ``KeywordMatcher`` builds an Aho-Corasick automaton over
+word tokens instead:
+
+  matcher = KeywordMatcher({"in_scope": [...], "out_of_scope": [...]})
+  matcher.match(text)        -> {"in_scope": ["inventory", ...], "out_of_scope": []}
+  matcher.match_many(texts)  -> one such dict per text
+  matcher.hit_matrix(texts)  -> NumPy bool array, texts x matcher.terms
+
+Text and terms are split into the same word tokens, so matches always fall on
+word boundaries and "full stack" also matches "full-stack". Each text is
+scanned once whatever the dictionary size; hits are listed in the order the
+terms first appear in the dictionaries.
+
+Dictionaries come from YAML (``load_dictionaries``): a mapping of category
+to term list. ``dictionary_matcher(path, defaults)`` returns the matcher for
+a dictionary file on top of ``defaults``, rebuilt when the file changes;
+categories in the file replace the default ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from src.logging import logger
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#&]+")
+
+
+def tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class KeywordMatcher:
+    def __init__(self, dictionaries: Mapping[str, Iterable[str]]):
+        self.categories: List[str] = list(dictionaries)
+        self.terms: List[str] = []
+        self.term_categories: List[Tuple[int, ...]] = []
+        # Automaton: per state the token transitions, failure link and term ids ending there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        ids: Dict[Tuple[str, ...], int] = {}
+        for category_index, category in enumerate(self.categories):
+            for term in dictionaries[category] or []:
+                key = tuple(tokens(str(term)))
+                if not key:
+                    continue
+                term_id = ids.get(key)
+                if term_id is None:
+                    term_id = ids[key] = len(self.terms)
+                    self.terms.append(str(term))
+                    self.term_categories.append(())
+                    self._insert(key, term_id)
+                if category_index not in self.term_categories[term_id]:
+                    self.term_categories[term_id] += (category_index,)
+        self._link()
+        # Identifies the dictionaries, e.g. so cached results can be tied to the rules that made them
+        self.fingerprint = hashlib.sha256(
+            json.dumps([self.categories, self.terms, self.term_categories]).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def _insert(self, key: Tuple[str, ...], term_id: int) -> None:
+        state = 0
+        for token in key:
+            following = self._goto[state].get(token)
+            if following is None:
+                following = self._goto[state][token] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = following
+        self._out[state] += (term_id,)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each state also reports the terms of its failure chain."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[following] = target
+                self._out[following] += self._out[self._fail[following]]
+
+    def term_ids(self, text: str) -> List[int]:
+        """Ids (indexes into ``terms``) of the terms found in ``text``, in ``terms`` order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        found = set()
+        state = 0
+        for token in tokens(text):
+            if state == 0:
+                state = root.get(token, 0)
+            else:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            if out[state]:
+                found.update(out[state])
+        return sorted(found)
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        hits: Dict[str, List[str]] = {category: [] for category in self.categories}
+        for term_id in self.term_ids(text):
+            for category_index in self.term_categories[term_id]:
+                hits[self.categories[category_index]].append(self.terms[term_id])
+        return hits
+
+    def match_many(self, texts: Sequence[str]) -> List[Dict[str, List[str]]]:
+        return [self.match(text) for text in texts]
+
+    def hit_matrix(self, texts: Sequence[str]) -> Any:
+        """``numpy`` bool array with a row per text and a column per term."""
+        import numpy as np
+
+        matrix = np.zeros((len(texts), len(self.terms)), dtype=bool)
+        rows: List[int] = []
+        columns: List[int] = []
+        for row, text in enumerate(texts):
+            found = self.term_ids(text)
+            rows.extend([row] * len(found))
+            columns.extend(found)
+        matrix[rows, columns] = True
+        return matrix
+
+    def category_mask(self, category: str) -> Any:
+        """``numpy`` bool array over ``terms`` selecting one category, for use with ``hit_matrix``."""
+        import numpy as np
+
+        index = self.categories.index(category)
+        return np.fromiter((index in owners for owners in self.term_categories), dtype=bool, count=len(self.terms))
+
+
+# ---------------------------------------------------------------------------
+# Dictionary files
+# ---------------------------------------------------------------------------
+
+def load_dictionaries(path: Any) -> Dict[str, List[str]]:
+    """``{category: [term, ...]}`` from a YAML mapping; raises OSError or ValueError."""
+    with open(path, "r", encoding="utf-8") as fh:
+        data = yaml.safe_load(fh) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must map categories to term lists")
+    dictionaries = {}
+    for category, terms in data.items():
+        if not isinstance(terms, list):
+            raise ValueError(f"{path}: '{category}' must be a list of terms")
+        dictionaries[str(category)] = [str(term) for term in terms if term is not None]
+    return dictionaries
+
+
+_matchers: Dict[Tuple[Any, ...], KeywordMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def dictionary_matcher(path: Optional[Any], defaults: Mapping[str, Iterable[str]]) -> KeywordMatcher:
+    """
+    The matcher for ``defaults`` with the categories in the YAML file at
+    ``path`` replacing them; cached until the file's mtime changes. A missing
+    or invalid file leaves the defaults in place.
+    """
+    dictionaries = {category: list(terms) for category, terms in defaults.items()}
+    mtime = 0
+    if path:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            path = None
+    key = (os.path.abspath(path) if path else "", mtime, tuple(dictionaries))
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+    if matcher is not None:
+        return matcher
+
+    if path:
+        try:
+            dictionaries.update(load_dictionaries(path))
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            logger.warning(f"Keyword dictionaries at {path} ignored: {e}")
+    matcher = KeywordMatcher(dictionaries)
+    logger.debug(f"Built keyword matcher: {len(matcher.terms)} terms in {len(matcher.categories)} categories")
+    with _matchers_lock:
+        if len(_matchers) >= 8:
+            _matchers.clear()
+        _matchers[key] = matcher
+    return matcher
@@ -0,0 +1,160 @@
+"""
+llm_async.py
+============
+Process-wide async runtime for LLM calls.
+
+All asynchronous provider traffic runs on one background event loop owned by
+this module, so that
+
+  * a single pooled ``httpx`` client pair is reused for the process lifetime
+    (providers that accept an injected client, e.g. OpenAI, share it), and
+  * the per-provider semaphores that cap in-flight requests are bound to one
+    loop no matter whether the caller is FastAPI, a CLI command or a thread.
+
+Callers never touch the loop directly: ``run_on_llm_loop`` awaits a coroutine
+from any event loop, ``stream_on_llm_loop`` relays an async generator's items
+to the caller's loop and ``run_sync`` blocks on a coroutine from synchronous code.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
+
+from src.logging import logger
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_HTTP_MAX_CONNECTIONS = 20
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_http_clients: Optional[Tuple[Any, Any]] = None
+_http_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Event loop
+# ---------------------------------------------------------------------------
+
+def get_llm_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop dedicated to LLM calls, starting it on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="llm-event-loop", daemon=True
+            )
+            _loop_thread.start()
+            logger.debug("Started background LLM event loop")
+        return _loop
+
+
+async def run_on_llm_loop(coro: Awaitable[Any]) -> Any:
+    """Await ``coro`` on the LLM loop from whatever loop the caller is on."""
+    loop = get_llm_loop()
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    if current is loop:
+        return await coro
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return await asyncio.wrap_future(future)
+
+
+async def stream_on_llm_loop(stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Iterate ``stream`` on the LLM loop, yielding its items on the caller's loop."""
+    loop = get_llm_loop()
+    current = asyncio.get_running_loop()
+    if current is loop:
+        async for item in stream:
+            yield item
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+
+    async def _pump():
+        try:
+            async for item in stream:
+                current.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except Exception as exc:
+            current.call_soon_threadsafe(queue.put_nowait, (end, exc))
+        else:
+            current.call_soon_threadsafe(queue.put_nowait, (end, None))
+
+    future = asyncio.run_coroutine_threadsafe(_pump(), loop)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # The consumer stopped early (e.g. the client disconnected): stop the provider stream
+        future.cancel()
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run ``coro`` on the LLM loop and block until it finishes."""
+    loop = get_llm_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+# ---------------------------------------------------------------------------
+# Concurrency limits
+# ---------------------------------------------------------------------------
+
+def get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """
+    Semaphore capping in-flight requests for ``provider``.
+    Must be called from the LLM loop (the semaphore is bound to it).
+    """
+    semaphore = _semaphores.get(provider)
+    if semaphore is None:
+        import config as cfg
+
+        limits = getattr(cfg, "LLM_PROVIDER_CONCURRENCY", {}) or {}
+        default = getattr(cfg, "LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        semaphore = asyncio.Semaphore(max(1, int(limits.get(provider, default))))
+        _semaphores[provider] = semaphore
+    return semaphore
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP connection pool
+# ---------------------------------------------------------------------------
+
+def get_shared_http_clients() -> Tuple[Any, Any]:
+    """
+    Return the process-wide ``(httpx.Client, httpx.AsyncClient)`` pair,
+    or ``(None, None)`` when httpx is not installed.
+    """
+    global _http_clients
+    try:
+        import httpx
+    except ImportError:
+        return None, None
+    with _http_lock:
+        if _http_clients is None:
+            import config as cfg
+
+            max_connections = getattr(cfg, "LLM_HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS)
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            )
+            timeout = httpx.Timeout(120.0, connect=10.0)
+            _http_clients = (
+                httpx.Client(limits=limits, timeout=timeout),
+                httpx.AsyncClient(limits=limits, timeout=timeout),
+            )
+        return _http_clients
@@ -0,0 +1,275 @@
+"""
+llm_cache.py
+============
+Persistent, content-addressed cache for LLM responses.
+
+Every ``AIAdapter`` in the process shares one ``LLMResponseCache`` (see
+``get_llm_cache``), so ``GPTAnswerer``, ``ATSScorer``, ``ResumeTailor`` and
+``RecruiterPrepEngine`` all reuse answers to prompts that were already sent,
+including across restarts.
+
+Cache key
+---------
+  sha256( provider | model | temperature | rendered prompt )
+
+Eviction
+--------
+  * entries older than ``ttl_seconds`` are treated as misses and removed
+  * when ``max_entries`` or ``max_bytes`` is exceeded, the least recently
+    used entries are dropped first
+
+Messages served from the cache carry ``response_metadata["cache_hit"] = True``
+(``is_cache_hit``) so call logs and cost totals do not count them again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.logging import logger
+
+
+DEFAULT_CACHE_PATH = Path("data_folder/output/llm_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Prompt / message (de)serialisation
+# ---------------------------------------------------------------------------
+
+def render_prompt(prompt: Any) -> str:
+    """Return a stable text rendering of a str, PromptValue or message list."""
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_messages"):
+        prompt = prompt.to_messages()
+    if isinstance(prompt, (list, tuple)):
+        parts = []
+        for message in prompt:
+            if isinstance(message, dict):
+                parts.append(f"{message.get('role', '')}: {message.get('content', '')}")
+            else:
+                parts.append(f"{getattr(message, 'type', '')}: {getattr(message, 'content', message)}")
+        return "\n".join(parts)
+    return str(prompt)
+
+
+CACHE_HIT = "cache_hit"
+
+
+def is_cache_hit(message: Any) -> bool:
+    """True for a message ``LLMResponseCache.get`` returned rather than a provider."""
+    return bool((getattr(message, "response_metadata", None) or {}).get(CACHE_HIT))
+
+
+def message_to_payload(message: Any) -> Dict[str, Any]:
+    """Serialise an AIMessage (or plain string) into a JSON-safe dict."""
+    if isinstance(message, str):
+        return {"content": message}
+    return {
+        "content": getattr(message, "content", str(message)),
+        "response_metadata": {
+            k: v for k, v in (getattr(message, "response_metadata", None) or {}).items() if k != CACHE_HIT
+        },
+        "usage_metadata": dict(getattr(message, "usage_metadata", None) or {}),
+        "id": getattr(message, "id", None),
+    }
+
+
+def payload_to_message(payload: Dict[str, Any]) -> Any:
+    """Rebuild the AIMessage stored by ``message_to_payload``."""
+    from langchain_core.messages.ai import AIMessage
+
+    kwargs: Dict[str, Any] = {
+        "content": payload.get("content", ""),
+        "response_metadata": payload.get("response_metadata") or {},
+        "id": payload.get("id"),
+    }
+    if payload.get("usage_metadata"):
+        kwargs["usage_metadata"] = payload["usage_metadata"]
+    return AIMessage(**kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                model TEXT,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: Any, provider: str, model: str, temperature: Optional[float]) -> str:
+        material = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "temperature": temperature,
+                "prompt": render_prompt(prompt),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached message for ``key`` or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            payload, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        message = payload_to_message(json.loads(payload))
+        message.response_metadata[CACHE_HIT] = True
+        return message
+
+    def put(self, key: str, message: Any, provider: str = "", model: str = "") -> None:
+        payload = json.dumps(message_to_payload(message), ensure_ascii=False, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, provider, model, payload, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, payload, len(payload), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Forget ``key``, e.g. a reply its caller found unusable."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until both size limits hold."""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the shared cache configured in config.py (None when disabled)."""
+    global _shared_cache
+    import config as cfg
+
+    if not getattr(cfg, "LLM_CACHE_ENABLED", True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = LLMResponseCache(
+                    path=Path(getattr(cfg, "LLM_CACHE_PATH", DEFAULT_CACHE_PATH)),
+                    ttl_seconds=getattr(cfg, "LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                    max_entries=getattr(cfg, "LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                    max_bytes=getattr(cfg, "LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+                )
+            except Exception as exc:
+                logger.warning(f"LLM response cache unavailable: {exc}")
+                return None
+        return _shared_cache
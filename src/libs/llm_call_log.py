@@ -0,0 +1,299 @@
+"""
+llm_call_log.py
+===============
+Append-only JSONL log of every LLM call, written off the request path.
+
+``LLMLogger.log_request`` only builds a small dict and hands it to
+``LLMCallLogWriter.write``, which enqueues it without blocking. A daemon
+thread drains the queue in batches, serialises each entry as one compact JSON
+line and appends it to ``data_folder/output/open_ai_calls.jsonl``.
+
+When the active file grows past ``max_bytes`` it is rotated to
+``open_ai_calls.1.jsonl`` (``.jsonl.zst`` when compression is enabled and the
+optional ``zstandard`` package is installed), keeping ``backup_count`` files.
+
+Usage (aggregate report)
+------------------------
+  python -m src.libs.llm_call_log summary
+  python -m src.libs.llm_call_log summary --since 2026-03-01 --model gemini-2.5-flash
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import queue
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from src.logging import logger
+
+
+DEFAULT_LOG_PATH = Path("data_folder/output/open_ai_calls.jsonl")
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+# USD per token, used when the model has no entry in config.LLM_PRICING
+DEFAULT_PROMPT_PRICE_PER_TOKEN = 0.00000015
+DEFAULT_COMPLETION_PRICE_PER_TOKEN = 0.0000006
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    import config as cfg
+
+    prices = (getattr(cfg, "LLM_PRICING", {}) or {}).get(model_name)
+    prompt_price, completion_price = prices or (
+        DEFAULT_PROMPT_PRICE_PER_TOKEN,
+        DEFAULT_COMPLETION_PRICE_PER_TOKEN,
+    )
+    return input_tokens * prompt_price + output_tokens * completion_price
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+class LLMCallLogWriter:
+    """Background-thread, batched JSONL writer with size-based rotation."""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_LOG_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        compress: bool = False,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress and zstandard is not None
+        if compress and zstandard is None:
+            logger.warning("zstandard is not installed; rotated LLM call logs stay uncompressed")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(target=self._run, name="llm-call-log", daemon=True)
+        self._thread.start()
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Enqueue ``entry``; never blocks the caller."""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything enqueued so far is on disk."""
+        done = threading.Event()
+        self.write(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    # -- background thread -------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval if len(batch) == 1 else 0))
+                except queue.Empty:
+                    break
+            stop = self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Any]) -> bool:
+        lines = []
+        events = []
+        stop = False
+        for item in batch:
+            if item is self._STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                events.append(item)
+            else:
+                lines.append(json.dumps(item, ensure_ascii=False, default=str, separators=(",", ":")))
+        if lines:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write("\n".join(lines) + "\n")
+                self.written += len(lines)
+                if self.path.stat().st_size > self.max_bytes:
+                    self._rotate()
+            except Exception as exc:
+                logger.error(f"Failed to write LLM call log: {exc}")
+        for event in events:
+            event.set()
+        return stop
+
+    def _rotated_path(self, index: int) -> Path:
+        suffix = ".jsonl.zst" if self.compress else ".jsonl"
+        return self.path.with_name(f"{self.path.stem}.{index}{suffix}")
+
+    def _rotate(self) -> None:
+        oldest = self._rotated_path(self.backup_count)
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self._rotated_path(index)
+            if source.exists():
+                source.rename(self._rotated_path(index + 1))
+        target = self._rotated_path(1)
+        if self.compress:
+            data = self.path.read_bytes()
+            target.write_bytes(zstandard.ZstdCompressor().compress(data))
+            self.path.unlink()
+        else:
+            self.path.rename(target)
+
+
+_writers: Dict[Path, LLMCallLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_call_log_writer(path: Optional[Path] = None) -> LLMCallLogWriter:
+    """Return the process-wide writer for ``path`` (config.LLM_CALL_LOG_PATH by default)."""
+    import config as cfg
+
+    path = Path(path or getattr(cfg, "LLM_CALL_LOG_PATH", DEFAULT_LOG_PATH))
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = LLMCallLogWriter(
+                path,
+                max_bytes=getattr(cfg, "LLM_CALL_LOG_MAX_BYTES", DEFAULT_MAX_BYTES),
+                backup_count=getattr(cfg, "LLM_CALL_LOG_BACKUPS", DEFAULT_BACKUP_COUNT),
+                compress=getattr(cfg, "LLM_CALL_LOG_COMPRESS", False),
+            )
+            _writers[path] = writer
+        return writer
+
+
+@atexit.register
+def _flush_all_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(timeout=2.0)
+
+
+# ---------------------------------------------------------------------------
+# Reading and aggregation
+# ---------------------------------------------------------------------------
+
+def iter_entries(path: Path = DEFAULT_LOG_PATH) -> Iterator[Dict[str, Any]]:
+    """Yield entries from rotated segments (oldest first) and then the active file."""
+    path = Path(path)
+    segments = sorted(
+        path.parent.glob(f"{path.stem}.*.jsonl*"),
+        key=lambda p: int(p.name[len(path.stem) + 1:].split(".")[0]),
+        reverse=True,
+    ) if path.parent.exists() else []
+    for segment in segments + [path]:
+        if not segment.exists():
+            continue
+        if segment.suffix == ".zst":
+            if zstandard is None:
+                logger.warning(f"Skipping {segment}: zstandard is not installed")
+                continue
+            with open(segment, "rb") as fh:
+                text = zstandard.ZstdDecompressor().stream_reader(fh).read().decode("utf-8")
+        else:
+            text = segment.read_text(encoding="utf-8")
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def summarize(
+    entries: Iterator[Dict[str, Any]],
+    since: Optional[str] = None,
+    model: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Aggregate calls, tokens, cost and latency per (day, model)."""
+    groups: Dict[tuple, Dict[str, Any]] = defaultdict(
+        lambda: {"calls": 0, "input_tokens": 0, "output_tokens": 0, "total_tokens": 0,
+                 "total_cost": 0.0, "latencies": []}
+    )
+    for entry in entries:
+        day = str(entry.get("time", ""))[:10]
+        entry_model = entry.get("model", "")
+        if since and day < since:
+            continue
+        if model and entry_model != model:
+            continue
+        group = groups[(day, entry_model)]
+        group["calls"] += 1
+        for key in ("input_tokens", "output_tokens", "total_tokens"):
+            group[key] += int(entry.get(key, 0) or 0)
+        group["total_cost"] += float(entry.get("total_cost", 0.0) or 0.0)
+        if entry.get("latency_seconds") is not None:
+            group["latencies"].append(float(entry["latency_seconds"]))
+
+    rows = []
+    for (day, entry_model), group in sorted(groups.items()):
+        latencies = sorted(group.pop("latencies"))
+        group["avg_latency_seconds"] = round(sum(latencies) / len(latencies), 3) if latencies else None
+        group["p95_latency_seconds"] = (
+            round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3) if latencies else None
+        )
+        group["total_cost"] = round(group["total_cost"], 6)
+        rows.append({"day": day, "model": entry_model, **group})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the LLM call log.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="Tokens, cost and latency per model per day")
+    summary.add_argument("--path", default=str(DEFAULT_LOG_PATH))
+    summary.add_argument("--since", help="Only include days >= YYYY-MM-DD")
+    summary.add_argument("--model", help="Only include this model")
+    summary.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    rows = summarize(iter_entries(Path(args.path)), since=args.since, model=args.model)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    header = f"{'day':<10}  {'model':<28} {'calls':>6} {'in_tok':>10} {'out_tok':>9} {'cost_usd':>10} {'avg_s':>7} {'p95_s':>7}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        avg = "-" if row["avg_latency_seconds"] is None else f"{row['avg_latency_seconds']:.2f}"
+        p95 = "-" if row["p95_latency_seconds"] is None else f"{row['p95_latency_seconds']:.2f}"
+        print(
+            f"{row['day']:<10}  {row['model'][:28]:<28} {row['calls']:>6} {row['input_tokens']:>10} "
+            f"{row['output_tokens']:>9} {row['total_cost']:>10.4f} {avg:>7} {p95:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+llm_clients.py
+==============
+Process-wide registry of provider clients.
+
+Building an ``AIModel`` imports the langchain integration and constructs its
+client, which costs hundreds of milliseconds. Web endpoints and
+``BotManager`` used to pay that on every request. ``AIAdapter`` now asks the
+registry instead:
+
+  get_client(provider, model, api_key, api_url, build)  -> AIModel
+
+Clients are keyed by provider, model, a hash of the API key and the API URL,
+so a changed key gets a fresh client and the key itself is never stored in the
+key. ``invalidate_clients()`` drops them all; the web server calls it when
+secrets or the active profile change, and warms the registry at start-up
+(``ModelRouter.warm``).
+
+Offline ``stub`` and ``replay`` models are cheap and hold per-run state, so
+they are built fresh each time. Builds, hits and the construction time saved
+are counted; see ``client_registry_stats()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from src.logging import logger
+
+
+# Providers whose clients are not shared
+UNCACHED_PROVIDERS = frozenset({"stub", "replay"})
+
+_clients: Dict[Tuple[str, str, str, str], Any] = {}
+_build_seconds: Dict[Tuple[str, str, str, str], float] = {}
+_stats = {"builds": 0, "hits": 0, "build_seconds": 0.0, "saved_seconds": 0.0, "invalidations": 0}
+_stats_lock = threading.Lock()
+
+
+def key_hash(api_key: str) -> str:
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def get_client(provider: str, model: str, api_key: str, api_url: str, build: Callable[[], Any]) -> Any:
+    """The shared client for this provider, model and key; ``build()`` makes it on a miss."""
+    if provider in UNCACHED_PROVIDERS:
+        return build()
+    key = (provider, model, key_hash(api_key), api_url or "")
+    with _stats_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _stats["hits"] += 1
+            _stats["saved_seconds"] += _build_seconds[key]
+            return client
+
+    # Built outside the lock so a slow provider import does not hold up the others
+    started = time.perf_counter()
+    client = build()
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        existing = _clients.get(key)
+        if existing is not None:
+            return existing
+        _clients[key] = client
+        _build_seconds[key] = elapsed
+        _stats["builds"] += 1
+        _stats["build_seconds"] += elapsed
+    logger.debug(f"Built {provider}/{model} client in {elapsed * 1000:.0f} ms")
+    return client
+
+
+def invalidate_clients() -> int:
+    """Drop every shared client (secrets or profile changed); returns how many were dropped."""
+    with _stats_lock:
+        dropped = len(_clients)
+        _clients.clear()
+        _build_seconds.clear()
+        _stats["invalidations"] += 1
+    if dropped:
+        logger.info(f"Dropped {dropped} cached LLM client(s)")
+    return dropped
+
+
+def client_registry_stats() -> Dict[str, Any]:
+    """Live clients, builds, hits, time spent building and the construction time hits saved."""
+    with _stats_lock:
+        lookups = _stats["builds"] + _stats["hits"]
+        return {
+            "clients": sorted(f"{provider}/{model}" for provider, model, _key, _url in _clients),
+            **_stats,
+            "build_seconds": round(_stats["build_seconds"], 4),
+            "saved_seconds": round(_stats["saved_seconds"], 4),
+            "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+def reset_client_registry_stats() -> None:
+    with _stats_lock:
+        _stats.update(builds=0, hits=0, build_seconds=0.0, saved_seconds=0.0, invalidations=0)
@@ -0,0 +1,298 @@
+"""
+llm_failover.py
+===============
+Provider failover, hedged requests and per-provider health for ``AIAdapter``.
+
+Extra providers are listed, in order of preference, under ``llm_providers``
+in secrets.yaml::
+
+  llm_providers:
+    - provider: openai
+      model: gpt-4o-mini
+      api_key: sk-...
+    - provider: claude
+      model: claude-3-5-haiku-latest        # api_key defaults to claude_api_key
+    - provider: stub                        # offline, no network (see StubModel)
+
+``AIAdapter`` keeps its configured provider first and appends these as
+fallbacks. With fallbacks present, each backend gets ``LLM_FAILOVER_MAX_RETRIES``
+retries and ``LLM_FAILOVER_TIMEOUT_SECONDS`` before the next one is tried,
+instead of sitting in the full retry loop of a provider that is out of quota.
+
+With ``LLM_HEDGE_ENABLED``, a call still running after the backend's p95
+latency (once ``LLM_HEDGE_MIN_SAMPLES`` calls have been seen) sends the same
+prompt to the next backend; the first reply wins and the other is cancelled.
+
+``provider_health_stats()`` reports calls, failures, timeouts, failovers,
+hedges and latency per provider/model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+import yaml
+
+from src.logging import logger
+
+
+DEFAULT_FAILOVER_MAX_RETRIES = 1
+DEFAULT_FAILOVER_TIMEOUT_SECONDS = 60.0
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+_LATENCY_WINDOW = 200
+
+
+class LLMFailoverError(RuntimeError):
+    """Every configured provider failed for one call."""
+
+
+class EmptyStreamError(RuntimeError):
+    """A provider's stream ended without any reply text."""
+
+
+@dataclass(frozen=True)
+class ProviderEntry:
+    provider: str
+    model: str = ""
+    api_key: str = ""
+    api_url: str = ""
+    options: Dict[str, Any] = field(default_factory=dict, compare=False, hash=False)
+
+
+def parse_provider_entries(secrets: Dict[str, Any]) -> List[ProviderEntry]:
+    """Ordered ``llm_providers`` entries from a loaded secrets.yaml mapping."""
+    entries: List[ProviderEntry] = []
+    for raw in (secrets or {}).get("llm_providers") or []:
+        if not isinstance(raw, dict) or not raw.get("provider"):
+            logger.warning(f"Ignoring llm_providers entry without a provider: {raw!r}")
+            continue
+        provider = str(raw["provider"]).lower()
+        api_key = raw.get("api_key") or secrets.get(f"{provider}_api_key") or secrets.get("llm_api_key") or ""
+        options = {k: v for k, v in raw.items() if k not in ("provider", "model", "api_key", "api_url")}
+        entries.append(
+            ProviderEntry(
+                provider=provider,
+                model=str(raw.get("model") or ""),
+                api_key=str(api_key),
+                api_url=str(raw.get("api_url") or ""),
+                options=options,
+            )
+        )
+    return entries
+
+
+def load_provider_entries(config: Optional[Dict[str, Any]]) -> List[ProviderEntry]:
+    """
+    Fallback providers for an adapter built with ``config``: an ``llm_providers``
+    list in the config itself, else the one in ``config["secretsFile"]``.
+    """
+    config = config or {}
+    if config.get("llm_providers"):
+        return parse_provider_entries(config)
+    secrets_file = config.get("secretsFile")
+    if not secrets_file or not Path(secrets_file).exists():
+        return []
+    try:
+        with open(secrets_file, "r", encoding="utf-8") as fh:
+            secrets = yaml.safe_load(fh) or {}
+    except Exception as exc:
+        logger.warning(f"Could not read llm_providers from {secrets_file}: {exc}")
+        return []
+    return parse_provider_entries(secrets)
+
+
+# ---------------------------------------------------------------------------
+# Health
+# ---------------------------------------------------------------------------
+
+class ProviderHealth:
+    """Rolling success/latency record for one provider/model."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.failovers = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[float] = None
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record_success(self, latency_seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.successes += 1
+            self._latencies.append(latency_seconds)
+
+    def record_failure(self, error: BaseException, timed_out: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.timeouts += int(timed_out)
+            self.last_error = f"{type(error).__name__}: {error}"[:300]
+            self.last_failure_at = time.time()
+
+    def record_failover(self) -> None:
+        with self._lock:
+            self.failovers += 1
+
+    def record_hedge(self, won: bool) -> None:
+        with self._lock:
+            self.hedges += 1
+            self.hedge_wins += int(won)
+
+    def p95(self, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < max(1, min_samples):
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "failovers": self.failovers,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "success_rate": round(self.successes / self.calls, 4) if self.calls else None,
+                "avg_latency_seconds": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                "p95_latency_seconds": round(p95, 3) if p95 is not None else None,
+                "last_error": self.last_error,
+            }
+
+
+_health: Dict[str, ProviderHealth] = {}
+_health_lock = threading.Lock()
+
+
+def get_provider_health(provider: str, model: str) -> ProviderHealth:
+    name = f"{provider}/{model}"
+    with _health_lock:
+        health = _health.get(name)
+        if health is None:
+            health = _health[name] = ProviderHealth(name)
+        return health
+
+
+def provider_health_stats() -> Dict[str, Dict[str, Any]]:
+    with _health_lock:
+        return {name: health.stats() for name, health in _health.items()}
+
+
+def reset_provider_health() -> None:
+    with _health_lock:
+        _health.clear()
+
+
+# ---------------------------------------------------------------------------
+# Failover / hedging
+# ---------------------------------------------------------------------------
+
+async def call_with_failover(
+    backends: Sequence[Any],
+    attempt: Callable[[Any], Awaitable[Any]],
+    timeout: Optional[float] = None,
+    hedge: bool = False,
+    hedge_min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+) -> Any:
+    """
+    Await ``attempt(backend)`` for each of ``backends`` (objects with a
+    ``health`` attribute and a ``name``) in order until one succeeds, and
+    return ``(backend, result)``. Each attempt is bounded by ``timeout``.
+    Raises ``LLMFailoverError`` chained to the last error when all fail.
+    """
+    tried = set()
+    last_error: Optional[BaseException] = None
+    for index, backend in enumerate(backends):
+        if index in tried:
+            continue
+        tried.add(index)
+        backup_index = next((i for i in range(index + 1, len(backends)) if i not in tried), None)
+        delay = backend.health.p95(hedge_min_samples) if hedge and backup_index is not None else None
+        try:
+            if delay is None:
+                return backend, await timed_attempt(backend, attempt, timeout)
+            return await _hedged(
+                backend, backends[backup_index], attempt, timeout, delay,
+                on_hedge=lambda i=backup_index: tried.add(i),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            last_error = exc
+            backend.health.record_failover()
+            logger.warning(f"LLM provider {backend.name} failed ({exc}); trying the next provider")
+    raise LLMFailoverError(
+        f"All {len(backends)} LLM providers failed; last error: {last_error}"
+    ) from last_error
+
+
+async def timed_attempt(
+    backend: Any, attempt: Callable[[Any], Awaitable[Any]], timeout: Optional[float] = None
+) -> Any:
+    """``attempt(backend)`` bounded by ``timeout``, recorded in ``backend.health``."""
+    started = time.monotonic()
+    try:
+        result = await asyncio.wait_for(attempt(backend), timeout) if timeout else await attempt(backend)
+    except asyncio.TimeoutError as exc:
+        error = TimeoutError(f"{backend.name} did not answer within {timeout:.0f}s")
+        backend.health.record_failure(error, timed_out=True)
+        raise error from exc
+    except Exception as exc:
+        backend.health.record_failure(exc)
+        raise
+    backend.health.record_success(time.monotonic() - started)
+    return result
+
+
+async def _hedged(
+    primary: Any,
+    backup: Any,
+    attempt: Callable[[Any], Awaitable[Any]],
+    timeout: Optional[float],
+    delay: float,
+    on_hedge: Callable[[], None],
+) -> Any:
+    """Run ``primary``; if it is still running after ``delay`` also run ``backup``. First success wins."""
+    primary_task = asyncio.ensure_future(timed_attempt(primary, attempt, timeout))
+    tasks = {primary_task: primary}
+    done, _ = await asyncio.wait({primary_task}, timeout=delay)
+    if not done:
+        logger.debug(f"{primary.name} slower than its p95 ({delay:.2f}s); hedging to {backup.name}")
+        tasks[asyncio.ensure_future(timed_attempt(backup, attempt, timeout))] = backup
+        on_hedge()
+    pending = set(tasks)
+    errors: List[BaseException] = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if len(tasks) > 1:
+                        primary.health.record_hedge(won=tasks[task] is backup)
+                    return tasks[task], task.result()
+                errors.append(task.exception())
+    finally:
+        for task in pending:
+            task.cancel()
+    if len(tasks) > 1:
+        primary.health.record_hedge(won=False)
+        # Both failed: count the backup's failover here, the caller counts the primary's
+        backup.health.record_failover()
+    raise errors[-1]
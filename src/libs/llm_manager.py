@@ -1,25 +1,22 @@
-import json
-import os
+import asyncio
+import copy
 import re
 import textwrap
+import threading
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Union
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Union
 
-try:
-    import httpx
-except ImportError:
-    httpx = None
 from dotenv import load_dotenv
 from langchain_core.messages import BaseMessage
-from langchain_core.messages.ai import AIMessage
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompt_values import StringPromptValue
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages.ai import AIMessage, AIMessageChunk
 from Levenshtein import distance
 
+if TYPE_CHECKING:
+    # Prompt templates and output parsers are imported where they are first used
+    from langchain_core.prompts import ChatPromptTemplate
+
 # Prompts module – full implementation of all templates used by GPTAnswerer
 class PromptsShim:
     def __init__(self):
@@ -36,17 +33,16 @@ Summary:"""
         # ── Job suitability / ATS scoring ────────────────────────────────────
         self.is_relavant_position_template = """
 You are an expert career coach and ATS evaluator.
+Rate how well the candidate's background matches the job description below on a scale from 1 to 10.
+Respond in exactly this format (two lines only):
+Score: <number>
+Reasoning: <one sentence explanation>
 
 Candidate resume:
 {resume}
-
+{cache_breakpoint}
 Job description:
-{job_description}
-
-Rate how well the candidate's background matches this role on a scale from 1 to 10.
-Respond in exactly this format (two lines only):
-Score: <number>
-Reasoning: <one sentence explanation>"""
+{job_description}"""
 
         # ── Section classifier ───────────────────────────────────────────────
         self.determine_section_template = """
@@ -201,7 +197,7 @@ tailored to the specific company and role.
 
 Candidate resume:
 {resume}
-
+{cache_breakpoint}
 Target company: {company}
 
 Job description:
@@ -223,7 +219,7 @@ Work history:
 
 Projects:
 {resume_projects}
-
+{cache_breakpoint}
 Question: {question}
 
 Numeric answer:"""
@@ -260,6 +256,48 @@ Answer:"""
 
 prompts = PromptsShim()
 
+
+class PromptRegistry:
+    """
+    Compiles each ``PromptsShim`` template into a ``ChatPromptTemplate`` once.
+
+    Compiled templates are immutable, so one registry is shared by every
+    ``GPTAnswerer`` across questions, jobs and threads. Templates compile on
+    first use; ``warm()`` compiles all of them up front. A ``{cache_breakpoint}``
+    line is filled with the prompt-cache marker (see prompt_cache.py).
+    """
+
+    def __init__(self, shim: PromptsShim):
+        self._shim = shim
+        self._compiled: Dict[str, "ChatPromptTemplate"] = {}
+        self._lock = threading.Lock()
+
+    def template_names(self) -> List[str]:
+        return [name for name in vars(self._shim) if name.endswith("_template")]
+
+    def get(self, name: str) -> "ChatPromptTemplate":
+        compiled = self._compiled.get(name)
+        if compiled is not None:
+            return compiled
+        with self._lock:
+            compiled = self._compiled.get(name)
+            if compiled is None:
+                from langchain_core.prompts import ChatPromptTemplate
+
+                template = textwrap.dedent(getattr(self._shim, name))
+                compiled = ChatPromptTemplate.from_template(template)
+                if "cache_breakpoint" in compiled.input_variables:
+                    compiled = compiled.partial(cache_breakpoint=CACHE_BREAKPOINT)
+                self._compiled[name] = compiled
+            return compiled
+
+    def warm(self) -> None:
+        for name in self.template_names():
+            self.get(name)
+
+
+prompt_registry = PromptRegistry(prompts)
+
 from config import JOB_SUITABILITY_SCORE
 from src.utils.constants import (
     AVAILABILITY,
@@ -278,6 +316,7 @@ from src.utils.constants import (
     INTERESTS,
     JOB_APPLICATION_PROFILE,
     JOB_DESCRIPTION,
+    LATENCY_SECONDS,
     LANGUAGES,
     LEGAL_AUTHORIZATION,
     LLM_MODEL_TYPE,
@@ -295,6 +334,7 @@ from src.utils.constants import (
     PROMPTS,
     QUESTION,
     REPLIES,
+    REPLAY,
     RESPONSE_METADATA,
     RESUME,
     RESUME_EDUCATIONS,
@@ -303,34 +343,119 @@ from src.utils.constants import (
     RESUME_SECTION,
     SALARY_EXPECTATIONS,
     SELF_IDENTIFICATION,
+    STUB,
     SYSTEM_FINGERPRINT,
-    TEXT,
     TIME,
     TOKEN_USAGE,
     TOTAL_COST,
     TOTAL_TOKENS,
+    CACHED_INPUT_TOKENS,
     USAGE_METADATA,
     WORK_PREFERENCES,
 )
 from src.job import Job
+from src.libs.answer_memory import get_answer_memory, profile_fingerprint
+from src.libs.experience_index import ExperienceIndex
+from src.libs.job_summarizer import JobSummarizer
+from src.libs.llm_async import (
+    get_provider_semaphore,
+    get_shared_http_clients,
+    run_on_llm_loop,
+    run_sync,
+    stream_on_llm_loop,
+)
+from src.libs.llm_call_log import estimate_cost, get_call_log_writer
+from src.libs.llm_clients import get_client
+from src.libs.llm_failover import (
+    DEFAULT_FAILOVER_MAX_RETRIES,
+    DEFAULT_FAILOVER_TIMEOUT_SECONDS,
+    DEFAULT_HEDGE_MIN_SAMPLES,
+    EmptyStreamError,
+    LLMFailoverError,
+    call_with_failover,
+    get_provider_health,
+    load_provider_entries,
+    timed_attempt,
+)
+from src.libs.llm_cache import get_llm_cache, is_cache_hit, render_prompt
+from src.libs.llm_replay import (
+    RECORD_MODE,
+    REPLAY_MODE,
+    ReplayMissError,
+    ReplayStore,
+    get_replay_store,
+    prompt_key,
+    synthetic_latency,
+    synthetic_usage,
+)
+from src.libs.llm_rate_limiter import acall_with_retry, call_with_retry, estimate_tokens, get_rate_limiter
+from src.libs.model_router import (
+    ATS_SCORING,
+    COVER_LETTER_GENERATION,
+    DEFAULT_TIER,
+    JOB_SUMMARY,
+    NUMERIC_ANSWER,
+    OPTIONS_MATCHING,
+    RESUME_OR_COVER,
+    SECTION_CLASSIFICATION,
+    TEXTUAL_ANSWER,
+    ModelRouter,
+    record_tier_usage,
+)
+from src.libs.prompt_cache import CACHE_BREAKPOINT, cached_input_tokens, prepare_prompt, record_prompt_cache
+from src.libs.resume_context import ResumeContext, context_enabled
+from src.libs.section_router import get_section_router
 from src.logging import logger
 import config as cfg
 
 load_dotenv()
 
+DEFAULT_TEMPERATURE = 0.4
+
 
 class AIModel(ABC):
     @abstractmethod
     def invoke(self, prompt: str) -> str:
         pass
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        # Providers without a native async client run the blocking call in a worker thread
+        return await asyncio.to_thread(self.invoke, prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[BaseMessage]:
+        """Yield reply chunks as they arrive; providers without streaming yield the whole reply."""
+        model = getattr(self, "model", None)
+        if model is None or not hasattr(model, "astream"):
+            yield await self.ainvoke(prompt)
+            return
+        async for chunk in model.astream(prompt):
+            yield AIMessageChunk(content=chunk) if isinstance(chunk, str) else chunk
+
+    def with_json_mode(self) -> "AIModel":
+        """Variant asking the provider for a JSON reply; providers without a JSON mode return self."""
+        return self
+
+    def _json_variant(self, **update) -> "AIModel":
+        variant = copy.copy(self)
+        try:
+            variant.model = self.model.model_copy(update=update)
+        except Exception as exc:
+            logger.debug(f"JSON mode unavailable for {type(self).__name__}: {exc}")
+            return self
+        return variant
+
 
 class OpenAIModel(AIModel):
     def __init__(self, api_key: str, llm_model: str):
         from langchain_openai import ChatOpenAI
 
+        http_client, http_async_client = get_shared_http_clients()
         self.model = ChatOpenAI(
-            model_name=llm_model, openai_api_key=api_key, temperature=0.4
+            model_name=llm_model,
+            openai_api_key=api_key,
+            temperature=DEFAULT_TEMPERATURE,
+            http_client=http_client,
+            http_async_client=http_async_client,
         )
 
     def invoke(self, prompt: str) -> BaseMessage:
@@ -338,18 +463,29 @@ class OpenAIModel(AIModel):
         response = self.model.invoke(prompt)
         return response
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.model.ainvoke(prompt)
+
+    def with_json_mode(self) -> AIModel:
+        variant = copy.copy(self)
+        variant.model = self.model.bind(response_format={"type": "json_object"})
+        return variant
+
 
 class ClaudeModel(AIModel):
     def __init__(self, api_key: str, llm_model: str):
         from langchain_anthropic import ChatAnthropic
 
-        self.model = ChatAnthropic(model=llm_model, api_key=api_key, temperature=0.4)
+        self.model = ChatAnthropic(model=llm_model, api_key=api_key, temperature=DEFAULT_TEMPERATURE)
 
     def invoke(self, prompt: str) -> BaseMessage:
         response = self.model.invoke(prompt)
         logger.debug("Invoking Claude API")
         return response
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.model.ainvoke(prompt)
+
 
 class OllamaModel(AIModel):
     def __init__(self, llm_model: str, llm_api_url: str):
@@ -365,10 +501,16 @@ class OllamaModel(AIModel):
         response = self.model.invoke(prompt)
         return response
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.model.ainvoke(prompt)
+
+    def with_json_mode(self) -> AIModel:
+        return self._json_variant(format="json")
+
 class PerplexityModel(AIModel):
     def __init__(self, api_key: str, llm_model: str):
         from langchain_community.chat_models import ChatPerplexity
-        self.model = ChatPerplexity(model=llm_model, api_key=api_key, temperature=0.4)
+        self.model = ChatPerplexity(model=llm_model, api_key=api_key, temperature=DEFAULT_TEMPERATURE)
 
     def invoke(self, prompt: str) -> BaseMessage:
         response = self.model.invoke(prompt)
@@ -385,7 +527,7 @@ class GeminiModel(AIModel):
         self.model = ChatGoogleGenerativeAI(
             model=llm_model,
             google_api_key=api_key,
-            temperature=0.4,
+            temperature=DEFAULT_TEMPERATURE,
             convert_system_message_to_human=True,
             safety_settings={
                 HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
@@ -400,13 +542,19 @@ class GeminiModel(AIModel):
         response = self.model.invoke(prompt)
         return response
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.model.ainvoke(prompt)
+
+    def with_json_mode(self) -> AIModel:
+        return self._json_variant(response_mime_type="application/json")
+
 
 class HuggingFaceModel(AIModel):
     def __init__(self, api_key: str, llm_model: str):
         from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 
         self.model = HuggingFaceEndpoint(
-            repo_id=llm_model, huggingfacehub_api_token=api_key, temperature=0.4
+            repo_id=llm_model, huggingfacehub_api_token=api_key, temperature=DEFAULT_TEMPERATURE
         )
         self.chatmodel = ChatHuggingFace(llm=self.model)
 
@@ -417,17 +565,215 @@ class HuggingFaceModel(AIModel):
         )
         return response
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.chatmodel.ainvoke(prompt)
+
+
+STUB_STREAM_WORDS = 3
+
+
+class StubModel(AIModel):
+    """
+    Offline provider (``LLM_MODEL_TYPE = 'stub'`` or ``provider: stub`` in
+    ``llm_providers``) that answers without network access. ``reply`` fixes the
+    answer, ``delay_seconds`` simulates latency and ``error`` makes every call fail.
+    """
+
+    def __init__(
+        self,
+        llm_model: str = STUB,
+        reply: Optional[str] = None,
+        delay_seconds: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        self.llm_model = llm_model or STUB
+        self.reply = reply
+        self.delay_seconds = float(delay_seconds or 0.0)
+        self.error = error
+
+    def _respond(self, prompt) -> AIMessage:
+        if self.error:
+            raise ConnectionError(self.error)
+        text = render_prompt(prompt)
+        content = self.reply if self.reply is not None else f"[{self.llm_model}] {text.strip()[-200:]}"
+        input_tokens, output_tokens = estimate_tokens(text), estimate_tokens(content)
+        return AIMessage(
+            content=content,
+            response_metadata={MODEL_NAME: self.llm_model},
+            usage_metadata={
+                INPUT_TOKENS: input_tokens,
+                OUTPUT_TOKENS: output_tokens,
+                TOTAL_TOKENS: input_tokens + output_tokens,
+            },
+        )
+
+    def invoke(self, prompt: str) -> BaseMessage:
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        return self._respond(prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[BaseMessage]:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        reply = self._respond(prompt)
+        words = re.split(r"(?<=\s)", reply.content)
+        for i in range(0, len(words), STUB_STREAM_WORDS):
+            yield AIMessageChunk(content="".join(words[i:i + STUB_STREAM_WORDS]))
+            await asyncio.sleep(0)
+        yield AIMessageChunk(
+            content="", response_metadata=reply.response_metadata, usage_metadata=reply.usage_metadata
+        )
+
+
+class ReplayModel(AIModel):
+    """
+    ``replay`` provider: records prompt -> reply pairs from an upstream model
+    (``LLM_REPLAY_MODE = 'record'``) or serves them from disk without network
+    access (``'replay'``). See src/libs/llm_replay.py.
+    """
+
+    def __init__(
+        self,
+        llm_model: str,
+        store: ReplayStore,
+        mode: str = REPLAY_MODE,
+        upstream: Optional[AIModel] = None,
+        on_miss: str = "error",
+    ):
+        if mode == RECORD_MODE and upstream is None:
+            raise ValueError("Record mode needs an upstream model (LLM_REPLAY_UPSTREAM)")
+        self.llm_model = llm_model
+        self.store = store
+        self.mode = mode
+        self.upstream = upstream
+        self.on_miss = on_miss
+
+    @classmethod
+    def from_config(cls, llm_model: str, api_key: str, llm_api_url: str = "") -> "ReplayModel":
+        mode = getattr(cfg, "LLM_REPLAY_MODE", REPLAY_MODE)
+        upstream = None
+        if mode == RECORD_MODE:
+            upstream_provider, upstream_model = getattr(cfg, "LLM_REPLAY_UPSTREAM", (GEMINI, llm_model))
+            upstream = AIAdapter._build_model(upstream_provider, upstream_model, api_key, llm_api_url)
+        return cls(
+            llm_model,
+            get_replay_store(),
+            mode=mode,
+            upstream=upstream,
+            on_miss=getattr(cfg, "LLM_REPLAY_ON_MISS", "error"),
+        )
+
+    def _replay(self, prompt):
+        found = self.store.lookup(prompt)
+        if found is None:
+            if self.on_miss == STUB:
+                return StubModel(self.llm_model)._respond(prompt), 0.0
+            raise ReplayMissError(f"No recorded reply for prompt {prompt_key(prompt)[:12]} in {self.store.path}")
+        response, recorded_latency = found
+        response = synthetic_usage(response)
+        return response, synthetic_latency(recorded_latency, response)
+
+    def invoke(self, prompt: str) -> BaseMessage:
+        if self.mode == RECORD_MODE:
+            started = time.monotonic()
+            response = self.upstream.invoke(prompt)
+            self.store.record(prompt, response, time.monotonic() - started, self.llm_model)
+            return response
+        response, delay = self._replay(prompt)
+        if delay:
+            time.sleep(delay)
+        return response
+
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        if self.mode == RECORD_MODE:
+            started = time.monotonic()
+            response = await self.upstream.ainvoke(prompt)
+            self.store.record(prompt, response, time.monotonic() - started, self.llm_model)
+            return response
+        response, delay = self._replay(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+
+class _Backend:
+    """One provider/model/key an ``AIAdapter`` can send a prompt to."""
+
+    def __init__(self, provider: str, model_name: str, model: AIModel):
+        self.provider = provider
+        self.model_name = model_name
+        self.model = model
+        self.name = f"{provider}/{model_name}"
+        self.rate_limiter = get_rate_limiter(provider)
+        self.health = get_provider_health(provider, model_name)
+        self._json_model: Optional[AIModel] = None
+        # Anthropic caches only up to an explicit cache_control block
+        self.cache_control = provider == CLAUDE
+
+    def prepare(self, prompt):
+        return prepare_prompt(prompt, cache_control=self.cache_control)
+
+    def model_for(self, json_mode: bool = False) -> AIModel:
+        if not json_mode:
+            return self.model
+        if self._json_model is None:
+            with_json_mode = getattr(self.model, "with_json_mode", None)
+            self._json_model = with_json_mode() if with_json_mode else self.model
+        return self._json_model
+
 
 class AIAdapter:
-    def __init__(self, config: dict, api_key: str):
+    # StructuredOutput passes json_mode=True to invoke/ainvoke
+    supports_json_mode = True
+
+    def __init__(
+        self,
+        config: dict,
+        api_key: str,
+        provider: Optional[str] = None,
+        model_name: Optional[str] = None,
+        tier: str = DEFAULT_TIER,
+    ):
+        self.provider = provider or cfg.LLM_MODEL_TYPE
+        self.model_name = model_name or cfg.LLM_MODEL
+        self.tier = tier
+        self.temperature = None if self.provider == OLLAMA else DEFAULT_TEMPERATURE
         self.model = self._create_model(config, api_key)
+        self.cache = get_llm_cache()
+        self.rate_limiter = get_rate_limiter(self.provider)
+        self.backends = [_Backend(self.provider, self.model_name, self.model)]
+        self.backends += self._create_fallbacks(config, api_key)
 
     def _create_model(self, config: dict, api_key: str) -> AIModel:
-        llm_model_type = cfg.LLM_MODEL_TYPE
-        llm_model = cfg.LLM_MODEL
+        return self._build_model(self.provider, self.model_name, api_key, cfg.LLM_API_URL)
 
-        llm_api_url = cfg.LLM_API_URL
+    @staticmethod
+    def _build_model(
+        llm_model_type: str,
+        llm_model: str,
+        api_key: str,
+        llm_api_url: str = "",
+        options: Optional[Dict[str, object]] = None,
+    ) -> AIModel:
+        """The process-wide client for this provider, model and key (see llm_clients.py)."""
+        return get_client(
+            llm_model_type, llm_model, api_key, llm_api_url,
+            lambda: AIAdapter._construct_model(llm_model_type, llm_model, api_key, llm_api_url, options),
+        )
 
+    @staticmethod
+    def _construct_model(
+        llm_model_type: str,
+        llm_model: str,
+        api_key: str,
+        llm_api_url: str = "",
+        options: Optional[Dict[str, object]] = None,
+    ) -> AIModel:
         logger.debug(f"Using {llm_model_type} with {llm_model}")
 
         if llm_model_type == OPENAI:
@@ -442,188 +788,290 @@ class AIAdapter:
             return HuggingFaceModel(api_key, llm_model)
         elif llm_model_type == PERPLEXITY:
             return PerplexityModel(api_key, llm_model)
+        elif llm_model_type == STUB:
+            return StubModel(llm_model, **(options or {}))
+        elif llm_model_type == REPLAY:
+            return ReplayModel.from_config(llm_model, api_key, llm_api_url)
         else:
             raise ValueError(f"Unsupported model type: {llm_model_type}")
 
-    def invoke(self, prompt: str) -> str:
-        return self.model.invoke(prompt)
+    def _create_fallbacks(self, config: dict, api_key: str) -> List[_Backend]:
+        """Backends for the ``llm_providers`` entries in secrets.yaml, in order."""
+        tier_models = (getattr(cfg, "LLM_MODEL_TIERS", {}) or {}).get(self.tier) or {}
+        seen = {(self.provider, self.model_name, api_key)}
+        fallbacks: List[_Backend] = []
+        for entry in load_provider_entries(config):
+            model_name = tier_models.get(entry.provider) or entry.model or (STUB if entry.provider == STUB else "")
+            if not model_name:
+                logger.warning(f"llm_providers entry for '{entry.provider}' has no model; skipping it")
+                continue
+            if (entry.provider, model_name, entry.api_key) in seen:
+                continue
+            seen.add((entry.provider, model_name, entry.api_key))
+            try:
+                model = self._build_model(entry.provider, model_name, entry.api_key, entry.api_url, entry.options)
+            except Exception as exc:
+                logger.warning(f"Fallback provider {entry.provider}/{model_name} unavailable: {exc}")
+                continue
+            fallbacks.append(_Backend(entry.provider, model_name, model))
+        if fallbacks:
+            order = ", ".join(backend.name for backend in [self.backends[0], *fallbacks])
+            logger.debug(f"LLM failover order: {order}")
+        return fallbacks
+
+    def invoke(self, prompt: str, json_mode: bool = False) -> str:
+        """``json_mode`` asks providers that support it for a JSON reply."""
+        if len(self.backends) > 1:
+            # Failover and hedging are driven from the LLM loop
+            return run_sync(self._ainvoke(prompt, json_mode))
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            record_tier_usage(self.tier, self.model_name, cache_hit=True)
+            return cached
+        backend = self.backends[0]
+        model = backend.model_for(json_mode)
+        try:
+            response, report = call_with_retry(
+                lambda: model.invoke(backend.prepare(prompt)),
+                self.rate_limiter,
+                estimated_tokens=estimate_tokens(render_prompt(prompt)),
+            )
+        except Exception as exc:
+            backend.health.record_failure(exc)
+            raise
+        backend.health.record_success(report.elapsed_seconds)
+        record_tier_usage(self.tier, self.model_name, report.elapsed_seconds, response)
+        self._cache_store(key, response)
+        self._attach_report(response, report)
+        return response
 
+    async def ainvoke(self, prompt: str, json_mode: bool = False) -> BaseMessage:
+        """Async invoke; runs on the shared LLM loop under the provider's concurrency cap."""
+        return await run_on_llm_loop(self._ainvoke(prompt, json_mode))
 
-class LLMLogger:
-    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
-        self.llm = llm
-        logger.debug(f"LLMLogger successfully initialized with LLM: {llm}")
+    async def _ainvoke(self, prompt: str, json_mode: bool = False) -> BaseMessage:
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            record_tier_usage(self.tier, self.model_name, cache_hit=True)
+            return cached
 
-    @staticmethod
-    def log_request(prompts, parsed_reply: Dict[str, Dict]):
-        logger.debug("Starting log_request method")
-        logger.debug(f"Prompts received: {prompts}")
-        logger.debug(f"Parsed reply received: {parsed_reply}")
+        estimated = estimate_tokens(render_prompt(prompt))
+        failover = len(self.backends) > 1
+        # With somewhere to fail over to, don't sit in one provider's full retry loop
+        max_retries = getattr(cfg, "LLM_FAILOVER_MAX_RETRIES", DEFAULT_FAILOVER_MAX_RETRIES) if failover else None
 
-        try:
-            calls_log = os.path.join(Path("data_folder/output"), "open_ai_calls.json")
-            logger.debug(f"Logging path determined: {calls_log}")
-        except Exception as e:
-            logger.error(f"Error determining the log path: {str(e)}")
-            raise
+        async def _attempt(backend: _Backend):
+            async def _call():
+                async with get_provider_semaphore(backend.provider):
+                    return await backend.model_for(json_mode).ainvoke(backend.prepare(prompt))
 
-        if isinstance(prompts, StringPromptValue):
-            logger.debug("Prompts are of type StringPromptValue")
-            prompts = prompts.text
-            logger.debug(f"Prompts converted to text: {prompts}")
-        elif isinstance(prompts, Dict):
-            logger.debug("Prompts are of type Dict")
-            try:
-                prompts = {
-                    f"prompt_{i + 1}": prompt.content
-                    for i, prompt in enumerate(prompts.messages)
-                }
-                logger.debug(f"Prompts converted to dictionary: {prompts}")
-            except Exception as e:
-                logger.error(f"Error converting prompts to dictionary: {str(e)}")
-                raise
+            return await acall_with_retry(
+                _call, backend.rate_limiter, estimated_tokens=estimated, max_retries=max_retries
+            )
+
+        if failover:
+            backend, (response, report) = await call_with_failover(
+                self.backends,
+                _attempt,
+                timeout=getattr(cfg, "LLM_FAILOVER_TIMEOUT_SECONDS", DEFAULT_FAILOVER_TIMEOUT_SECONDS),
+                hedge=getattr(cfg, "LLM_HEDGE_ENABLED", False),
+                hedge_min_samples=getattr(cfg, "LLM_HEDGE_MIN_SAMPLES", DEFAULT_HEDGE_MIN_SAMPLES),
+            )
         else:
-            logger.debug("Prompts are of unknown type, attempting default conversion")
+            backend = self.backends[0]
+            response, report = await timed_attempt(backend, _attempt)
+        record_tier_usage(self.tier, backend.model_name, report.elapsed_seconds, response)
+        self._cache_store(key, response)
+        self._attach_report(response, report)
+        return response
+
+    async def astream(self, prompt: str, json_mode: bool = False) -> AsyncIterator[str]:
+        """
+        Yield the reply text as the provider streams it, from any event loop.
+        Failover happens only before the first chunk; a cached reply comes as one chunk.
+        """
+        async for text in stream_on_llm_loop(self._astream(prompt, json_mode)):
+            yield text
+
+    async def _astream(self, prompt: str, json_mode: bool = False) -> AsyncIterator[str]:
+        key, cached = self._cache_lookup(prompt)
+        if cached is not None:
+            record_tier_usage(self.tier, self.model_name, cache_hit=True)
+            yield cached.content
+            return
+
+        estimated = estimate_tokens(render_prompt(prompt))
+        failover = len(self.backends) > 1
+        max_retries = getattr(cfg, "LLM_FAILOVER_MAX_RETRIES", DEFAULT_FAILOVER_MAX_RETRIES) if failover else None
+        errors: List[str] = []
+        for index, backend in enumerate(self.backends):
+            streaming = False
+            started = time.monotonic()
             try:
-                prompts = {
-                    f"prompt_{i + 1}": prompt.content
-                    for i, prompt in enumerate(prompts.messages)
-                }
-                logger.debug(
-                    f"Prompts converted to dictionary using default method: {prompts}"
-                )
-            except Exception as e:
-                logger.error(f"Error converting prompts using default method: {str(e)}")
-                raise
+                async with get_provider_semaphore(backend.provider):
+                    streams = []
+
+                    async def _first_chunk(backend=backend):
+                        # Each attempt sends the request again on a new stream
+                        stream = backend.model_for(json_mode).astream(backend.prepare(prompt))
+                        streams.append(stream)
+                        try:
+                            return await stream.__anext__()
+                        except StopAsyncIteration:
+                            raise EmptyStreamError(f"{backend.name} returned an empty stream") from None
+
+                    # Retries, buckets and the breaker cover the request up to its first chunk
+                    reply, _report = await acall_with_retry(
+                        _first_chunk, backend.rate_limiter, estimated_tokens=estimated, max_retries=max_retries
+                    )
+                    streaming = True
+                    yield reply.content
+                    async for chunk in streams[-1]:
+                        reply = reply + chunk if isinstance(reply, AIMessageChunk) else chunk
+                        if chunk.content:
+                            yield chunk.content
+                    if not reply.content:
+                        raise EmptyStreamError(f"{backend.name} streamed no reply text")
+            except Exception as exc:
+                backend.health.record_failure(exc)
+                if streaming or index == len(self.backends) - 1:
+                    if errors:
+                        raise LLMFailoverError("; ".join(errors + [f"{backend.name}: {exc}"])) from exc
+                    raise
+                backend.health.record_failover()
+                errors.append(f"{backend.name}: {exc}")
+                logger.warning(f"{backend.name} failed before streaming ({exc}); failing over")
+                continue
+            elapsed = time.monotonic() - started
+            backend.health.record_success(elapsed)
+            record_tier_usage(self.tier, backend.model_name, elapsed, reply)
+            self._cache_store(key, reply)
+            return
+
+    async def abatch(self, prompts: List[str], return_exceptions: bool = False) -> List[BaseMessage]:
+        """Invoke several prompts concurrently; results keep the input order."""
+        return await asyncio.gather(
+            *(self.ainvoke(prompt) for prompt in prompts),
+            return_exceptions=return_exceptions,
+        )
 
+    def batch(self, prompts: List[str], return_exceptions: bool = False) -> List[BaseMessage]:
+        """Blocking wrapper around ``abatch`` for synchronous callers."""
+        return run_sync(self.abatch(prompts, return_exceptions=return_exceptions))
+
+    def _cache_lookup(self, prompt):
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(prompt, self.provider, self.model_name, self.temperature)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit for {self.provider}/{self.model_name}")
+        return key, cached
+
+    def discard_cached(self, prompt) -> None:
+        """Drop the cached reply to ``prompt``; StructuredOutput calls this for replies it rejects."""
+        if self.cache is None:
+            return
         try:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            logger.debug(f"Current time obtained: {current_time}")
-        except Exception as e:
-            logger.error(f"Error obtaining current time: {str(e)}")
-            raise
+            self.cache.delete(self.cache.make_key(prompt, self.provider, self.model_name, self.temperature))
+        except Exception as exc:
+            logger.warning(f"Failed to drop LLM response from cache: {exc}")
 
+    def _cache_store(self, key, response) -> None:
+        if self.cache is None or key is None:
+            return
         try:
-            token_usage = parsed_reply[USAGE_METADATA]
-            output_tokens = token_usage[OUTPUT_TOKENS]
-            input_tokens = token_usage[INPUT_TOKENS]
-            total_tokens = token_usage[TOTAL_TOKENS]
-            logger.debug(
-                f"Token usage - Input: {input_tokens}, Output: {output_tokens}, Total: {total_tokens}"
-            )
-        except KeyError as e:
-            logger.error(f"KeyError in parsed_reply structure: {str(e)}")
-            raise
+            self.cache.put(key, response, provider=self.provider, model=self.model_name)
+        except Exception as exc:
+            logger.warning(f"Failed to store LLM response in cache: {exc}")
 
-        try:
-            model_name = parsed_reply[RESPONSE_METADATA][MODEL_NAME]
-            logger.debug(f"Model name: {model_name}")
-        except KeyError as e:
-            logger.error(f"KeyError in response_metadata: {str(e)}")
-            raise
+    @staticmethod
+    def _attach_report(response, report) -> None:
+        metadata = getattr(response, "response_metadata", None)
+        if isinstance(metadata, dict):
+            metadata["queue_wait_seconds"] = round(report.queue_wait_seconds, 3)
+            metadata["retry_wait_seconds"] = round(report.retry_wait_seconds, 3)
+            metadata["attempts"] = report.attempts
+
+    def cache_stats(self) -> Dict[str, object]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def rate_limit_stats(self) -> Dict[str, object]:
+        return self.rate_limiter.stats()
+
+    def provider_health(self) -> Dict[str, Dict[str, object]]:
+        """Health and latency of this adapter's providers, in failover order."""
+        return {
+            backend.name: {**backend.health.stats(), "circuit_state": backend.rate_limiter.breaker.state}
+            for backend in self.backends
+        }
 
-        try:
-            prompt_price_per_token = 0.00000015
-            completion_price_per_token = 0.0000006
-            total_cost = (input_tokens * prompt_price_per_token) + (
-                output_tokens * completion_price_per_token
-            )
-            logger.debug(f"Total cost calculated: {total_cost}")
-        except Exception as e:
-            logger.error(f"Error calculating total cost: {str(e)}")
-            raise
 
-        try:
-            log_entry = {
-                MODEL: model_name,
-                TIME: current_time,
-                PROMPTS: prompts,
-                REPLIES: parsed_reply[CONTENT],
-                TOTAL_TOKENS: total_tokens,
-                INPUT_TOKENS: input_tokens,
-                OUTPUT_TOKENS: output_tokens,
-                TOTAL_COST: total_cost,
+class LLMLogger:
+    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
+        self.llm = llm
+        logger.debug(f"LLMLogger successfully initialized with LLM: {llm}")
+
+    @staticmethod
+    def log_request(
+        prompts, parsed_reply: Dict[str, Dict], latency_seconds: Optional[float] = None, cache_hit: bool = False
+    ):
+        """Build the call-log entry and hand it to the background JSONL writer; cache hits cost nothing."""
+        from langchain_core.prompt_values import StringPromptValue
+
+        if isinstance(prompts, StringPromptValue):
+            prompts = prompts.text
+        elif hasattr(prompts, "messages"):
+            prompts = {
+                f"prompt_{i + 1}": prompt.content
+                for i, prompt in enumerate(prompts.messages)
             }
-            logger.debug(f"Log entry created: {log_entry}")
-        except KeyError as e:
-            logger.error(
-                f"Error creating log entry: missing key {str(e)} in parsed_reply"
-            )
-            raise
 
-        try:
-            with open(calls_log, "a", encoding="utf-8") as f:
-                json_string = json.dumps(log_entry, ensure_ascii=False, indent=4)
-                f.write(json_string + "\n")
-                logger.debug(f"Log entry written to file: {calls_log}")
-        except Exception as e:
-            logger.error(f"Error writing log entry to file: {str(e)}")
-            raise
+        token_usage = {} if cache_hit else parsed_reply[USAGE_METADATA]
+        input_tokens = token_usage.get(INPUT_TOKENS, 0)
+        output_tokens = token_usage.get(OUTPUT_TOKENS, 0)
+        model_name = parsed_reply[RESPONSE_METADATA][MODEL_NAME]
+
+        entry = {
+            MODEL: model_name,
+            TIME: datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            PROMPTS: prompts,
+            REPLIES: parsed_reply[CONTENT],
+            TOTAL_TOKENS: token_usage.get(TOTAL_TOKENS, 0),
+            INPUT_TOKENS: input_tokens,
+            OUTPUT_TOKENS: output_tokens,
+            CACHED_INPUT_TOKENS: token_usage.get(CACHED_INPUT_TOKENS, 0),
+            TOTAL_COST: estimate_cost(model_name, input_tokens, output_tokens) if not cache_hit else 0.0,
+            LATENCY_SECONDS: None if latency_seconds is None else round(latency_seconds, 3),
+        }
+        if cache_hit:
+            entry["cache_hit"] = True
+        get_call_log_writer().write(entry)
 
 
 class LoggerChatModel:
-    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
+    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel], task: Optional[str] = None):
         self.llm = llm
+        self.task = task
         logger.debug(f"LoggerChatModel successfully initialized with LLM: {llm}")
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
-        logger.debug(f"Entering __call__ method with messages: {messages}")
-        while True:
-            try:
-                logger.debug("Attempting to call the LLM with messages")
-
-                reply = self.llm.invoke(messages)
-                logger.debug(f"LLM response received: {reply}")
-
-                parsed_reply = self.parse_llmresult(reply)
-                logger.debug(f"Parsed LLM reply: {parsed_reply}")
-
-                LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
-                logger.debug("Request successfully logged")
-
-                return reply
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTPStatusError encountered: {str(e)}")
-                if e.response.status_code == 429:
-                    retry_after = e.response.headers.get("retry-after")
-                    retry_after_ms = e.response.headers.get("retry-after-ms")
-
-                    if retry_after:
-                        wait_time = int(retry_after)
-                        logger.warning(
-                            f"Rate limit exceeded. Waiting for {wait_time} seconds before retrying (extracted from 'retry-after' header)..."
-                        )
-                        time.sleep(wait_time)
-                    elif retry_after_ms:
-                        wait_time = int(retry_after_ms) / 1000.0
-                        logger.warning(
-                            f"Rate limit exceeded. Waiting for {wait_time} seconds before retrying (extracted from 'retry-after-ms' header)..."
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        wait_time = 30
-                        logger.warning(
-                            f"'retry-after' header not found. Waiting for {wait_time} seconds before retrying (default)..."
-                        )
-                        time.sleep(wait_time)
-                else:
-                    logger.error(
-                        f"HTTP error occurred with status code: {e.response.status_code}, waiting 30 seconds before retrying"
-                    )
-                    time.sleep(30)
-
-            except Exception as e:
-                logger.error(f"Unexpected error occurred: {str(e)}")
-                logger.info(
-                    "Waiting for 30 seconds before retrying due to an unexpected error."
-                )
-                time.sleep(30)
-                continue
+        # Rate limiting, backoff, deadlines and the circuit breaker live in AIAdapter.invoke
+        started = time.monotonic()
+        reply = self.llm.invoke(messages)
+        latency = time.monotonic() - started
+
+        parsed_reply = self.parse_llmresult(reply)
+        LLMLogger.log_request(
+            prompts=messages, parsed_reply=parsed_reply, latency_seconds=latency, cache_hit=is_cache_hit(reply)
+        )
+        record_prompt_cache(
+            self.task, getattr(self.llm, "provider", ""), parsed_reply[RESPONSE_METADATA][MODEL_NAME], reply
+        )
 
-    def parse_llmresult(self, llmresult: AIMessage) -> Dict[str, Dict]:
-        logger.debug(f"Parsing LLM result: {llmresult}")
+        return reply
 
+    def parse_llmresult(self, llmresult: AIMessage) -> Dict[str, Dict]:
         try:
             if hasattr(llmresult, USAGE_METADATA):
                 content = llmresult.content
@@ -658,6 +1106,7 @@ class LoggerChatModel:
                         TOTAL_TOKENS: usage_metadata.get(
                             TOTAL_TOKENS, 0
                         ),
+                        CACHED_INPUT_TOKENS: cached_input_tokens(llmresult),
                     },
                 }
             else:
@@ -681,9 +1130,9 @@ class LoggerChatModel:
                         INPUT_TOKENS: token_usage.prompt_tokens,
                         OUTPUT_TOKENS: token_usage.completion_tokens,
                         TOTAL_TOKENS: token_usage.total_tokens,
+                        CACHED_INPUT_TOKENS: cached_input_tokens(llmresult),
                     },
                 }
-            logger.debug(f"Parsed LLM result successfully: {parsed_result}")
             return parsed_result
 
         except KeyError as e:
@@ -696,9 +1145,47 @@ class LoggerChatModel:
 
 
 class GPTAnswerer:
+    # Resume section -> PromptsShim template that answers questions about it
+    SECTION_TEMPLATES = {
+        PERSONAL_INFORMATION: "personal_information_template",
+        SELF_IDENTIFICATION: "self_identification_template",
+        LEGAL_AUTHORIZATION: "legal_authorization_template",
+        WORK_PREFERENCES: "work_preferences_template",
+        EDUCATION_DETAILS: "education_details_template",
+        EXPERIENCE_DETAILS: "experience_details_template",
+        PROJECTS: "projects_template",
+        AVAILABILITY: "availability_template",
+        SALARY_EXPECTATIONS: "salary_expectations_template",
+        CERTIFICATIONS: "certifications_template",
+        LANGUAGES: "languages_template",
+        INTERESTS: "interests_template",
+        COVER_LETTER: "coverletter_template",
+    }
+
+    # PromptsShim template -> task type used to pick its model tier
+    TEMPLATE_TASKS = {
+        "summarize_prompt_template": JOB_SUMMARY,
+        "is_relavant_position_template": ATS_SCORING,
+        "determine_section_template": SECTION_CLASSIFICATION,
+        "coverletter_template": COVER_LETTER_GENERATION,
+        "numeric_question_template": NUMERIC_ANSWER,
+        "options_template": OPTIONS_MATCHING,
+        "resume_or_cover_letter_template": RESUME_OR_COVER,
+    }
+
     def __init__(self, config, llm_api_key):
-        self.ai_adapter = AIAdapter(config, llm_api_key)
-        self.llm_cheap = LoggerChatModel(self.ai_adapter)
+        self.model_router = ModelRouter(config, llm_api_key)
+        self.ai_adapter = self.model_router.for_task(None)
+        self.llm_cheap = LoggerChatModel(self.ai_adapter, task=TEXTUAL_ANSWER)
+        self._task_llms: Dict[str, LoggerChatModel] = {}
+        self._chains: Dict[str, object] = {}
+        self._chains_lock = threading.Lock()
+        self.answer_memory = get_answer_memory()
+        self.job_summarizer = JobSummarizer(
+            self._llm_for_task(JOB_SUMMARY),
+            textwrap.dedent(prompts.summarize_prompt_template),
+            postprocess=self._clean_llm_output,
+        )
 
     @property
     def job_description(self):
@@ -728,75 +1215,109 @@ class GPTAnswerer:
     def set_resume(self, resume):
         logger.debug(f"Setting resume: {resume}")
         self.resume = resume
+        try:
+            self.experience_index = ExperienceIndex.from_resume(resume)
+        except Exception as e:
+            logger.warning(f"Could not index resume experience: {e}")
+            self.experience_index = None
+        self.resume_context = self._build_context(resume)
+        self._refresh_answer_memory()
 
     def set_job(self, job: Job):
         logger.debug(f"Setting job: {job}")
         self.job = job
-        self.job.set_summarize_job_description(
-            self.summarize_job_description(self.job.description)
-        )
+        if not self.job.summarize_job_description:
+            self.job.set_summarize_job_description(
+                self.summarize_job_description(self.job.description)
+            )
 
     def set_job_application_profile(self, job_application_profile):
         logger.debug(f"Setting job application profile: {job_application_profile}")
         self.job_application_profile = job_application_profile
+        self.profile_context = self._build_context(job_application_profile)
+        self._refresh_answer_memory()
+
+    @staticmethod
+    def _build_context(source) -> Optional[ResumeContext]:
+        if not context_enabled():
+            return None
+        try:
+            return ResumeContext.from_resume(source)
+        except Exception as e:
+            logger.warning(f"Could not build resume context: {e}")
+            return None
+
+    def _context(self, source_name: str, query: str, task: str):
+        """Relevant part of the resume/profile for ``query``, or the whole object when trimming is off."""
+        context = getattr(self, f"{source_name}_context", None)
+        if context is None:
+            return getattr(self, source_name)
+        return context.select(query, task)
+
+    def _refresh_answer_memory(self):
+        """Point the answer memory at the current resume + profile once both are known."""
+        if self.answer_memory is None:
+            return
+        if not hasattr(self, "resume") or not hasattr(self, "job_application_profile"):
+            return
+        self.answer_memory.set_profile(
+            profile_fingerprint(self.resume, self.job_application_profile)
+        )
 
     def _clean_llm_output(self, output: str) -> str:
         return output.replace("*", "").replace("#", "").strip()
     
     def summarize_job_description(self, text: str) -> str:
-        logger.debug(f"Summarizing job description: {text}")
-        prompts.summarize_prompt_template = self._preprocess_template_string(
-            prompts.summarize_prompt_template
-        )
-        prompt = ChatPromptTemplate.from_template(prompts.summarize_prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        raw_output = chain.invoke({TEXT: text})
-        output = self._clean_llm_output(raw_output)
-        logger.debug(f"Summary generated: {output}")
+        output = self.job_summarizer.summarize(text)
+        logger.debug(f"Summary generated ({len(output)} chars)")
         return output
 
-    def _create_chain(self, template: str):
-        logger.debug(f"Creating chain with template: {template}")
-        prompt = ChatPromptTemplate.from_template(template)
-        return prompt | self.llm_cheap | StrOutputParser()
-
-    def answer_question_textual_wide_range(self, question: str) -> str:
-        logger.debug(f"Answering textual question: {question}")
-        chains = {
-            PERSONAL_INFORMATION: self._create_chain(
-                prompts.personal_information_template
-            ),
-            SELF_IDENTIFICATION: self._create_chain(
-                prompts.self_identification_template
-            ),
-            LEGAL_AUTHORIZATION: self._create_chain(
-                prompts.legal_authorization_template
-            ),
-            WORK_PREFERENCES: self._create_chain(
-                prompts.work_preferences_template
-            ),
-            EDUCATION_DETAILS: self._create_chain(
-                prompts.education_details_template
-            ),
-            EXPERIENCE_DETAILS: self._create_chain(
-                prompts.experience_details_template
-            ),
-            PROJECTS: self._create_chain(prompts.projects_template),
-            AVAILABILITY: self._create_chain(prompts.availability_template),
-            SALARY_EXPECTATIONS: self._create_chain(
-                prompts.salary_expectations_template
-            ),
-            CERTIFICATIONS: self._create_chain(
-                prompts.certifications_template
-            ),
-            LANGUAGES: self._create_chain(prompts.languages_template),
-            INTERESTS: self._create_chain(prompts.interests_template),
-            COVER_LETTER: self._create_chain(prompts.coverletter_template),
-        }
-
-        prompt = ChatPromptTemplate.from_template(prompts.determine_section_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        raw_output = chain.invoke({QUESTION: question})
+    def summarize_jobs(self, jobs: List[Job]) -> None:
+        """
+        Summarise a whole search result page in as few requests as the token
+        budget allows; ``set_job`` then finds each summary in the cache. Call
+        it wherever a page of jobs is handed to this answerer. The bots do not
+        use ``GPTAnswerer`` yet, so no batch run calls it today.
+        """
+        summaries = self.job_summarizer.summarize_many([job.description for job in jobs])
+        for job, summary in zip(jobs, summaries):
+            if summary:
+                job.set_summarize_job_description(summary)
+
+    def _chain(self, template_name: str):
+        """Return this answerer's chain for ``template_name``, composing it once."""
+        chain = self._chains.get(template_name)
+        if chain is None:
+            with self._chains_lock:
+                chain = self._chains.get(template_name)
+                if chain is None:
+                    from langchain_core.output_parsers import StrOutputParser
+
+                    task = self.TEMPLATE_TASKS.get(template_name, TEXTUAL_ANSWER)
+                    chain = prompt_registry.get(template_name) | self._llm_for_task(task) | StrOutputParser()
+                    self._chains[template_name] = chain
+        return chain
+
+    def _llm_for_task(self, task: str) -> "LoggerChatModel":
+        """LoggerChatModel over the adapter for ``task``'s model tier; one per task for its metrics."""
+        llm = self._task_llms.get(task)
+        if llm is None:
+            llm = self._task_llms.setdefault(task, LoggerChatModel(self.model_router.for_task(task), task=task))
+        return llm
+
+    def determine_section(self, question: str) -> str:
+        """
+        Map ``question`` to a resume/profile section. The local router answers
+        confident cases; the LLM classifier handles the rest and its answer is
+        fed back to the router as a training example.
+        """
+        router = get_section_router()
+        decision = router.route(question) if router else None
+        if decision is not None and router.is_confident(decision):
+            router.record(question, decision)
+            return decision.section
+
+        raw_output = self._chain("determine_section_template").invoke({QUESTION: question})
         output = self._clean_llm_output(raw_output)
 
         match = re.search(
@@ -810,12 +1331,22 @@ class GPTAnswerer:
             raise ValueError("Could not extract section name from the response.")
 
         section_name = match.group(1).lower().replace(" ", "_")
+        if decision is not None:
+            router.record(question, decision, llm_section=section_name)
+        return section_name
+
+    def answer_question_textual_wide_range(self, question: str) -> str:
+        logger.debug(f"Answering textual question: {question}")
+        remembered = self._recall_answer("textual", question)
+        if remembered is not None:
+            return remembered
+        section_name = self.determine_section(question)
 
         if section_name == "cover_letter":
-            chain = chains.get(section_name)
+            chain = self._chain(self.SECTION_TEMPLATES[COVER_LETTER])
             raw_output = chain.invoke(
                 {
-                    RESUME: self.resume,
+                    RESUME: self._context("resume", self.job_description, COVER_LETTER_GENERATION),
                     JOB_DESCRIPTION: self.job_description,
                     COMPANY: self.job.company,
                 }
@@ -833,27 +1364,38 @@ class GPTAnswerer:
             raise ValueError(
                 f"Section '{section_name}' not found in either resume or job_application_profile."
             )
-        chain = chains.get(section_name)
-        if chain is None:
+        template_name = self.SECTION_TEMPLATES.get(section_name)
+        if template_name is None:
             logger.error(f"Chain not defined for section '{section_name}'")
             raise ValueError(f"Chain not defined for section '{section_name}'")
+        chain = self._chain(template_name)
         raw_output = chain.invoke(
             {RESUME_SECTION: resume_section, QUESTION: question}
         )
         output = self._clean_llm_output(raw_output)
         logger.debug(f"Question answered: {output}")
+        # Cover letters depend on the job, so only section answers are remembered
+        self._remember_answer("textual", question, output)
         return output
 
     def answer_question_numeric(
         self, question: str, default_experience: str = 3
     ) -> str:
         logger.debug(f"Answering numeric question: {question}")
-        func_template = self._preprocess_template_string(
-            prompts.numeric_question_template
-        )
-        prompt = ChatPromptTemplate.from_template(func_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        raw_output_str = chain.invoke(
+        remembered = self._recall_answer("numeric", question)
+        if remembered is not None:
+            return remembered
+        experience_index = getattr(self, "experience_index", None)
+        if experience_index is not None:
+            years = experience_index.answer(question)
+            if years is not None:
+                logger.debug(f"Answered numeric question locally: {years}")
+                self._remember_answer("numeric", question, str(years))
+                return str(years)
+            if experience_index.all_intervals and experience_index.is_years_question(question):
+                # Better fallback than a fixed guess if the LLM reply has no number
+                default_experience = str(int(experience_index.total_years + 0.5))
+        raw_output_str = self._chain("numeric_question_template").invoke(
             {
                 RESUME_EDUCATIONS: self.resume.education_details,
                 RESUME_JOBS: self.resume.experience_details,
@@ -866,6 +1408,7 @@ class GPTAnswerer:
         try:
             output = self.extract_number_from_string(output_str)
             logger.debug(f"Extracted number: {output}")
+            self._remember_answer("numeric", question, output)
         except ValueError:
             logger.warning(
                 f"Failed to extract number, using default experience: {default_experience}"
@@ -885,13 +1428,15 @@ class GPTAnswerer:
 
     def answer_question_from_options(self, question: str, options: list[str]) -> str:
         logger.debug(f"Answering question from options: {question}")
-        func_template = self._preprocess_template_string(prompts.options_template)
-        prompt = ChatPromptTemplate.from_template(func_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        raw_output_str = chain.invoke(
+        remembered = self._recall_answer("options", question, options)
+        if remembered is not None and remembered in options:
+            return remembered
+        raw_output_str = self._chain("options_template").invoke(
             {
-                RESUME: self.resume,
-                JOB_APPLICATION_PROFILE: self.job_application_profile,
+                RESUME: self._context("resume", f"{question} {' '.join(options)}", OPTIONS_MATCHING),
+                JOB_APPLICATION_PROFILE: self._context(
+                    "job_application_profile", f"{question} {' '.join(options)}", OPTIONS_MATCHING
+                ),
                 QUESTION: question,
                 OPTIONS: options,
             }
@@ -900,17 +1445,26 @@ class GPTAnswerer:
         logger.debug(f"Raw output for options question: {output_str}")
         best_option = self.find_best_match(output_str, options)
         logger.debug(f"Best option determined: {best_option}")
+        self._remember_answer("options", question, best_option, options)
         return best_option
 
+    def _recall_answer(self, kind: str, question: str, options: Optional[List[str]] = None) -> Optional[str]:
+        if self.answer_memory is None:
+            return None
+        answer = self.answer_memory.recall(kind, question, options)
+        if answer is not None:
+            logger.debug(f"Answer memory hit ({kind}): {question}")
+        return answer
+
+    def _remember_answer(self, kind: str, question: str, answer: str, options: Optional[List[str]] = None):
+        if self.answer_memory is not None:
+            self.answer_memory.remember(kind, question, answer, options)
+
     def determine_resume_or_cover(self, phrase: str) -> str:
         logger.debug(
             f"Determining if phrase refers to resume or cover letter: {phrase}"
         )
-        prompt = ChatPromptTemplate.from_template(
-            prompts.resume_or_cover_letter_template
-        )
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        raw_response = chain.invoke({PHRASE: phrase})
+        raw_response = self._chain("resume_or_cover_letter_template").invoke({PHRASE: phrase})
         response = self._clean_llm_output(raw_response)
         logger.debug(f"Response for resume_or_cover: {response}")
         if "resume" in response:
@@ -922,11 +1476,9 @@ class GPTAnswerer:
 
     def is_job_suitable(self):
         logger.info("Checking if job is suitable")
-        prompt = ChatPromptTemplate.from_template(prompts.is_relavant_position_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        raw_output = chain.invoke(
+        raw_output = self._chain("is_relavant_position_template").invoke(
             {
-                RESUME: self.resume,
+                RESUME: self._context("resume", self.job_description, ATS_SCORING),
                 JOB_DESCRIPTION: self.job_description,
             }
         )
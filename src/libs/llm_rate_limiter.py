@@ -0,0 +1,475 @@
+"""
+llm_rate_limiter.py
+===================
+Shared rate limiting and retry engine for every LLM call.
+
+Each provider gets one ``ProviderRateLimiter`` holding
+
+  * a request bucket (requests per minute) and a token bucket (tokens per
+    minute), both refilled continuously, so a batch paces itself below the
+    provider's RPM/TPM limits instead of hammering the API;
+  * a circuit breaker that fails fast after repeated errors and lets a
+    single trial call through once the cool-down has passed.
+
+``call_with_retry`` / ``acall_with_retry`` wrap a provider call with
+jittered exponential backoff (honouring ``retry-after`` headers), a hard
+per-call deadline and non-retryable error detection. Each attempt only gets
+the time left before the deadline; one that runs past it fails with
+``LLMCallTimeout`` and counts as a retryable failure. They return the
+result together with a ``CallReport`` describing how long the call waited
+in the rate-limit queue and in backoff.
+
+Limits are configured in config.py (``LLM_RATE_LIMITS`` and friends).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.logging import logger
+
+
+DEFAULT_RPM = 60
+DEFAULT_TPM = 1_000_000
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_DEADLINE_SECONDS = 180.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_SECONDS = 60.0
+
+NON_RETRYABLE_MARKERS = (
+    "invalid api key", "api key not valid", "unauthorized", "permission denied",
+    "invalid_request", "invalid request", "not found", "unsupported",
+)
+
+
+class LLMRateLimitError(RuntimeError):
+    """Base class for errors raised by the retry engine."""
+
+
+class LLMDeadlineExceeded(LLMRateLimitError):
+    pass
+
+
+class CircuitOpenError(LLMRateLimitError):
+    pass
+
+
+class LLMCallTimeout(TimeoutError):
+    """A provider call ran past the time left before its deadline (retryable)."""
+
+
+# ---------------------------------------------------------------------------
+# Primitives
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Continuously refilled bucket. ``reserve`` never blocks; it returns the wait."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = max(float(rate_per_minute), 1e-9) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens (going into debt if needed); return seconds to wait."""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Give back (positive) or charge (negative) tokens after the fact."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Half-open admits one probe at a time; everyone else is turned away
+        until it settles (or it has been out longer than ``reset_seconds``).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+            elif self.probe_started and now - self.probe_started < self.reset_seconds:
+                return False
+            self.probe_started = now
+            return True
+
+    def release_probe(self) -> None:
+        """Free the half-open slot when the probe ends without telling us anything about the provider."""
+        with self._lock:
+            self.probe_started = 0.0
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probe_started = 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.probe_started = 0.0
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+@dataclass
+class CallReport:
+    provider: str
+    attempts: int = 0
+    queue_wait_seconds: float = 0.0
+    retry_wait_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Provider limiter
+# ---------------------------------------------------------------------------
+
+class ProviderRateLimiter:
+    def __init__(
+        self,
+        provider: str,
+        rpm: float = DEFAULT_RPM,
+        tpm: float = DEFAULT_TPM,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+        breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        breaker_reset_seconds: float = DEFAULT_BREAKER_RESET_SECONDS,
+    ):
+        self.provider = provider
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset_seconds)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self._stats_lock = threading.Lock()
+
+    def reserve(self, estimated_tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+
+    def release(self, estimated_tokens: int) -> None:
+        """Return a reservation that will not be used."""
+        self.requests.adjust(1)
+        self.tokens.adjust(estimated_tokens)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        if actual_tokens:
+            self.tokens.adjust(estimated_tokens - actual_tokens)
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = retry_after_seconds(error)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(ceiling / 2, ceiling)
+        return max(delay, retry_after or 0.0)
+
+    def record_call(self, report: CallReport, failed: bool = False) -> None:
+        with self._stats_lock:
+            self.calls += 1
+            self.retries += max(0, report.attempts - 1)
+            self.failures += int(failed)
+            self.total_queue_wait += report.queue_wait_seconds
+            self.max_queue_wait = max(self.max_queue_wait, report.queue_wait_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "provider": self.provider,
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "rejected_by_breaker": self.rejected,
+                "circuit_state": self.breaker.state,
+                "avg_queue_wait_seconds": round(self.total_queue_wait / self.calls, 3) if self.calls else 0.0,
+                "max_queue_wait_seconds": round(self.max_queue_wait, 3),
+            }
+
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """Return the process-wide limiter for ``provider`` built from config.py."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            import config as cfg
+
+            limits = (getattr(cfg, "LLM_RATE_LIMITS", {}) or {}).get(provider, {})
+            limiter = ProviderRateLimiter(
+                provider,
+                rpm=limits.get("rpm", DEFAULT_RPM),
+                tpm=limits.get("tpm", DEFAULT_TPM),
+                max_retries=getattr(cfg, "LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES),
+                deadline_seconds=getattr(cfg, "LLM_CALL_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS),
+                breaker_threshold=getattr(cfg, "LLM_CIRCUIT_BREAKER_THRESHOLD", DEFAULT_BREAKER_THRESHOLD),
+                breaker_reset_seconds=getattr(cfg, "LLM_CIRCUIT_BREAKER_RESET_SECONDS", DEFAULT_BREAKER_RESET_SECONDS),
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        return {name: limiter.stats() for name, limiter in _limiters.items()}
+
+
+# ---------------------------------------------------------------------------
+# Error classification
+# ---------------------------------------------------------------------------
+
+def _status_code(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    code = getattr(response, "status_code", None) or getattr(error, "status_code", None)
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """429s, 5xx and transient transport errors are retried; client errors are not."""
+    if isinstance(error, (LLMRateLimitError, ValueError, TypeError, KeyError, AttributeError)):
+        return False
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    message = str(error).lower()
+    return not any(marker in message for marker in NON_RETRYABLE_MARKERS)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _usage_tokens(result: Any) -> int:
+    usage = getattr(result, "usage_metadata", None) or {}
+    return int(usage.get("total_tokens", 0) or 0)
+
+
+# ---------------------------------------------------------------------------
+# Retry engine
+# ---------------------------------------------------------------------------
+
+def _next_delay(limiter: ProviderRateLimiter, attempt: int, error: Exception,
+                started: float, deadline: float, max_retries: int) -> float:
+    if not is_retryable(error) or attempt >= max_retries:
+        raise error
+    delay = limiter.backoff_delay(attempt, error)
+    if time.monotonic() + delay - started > deadline:
+        raise LLMDeadlineExceeded(
+            f"{limiter.provider}: giving up after {attempt + 1} attempts, deadline of {deadline:.0f}s reached"
+        ) from error
+    logger.warning(
+        f"{limiter.provider} call failed ({error}); retrying in {delay:.1f}s "
+        f"(attempt {attempt + 1}/{max_retries})"
+    )
+    return delay
+
+
+def _remaining(started: float, deadline: float) -> float:
+    return max(deadline - (time.monotonic() - started), 0.001)
+
+
+def _run_with_timeout(fn: Callable[[], Any], timeout: float, provider: str) -> Any:
+    """
+    ``fn()`` on a worker thread, given up after ``timeout`` seconds. The
+    provider clients take no common per-request timeout, so a hung call is
+    abandoned rather than cancelled; the daemon thread ends with the socket.
+    """
+    outcome: Dict[str, Any] = {}
+    done = threading.Event()
+
+    def _target() -> None:
+        try:
+            outcome["result"] = fn()
+        except BaseException as error:
+            outcome["error"] = error
+        finally:
+            done.set()
+
+    threading.Thread(target=_target, name=f"llm-call-{provider}", daemon=True).start()
+    if not done.wait(timeout):
+        raise LLMCallTimeout(f"{provider}: no reply within {timeout:.1f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+async def _await_with_timeout(fn: Callable[[], Awaitable[Any]], timeout: float, provider: str) -> Any:
+    try:
+        return await asyncio.wait_for(fn(), timeout)
+    except asyncio.TimeoutError:
+        raise LLMCallTimeout(f"{provider}: no reply within {timeout:.1f}s") from None
+
+
+def _check_breaker(limiter: ProviderRateLimiter) -> None:
+    if not limiter.breaker.allow():
+        with limiter._stats_lock:
+            limiter.rejected += 1
+        raise CircuitOpenError(f"Circuit open for provider '{limiter.provider}', failing fast")
+
+
+def call_with_retry(
+    fn: Callable[[], Any],
+    limiter: ProviderRateLimiter,
+    estimated_tokens: int = 0,
+    deadline: Optional[float] = None,
+    max_retries: Optional[int] = None,
+) -> Tuple[Any, CallReport]:
+    """
+    Run ``fn`` under ``limiter``'s buckets, breaker and retry policy.
+    ``deadline`` and ``max_retries`` override the limiter's defaults for this call.
+    """
+    deadline = deadline or limiter.deadline_seconds
+    max_retries = limiter.max_retries if max_retries is None else max_retries
+    report = CallReport(provider=limiter.provider)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        _check_breaker(limiter)
+        wait = limiter.reserve(estimated_tokens)
+        if time.monotonic() + wait - started > deadline:
+            limiter.release(estimated_tokens)
+            limiter.breaker.release_probe()
+            limiter.record_call(report, failed=True)
+            raise LLMDeadlineExceeded(f"{limiter.provider}: rate-limit queue exceeds the {deadline:.0f}s deadline")
+        if wait:
+            time.sleep(wait)
+            report.queue_wait_seconds += wait
+        report.attempts += 1
+        try:
+            result = _run_with_timeout(fn, _remaining(started, deadline), limiter.provider)
+        except Exception as error:
+            if is_retryable(error):
+                limiter.breaker.record_failure()
+            else:
+                limiter.breaker.release_probe()
+            try:
+                delay = _next_delay(limiter, attempt, error, started, deadline, max_retries)
+            except Exception:
+                report.elapsed_seconds = time.monotonic() - started
+                limiter.record_call(report, failed=True)
+                raise
+            time.sleep(delay)
+            report.retry_wait_seconds += delay
+            attempt += 1
+            continue
+        limiter.breaker.record_success()
+        limiter.reconcile(estimated_tokens, _usage_tokens(result))
+        report.elapsed_seconds = time.monotonic() - started
+        limiter.record_call(report)
+        return result, report
+
+
+async def acall_with_retry(
+    fn: Callable[[], Awaitable[Any]],
+    limiter: ProviderRateLimiter,
+    estimated_tokens: int = 0,
+    deadline: Optional[float] = None,
+    max_retries: Optional[int] = None,
+) -> Tuple[Any, CallReport]:
+    """Async counterpart of ``call_with_retry``; sleeps without blocking the loop."""
+    deadline = deadline or limiter.deadline_seconds
+    max_retries = limiter.max_retries if max_retries is None else max_retries
+    report = CallReport(provider=limiter.provider)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        _check_breaker(limiter)
+        wait = limiter.reserve(estimated_tokens)
+        if time.monotonic() + wait - started > deadline:
+            limiter.release(estimated_tokens)
+            limiter.breaker.release_probe()
+            limiter.record_call(report, failed=True)
+            raise LLMDeadlineExceeded(f"{limiter.provider}: rate-limit queue exceeds the {deadline:.0f}s deadline")
+        if wait:
+            await asyncio.sleep(wait)
+            report.queue_wait_seconds += wait
+        report.attempts += 1
+        try:
+            result = await _await_with_timeout(fn, _remaining(started, deadline), limiter.provider)
+        except Exception as error:
+            if is_retryable(error):
+                limiter.breaker.record_failure()
+            else:
+                limiter.breaker.release_probe()
+            try:
+                delay = _next_delay(limiter, attempt, error, started, deadline, max_retries)
+            except Exception:
+                report.elapsed_seconds = time.monotonic() - started
+                limiter.record_call(report, failed=True)
+                raise
+            await asyncio.sleep(delay)
+            report.retry_wait_seconds += delay
+            attempt += 1
+            continue
+        limiter.breaker.record_success()
+        limiter.reconcile(estimated_tokens, _usage_tokens(result))
+        report.elapsed_seconds = time.monotonic() - started
+        limiter.record_call(report)
+        return result, report
@@ -0,0 +1,169 @@
+"""
+llm_replay.py
+=============
+Record/replay store behind the ``replay`` LLM provider (``ReplayModel`` in
+llm_manager.py), for offline benchmarks and deterministic tests.
+
+  LLM_MODEL_TYPE = 'replay'
+  LLM_REPLAY_MODE = 'record'   call the provider in LLM_REPLAY_UPSTREAM and save
+                               every prompt -> reply pair (with usage_metadata)
+  LLM_REPLAY_MODE = 'replay'   serve replies from LLM_REPLAY_PATH, no network
+
+Recordings are JSONL, one entry per prompt, keyed by a hash of the rendered
+prompt only, so a recording made against one provider replays for any
+configured model. Replayed calls sleep for the recorded latency, or for
+``LLM_REPLAY_LATENCY_SECONDS`` plus ``output_tokens / LLM_REPLAY_OUTPUT_TOKENS_PER_SECOND``
+when set, and report token counts scaled by ``LLM_REPLAY_TOKEN_SCALE``, so
+throughput and latency regressions can be measured in CI.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.libs.llm_cache import message_to_payload, payload_to_message, render_prompt
+from src.libs.llm_rate_limiter import estimate_tokens
+from src.logging import logger
+
+
+DEFAULT_REPLAY_PATH = Path("data_folder/output/llm_replay.jsonl")
+RECORD_MODE = "record"
+REPLAY_MODE = "replay"
+
+
+class ReplayMissError(KeyError):
+    """Replay mode was asked for a prompt that was never recorded."""
+
+
+def prompt_key(prompt: Any) -> str:
+    return hashlib.sha256(render_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """Prompt-hash -> recorded reply, loaded from and appended to one JSONL file."""
+
+    def __init__(self, path: Path = DEFAULT_REPLAY_PATH):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as fh:
+            for line_number, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+                except (ValueError, KeyError) as exc:
+                    logger.warning(f"Skipping bad replay entry {self.path}:{line_number}: {exc}")
+        logger.debug(f"Loaded {len(self._entries)} recorded LLM replies from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, prompt: Any) -> Optional[Tuple[Any, float]]:
+        """``(reply message, recorded latency)`` for ``prompt``, or None."""
+        with self._lock:
+            entry = self._entries.get(prompt_key(prompt))
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return payload_to_message(entry["response"]), float(entry.get("latency_seconds") or 0.0)
+
+    def record(self, prompt: Any, response: Any, latency_seconds: float, model: str = "") -> None:
+        text = render_prompt(prompt)
+        payload = message_to_payload(response)
+        if not payload.get("usage_metadata"):
+            input_tokens = estimate_tokens(text)
+            output_tokens = estimate_tokens(payload.get("content") or "")
+            payload["usage_metadata"] = {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            }
+        entry = {
+            "key": prompt_key(prompt),
+            "model": model,
+            "prompt": text,
+            "response": payload,
+            "latency_seconds": round(latency_seconds, 4),
+            "recorded_at": time.time(),
+        }
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            self.recorded += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "recorded": self.recorded,
+            }
+
+
+_stores: Dict[str, ReplayStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_replay_store(path: Optional[Path] = None) -> ReplayStore:
+    """One store per recording file, shared by every ``ReplayModel`` in the process."""
+    import config as cfg
+
+    path = Path(path or getattr(cfg, "LLM_REPLAY_PATH", DEFAULT_REPLAY_PATH))
+    with _stores_lock:
+        store = _stores.get(str(path))
+        if store is None:
+            store = _stores[str(path)] = ReplayStore(path)
+        return store
+
+
+def synthetic_usage(response: Any) -> Any:
+    """Scale the replayed token counts by ``LLM_REPLAY_TOKEN_SCALE`` (1.0 keeps them)."""
+    import config as cfg
+
+    scale = getattr(cfg, "LLM_REPLAY_TOKEN_SCALE", 1.0)
+    usage = getattr(response, "usage_metadata", None)
+    if not usage or scale == 1.0:
+        return response
+    input_tokens = int(usage.get("input_tokens", 0) * scale)
+    output_tokens = int(usage.get("output_tokens", 0) * scale)
+    response.usage_metadata = {
+        **usage,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+    return response
+
+
+def synthetic_latency(recorded_seconds: float, response: Any) -> float:
+    """Replay delay for one reply under the ``LLM_REPLAY_*`` latency settings."""
+    import config as cfg
+
+    fixed = getattr(cfg, "LLM_REPLAY_LATENCY_SECONDS", None)
+    tokens_per_second = getattr(cfg, "LLM_REPLAY_OUTPUT_TOKENS_PER_SECOND", 0) or 0
+    if fixed is None and not tokens_per_second:
+        return recorded_seconds
+    delay = float(fixed or 0.0)
+    if tokens_per_second:
+        usage = getattr(response, "usage_metadata", None) or {}
+        delay += int(usage.get("output_tokens", 0) or 0) / float(tokens_per_second)
+    return delay
@@ -0,0 +1,155 @@
+"""
+model_router.py
+===============
+Task-based model routing: each kind of LLM work is mapped to a model tier,
+and each tier to a concrete model for the configured provider.
+
+  config.LLM_TASK_TIERS   task  -> tier      e.g. 'section_classification' -> 'fast'
+  config.LLM_MODEL_TIERS  tier  -> {provider: model}
+
+A tier with no entry for the active provider (``LLM_MODEL_TYPE``) falls back
+to ``LLM_MODEL``, so routing never switches provider or API key behind the
+user's back; it only picks a cheaper or stronger model of the same provider.
+
+Calls are recorded per tier (count, latency, tokens, estimated cost); see
+``tier_stats()``.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.libs.llm_call_log import estimate_cost
+from src.logging import logger
+
+
+# Task types
+SECTION_CLASSIFICATION = "section_classification"
+RESUME_OR_COVER = "resume_or_cover"
+OPTIONS_MATCHING = "options_matching"
+NUMERIC_ANSWER = "numeric_answer"
+TEXTUAL_ANSWER = "textual_answer"
+JOB_SUMMARY = "job_summary"
+JOB_PARSING = "job_parsing"
+ATS_SCORING = "ats_scoring"
+TAILORING = "tailoring"
+RESUME_GENERATION = "resume_generation"
+COVER_LETTER_GENERATION = "cover_letter"
+BRIEFING = "briefing"
+
+DEFAULT_TIER = "standard"
+
+
+def resolve_task_model(task: Optional[str]) -> Tuple[str, str, str]:
+    """Return ``(tier, provider, model)`` for ``task`` under the current config."""
+    import config as cfg
+
+    provider = cfg.LLM_MODEL_TYPE
+    tier = (getattr(cfg, "LLM_TASK_TIERS", {}) or {}).get(task, DEFAULT_TIER) if task else DEFAULT_TIER
+    models = (getattr(cfg, "LLM_MODEL_TIERS", {}) or {}).get(tier) or {}
+    model = models.get(provider) or cfg.LLM_MODEL
+    return tier, provider, model
+
+
+@dataclass
+class TierUsage:
+    calls: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    models: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": round(self.cost, 6),
+            "avg_latency_seconds": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p95_latency_seconds": (
+                round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3) if latencies else None
+            ),
+            "models": dict(self.models),
+        }
+
+
+_usage: Dict[str, TierUsage] = {}
+_usage_lock = threading.Lock()
+_MAX_LATENCY_SAMPLES = 1000
+
+
+def record_tier_usage(
+    tier: str,
+    model: str,
+    latency_seconds: Optional[float] = None,
+    response: Any = None,
+    cache_hit: bool = False,
+) -> None:
+    usage_metadata = getattr(response, "usage_metadata", None) or {}
+    input_tokens = int(usage_metadata.get("input_tokens", 0) or 0)
+    output_tokens = int(usage_metadata.get("output_tokens", 0) or 0)
+    with _usage_lock:
+        usage = _usage.setdefault(tier, TierUsage())
+        if cache_hit:
+            usage.cache_hits += 1
+            return
+        usage.calls += 1
+        usage.models[model] = usage.models.get(model, 0) + 1
+        usage.input_tokens += input_tokens
+        usage.output_tokens += output_tokens
+        usage.cost += estimate_cost(model, input_tokens, output_tokens)
+        if latency_seconds is not None:
+            usage.latencies.append(latency_seconds)
+            if len(usage.latencies) > _MAX_LATENCY_SAMPLES:
+                del usage.latencies[: len(usage.latencies) - _MAX_LATENCY_SAMPLES]
+
+
+def tier_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-tier call count, cache hits, tokens, estimated cost and latency."""
+    with _usage_lock:
+        return {tier: usage.as_dict() for tier, usage in _usage.items()}
+
+
+def reset_tier_stats() -> None:
+    with _usage_lock:
+        _usage.clear()
+
+
+class ModelRouter:
+    """Hands out one ``AIAdapter`` per (provider, model, tier) for a given API key."""
+
+    def __init__(self, config: dict, api_key: str):
+        self.config = config
+        self.api_key = api_key
+        self._adapters: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def for_task(self, task: Optional[str]):
+        from src.libs.llm_manager import AIAdapter
+
+        tier, provider, model = resolve_task_model(task)
+        key = (provider, model, tier)
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                logger.debug(f"Routing tier '{tier}' to {provider}/{model}")
+                adapter = AIAdapter(self.config, self.api_key, provider=provider, model_name=model, tier=tier)
+                self._adapters[key] = adapter
+            return adapter
+
+    def warm(self) -> None:
+        """Build the adapter, and so the provider clients, for every configured task."""
+        import config as cfg
+
+        for task in [None, *(getattr(cfg, "LLM_TASK_TIERS", {}) or {})]:
+            try:
+                self.for_task(task)
+            except Exception as exc:
+                logger.warning(f"Could not warm LLM client for task '{task or DEFAULT_TIER}': {exc}")
+                continue
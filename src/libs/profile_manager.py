@@ -56,6 +56,9 @@ class Profile:
     
     def get_work_prefs_path(self) -> Path:
         return self.path / "work_preferences.yaml"
+
+    def get_keyword_dictionaries_path(self) -> Path:
+        return self.path / "keyword_dictionaries.yaml"
     
     def get_metadata_path(self) -> Path:
         return self.path / "profile_metadata.yaml"
@@ -171,6 +174,10 @@ class ProfileManager:
         # Copy work preferences (if exists)
         if profile.get_work_prefs_path().exists():
             shutil.copy2(profile.get_work_prefs_path(), data_folder / "work_preferences.yaml")
+
+        # Copy ATS keyword dictionaries (if exists)
+        if profile.get_keyword_dictionaries_path().exists():
+            shutil.copy2(profile.get_keyword_dictionaries_path(), data_folder / "keyword_dictionaries.yaml")
         
         logger.info(f"Activated profile: {profile_name}")
     
@@ -188,6 +195,7 @@ class ProfileManager:
             ("plain_text_resume.yaml", profile.get_resume_path()),
             ("email_config.yaml", profile.get_email_config_path()),
             ("work_preferences.yaml", profile.get_work_prefs_path()),
+            ("keyword_dictionaries.yaml", profile.get_keyword_dictionaries_path()),
         ]
         
         for src_name, dest_path in files_to_copy:
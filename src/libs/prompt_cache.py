@@ -0,0 +1,187 @@
+"""
+prompt_cache.py
+===============
+Provider prompt-caching support.
+
+OpenAI and Gemini cache long prompt prefixes automatically and Anthropic
+caches up to an explicit ``cache_control`` marker, so every prompt that
+repeats the candidate's resume across jobs is laid out as
+
+  instructions + candidate context     (stable: identical for every job)
+  CACHE_BREAKPOINT
+  job description, question, ...        (variable)
+
+Templates put ``{cache_breakpoint}`` on its own line at that boundary;
+``PromptRegistry`` fills it with ``CACHE_BREAKPOINT``. Before a prompt is
+sent, ``prepare_prompt`` removes the marker, or for Claude turns the text
+before it into a content block with ``cache_control``.
+
+Cached input tokens are read from each reply (``cached_input_tokens``) and
+counted per task: hit rate, cached share of input tokens and the estimated
+saving; see ``prompt_cache_stats()``.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from src.libs.llm_cache import is_cache_hit
+from src.libs.llm_call_log import DEFAULT_PROMPT_PRICE_PER_TOKEN
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+
+CACHE_BREAKPOINT = "<<cache-breakpoint>>"
+
+# Share of the prompt price saved on a cached input token, per provider
+DEFAULT_CACHED_INPUT_DISCOUNTS = {"openai": 0.5, "claude": 0.9, "gemini": 0.75}
+
+
+def strip_breakpoint(text: str) -> str:
+    return text.replace(f"\n{CACHE_BREAKPOINT}\n", "\n").replace(CACHE_BREAKPOINT, "")
+
+
+def _messages(prompt: Any) -> List["BaseMessage"]:
+    from langchain_core.messages import HumanMessage
+    from langchain_core.prompt_values import ChatPromptValue, StringPromptValue
+
+    if isinstance(prompt, str):
+        return [HumanMessage(content=prompt)]
+    if isinstance(prompt, StringPromptValue):
+        return [HumanMessage(content=prompt.text)]
+    if isinstance(prompt, ChatPromptValue):
+        return list(prompt.messages)
+    return list(prompt)
+
+
+def _has_breakpoint(prompt: Any) -> bool:
+    if isinstance(prompt, str):
+        return CACHE_BREAKPOINT in prompt
+    # Anything else is a langchain prompt, so langchain_core is already loaded
+    from langchain_core.prompt_values import StringPromptValue
+
+    if isinstance(prompt, StringPromptValue):
+        return CACHE_BREAKPOINT in prompt.text
+    messages = getattr(prompt, "messages", prompt)
+    if not isinstance(messages, (list, tuple)):
+        return False
+    return any(isinstance(getattr(m, "content", None), str) and CACHE_BREAKPOINT in m.content for m in messages)
+
+
+def prepare_prompt(prompt: Any, cache_control: bool = False) -> Any:
+    """
+    ``prompt`` without the breakpoint marker. With ``cache_control`` the text
+    before the marker becomes an Anthropic ``cache_control`` content block.
+    """
+    if not _has_breakpoint(prompt):
+        return prompt
+    if isinstance(prompt, str) and not cache_control:
+        return strip_breakpoint(prompt)
+    from langchain_core.prompt_values import ChatPromptValue, StringPromptValue
+
+    if not cache_control:
+        if isinstance(prompt, str):
+            return strip_breakpoint(prompt)
+        if isinstance(prompt, StringPromptValue):
+            return StringPromptValue(text=strip_breakpoint(prompt.text))
+    prepared = []
+    for message in _messages(prompt):
+        content = message.content
+        if isinstance(content, str) and CACHE_BREAKPOINT in content:
+            if cache_control:
+                prefix, _, suffix = content.partition(CACHE_BREAKPOINT)
+                content = [
+                    {"type": "text", "text": prefix.rstrip("\n") + "\n", "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": strip_breakpoint(suffix.lstrip("\n"))},
+                ]
+            else:
+                content = strip_breakpoint(content)
+            # pydantic v1 messages in langchain-core 0.2, v2 from 0.3
+            copy_message = getattr(message, "model_copy", None) or message.copy
+            message = copy_message(update={"content": content})
+        prepared.append(message)
+    return ChatPromptValue(messages=prepared) if isinstance(prompt, ChatPromptValue) else prepared
+
+
+def _get(container: Any, name: str) -> Any:
+    if isinstance(container, dict):
+        return container.get(name)
+    return getattr(container, name, None)
+
+
+def cached_input_tokens(response: Any) -> int:
+    """Input tokens served from the provider's prompt cache, in any provider's reply format."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = _get(usage, "input_token_details") or {}
+    if _get(details, "cache_read"):
+        return int(_get(details, "cache_read"))
+    metadata = getattr(response, "response_metadata", None) or {}
+    # OpenAI: token_usage.prompt_tokens_details.cached_tokens
+    prompt_details = _get(_get(metadata, "token_usage") or {}, "prompt_tokens_details") or {}
+    if _get(prompt_details, "cached_tokens"):
+        return int(_get(prompt_details, "cached_tokens"))
+    # Anthropic: usage.cache_read_input_tokens
+    if _get(_get(metadata, "usage") or {}, "cache_read_input_tokens"):
+        return int(_get(metadata["usage"], "cache_read_input_tokens"))
+    # Gemini: usage_metadata.cached_content_token_count
+    return int(_get(_get(metadata, "usage_metadata") or {}, "cached_content_token_count") or 0)
+
+
+# ---------------------------------------------------------------------------
+# Per-task stats
+# ---------------------------------------------------------------------------
+
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def _saving(provider: str, model: str, cached_tokens: int) -> float:
+    import config as cfg
+
+    prices = (getattr(cfg, "LLM_PRICING", {}) or {}).get(model)
+    prompt_price = prices[0] if prices else DEFAULT_PROMPT_PRICE_PER_TOKEN
+    discounts = getattr(cfg, "LLM_CACHED_INPUT_DISCOUNTS", DEFAULT_CACHED_INPUT_DISCOUNTS) or {}
+    return cached_tokens * prompt_price * float(discounts.get(provider, 0.0))
+
+
+def record_prompt_cache(task: str, provider: str, model: str, response: Any) -> int:
+    """Count one reply's input and cached tokens under ``task``; returns the cached count."""
+    if is_cache_hit(response):
+        # Served by the LLM response cache: no provider call, nothing to count
+        return 0
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_tokens = int(_get(usage, "input_tokens") or 0)
+    cached = cached_input_tokens(response)
+    with _stats_lock:
+        counts = _stats.setdefault(task or "default", {
+            "calls": 0, "hits": 0, "input_tokens": 0, "cached_tokens": 0, "saved_usd": 0.0,
+        })
+        counts["calls"] += 1
+        counts["hits"] += 1 if cached else 0
+        counts["input_tokens"] += input_tokens
+        counts["cached_tokens"] += cached
+        counts["saved_usd"] += _saving(provider, model, cached)
+    return cached
+
+
+def prompt_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per task: calls, cache hit rate, cached share of input tokens and estimated USD saved."""
+    with _stats_lock:
+        report = {}
+        for task, counts in _stats.items():
+            report[task] = {
+                **counts,
+                "saved_usd": round(counts["saved_usd"], 6),
+                "hit_rate": round(counts["hits"] / counts["calls"], 4) if counts["calls"] else 0.0,
+                "cached_share": (
+                    round(counts["cached_tokens"] / counts["input_tokens"], 4) if counts["input_tokens"] else 0.0
+                ),
+            }
+        return report
+
+
+def reset_prompt_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
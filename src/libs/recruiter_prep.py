@@ -1,60 +1,117 @@
-import json
-from typing import Dict, Any, List
-from src.libs.llm_manager import AIAdapter
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel
+from src.libs.model_router import BRIEFING
+from src.libs.prompt_cache import CACHE_BREAKPOINT
+from src.libs.resume_snapshot import resume_snapshot
+from src.libs.structured_output import StructuredOutput
 from src.logging import logger
 
+if TYPE_CHECKING:
+    from src.libs.llm_manager import AIAdapter
+
+
+class RecruiterBriefing(BaseModel):
+    company_mission: str = ""
+    elevator_pitch: str
+    interview_questions: List[str] = []
+    potential_weakness_counter: str = ""
+    recent_industry_context: str = ""
+
+
 class RecruiterPrepEngine:
-    def __init__(self, ai_adapter: AIAdapter):
+    def __init__(self, ai_adapter: "AIAdapter"):
         self.ai_adapter = ai_adapter
+        self.structured = StructuredOutput(RecruiterBriefing, BRIEFING)
 
     def generate_briefing(self, company_name: str, job_role: str, resume_yaml_path: str) -> Dict[str, Any]:
         """
         Generates a 'cheat sheet' for the candidate to use when speaking with a recruiter.
         """
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
+            return {}
+
         try:
-            with open(resume_yaml_path, 'r') as f:
-                resume_content = f.read()
+            logger.info(f"Generating briefing card for {company_name}...")
+            briefing = self.structured.invoke(self.ai_adapter, self._build_prompt(company_name, job_role, resume_content))
+            return briefing.model_dump()
         except Exception as e:
-            logger.error(f"Failed to read resume at {resume_yaml_path}: {e}")
+            logger.error(f"Error generating recruiter briefing: {e}")
+            return self._fallback_briefing(job_role)
+
+    async def agenerate_briefing(self, company_name: str, job_role: str, resume_yaml_path: str) -> Dict[str, Any]:
+        """Async variant of ``generate_briefing``."""
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
             return {}
 
-        prompt = f"""
-        You are an expert Interview Coach. A candidate is about to speak with a recruiter from '{company_name}' for the position of '{job_role}'.
-        
-        CANDIDATE RESUME:
-        {resume_content}
+        try:
+            logger.info(f"Generating briefing card for {company_name}...")
+            briefing = await self.structured.ainvoke(self.ai_adapter, self._build_prompt(company_name, job_role, resume_content))
+            return briefing.model_dump()
+        except Exception as e:
+            logger.error(f"Error generating recruiter briefing: {e}")
+            return self._fallback_briefing(job_role)
+
+    async def astream_briefing(
+        self, company_name: str, job_role: str, resume_yaml_path: str
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Streaming variant: ``("partial", fields so far)`` events, then ``("result", briefing)``."""
+        resume_content = self._read_resume(resume_yaml_path)
+        if resume_content is None:
+            yield "result", {}
+            return
+
+        try:
+            logger.info(f"Streaming briefing card for {company_name}...")
+            prompt = self._build_prompt(company_name, job_role, resume_content)
+            async for event, value in self.structured.astream(self.ai_adapter, prompt):
+                yield event, value.model_dump() if event == "result" else value
+        except Exception as e:
+            logger.error(f"Error generating recruiter briefing: {e}")
+            yield "result", self._fallback_briefing(job_role)
+
+    @staticmethod
+    def _read_resume(resume_yaml_path: str) -> Optional[str]:
+        try:
+            return resume_snapshot(resume_yaml_path).text
+        except Exception as e:
+            logger.error(f"Failed to read resume at {resume_yaml_path}: {e}")
+            return None
+
+    @staticmethod
+    def _build_prompt(company_name: str, job_role: str, resume_content: str) -> str:
+        # Instructions and resume first: the prefix is the same for every company
+        return f"""
+        You are an expert Interview Coach. The candidate below is about to speak with a recruiter
+        about the company and position named at the end.
 
         Generate a 'Recruiter Briefing Card' in JSON format with:
-        - company_mission: A 1-sentence probable mission/value proposition for {company_name}.
+        - company_mission: A 1-sentence probable mission/value proposition for the company.
         - elevator_pitch: A 30-second 'Why me?' pitch tailored to this company and role.
         - interview_questions: 3 high-impact questions the candidate should ask the recruiter.
         - potential_weakness_counter: 1 potential weakness in the resume for this role and how to address it positively.
-        - recent_industry_context: 1-2 sentences of general industry context/trends relevant to {company_name}.
+        - recent_industry_context: 1-2 sentences of general industry context/trends relevant to the company.
 
         Return ONLY the JSON.
+
+        CANDIDATE RESUME:
+        {resume_content}
+{CACHE_BREAKPOINT}
+        COMPANY: {company_name}
+        POSITION: {job_role}
         """
-        
-        try:
-            logger.info(f"Generating briefing card for {company_name}...")
-            response = self.ai_adapter.invoke(prompt)
-            content = getattr(response, 'content', str(response))
-            
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-                
-            return json.loads(content)
-        except Exception as e:
-            logger.error(f"Error generating recruiter briefing: {e}")
-            return {
-                "company_mission": f"A major player in its industry.",
-                "elevator_pitch": f"I'm a strong candidate for {job_role} with relevant experience.",
-                "interview_questions": [
-                    "What does success look like in this role?",
-                    "How does the team handle collaboration?",
-                    "What are the immediate priorities for this position?"
-                ],
-                "potential_weakness_counter": "Focus on your strengths and ability to learn quickly.",
-                "recent_industry_context": "The industry is evolving rapidly with a focus on automation and efficiency."
-            }
+
+    @staticmethod
+    def _fallback_briefing(job_role: str) -> Dict[str, Any]:
+        return {
+            "company_mission": f"A major player in its industry.",
+            "elevator_pitch": f"I'm a strong candidate for {job_role} with relevant experience.",
+            "interview_questions": [
+                "What does success look like in this role?",
+                "How does the team handle collaboration?",
+                "What are the immediate priorities for this position?"
+            ],
+            "potential_weakness_counter": "Focus on your strengths and ability to learn quickly.",
+            "recent_industry_context": "The industry is evolving rapidly with a focus on automation and efficiency."
+        }
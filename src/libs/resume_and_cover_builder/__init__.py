@@ -1,6 +1,21 @@
 __version__ = '0.2.1'
 
-# Import all the necessary classes and functions, called when the package is imported
-from .resume_generator import ResumeGenerator
-from .style_manager import StyleManager
-from .resume_facade import ResumeFacade
\ No newline at end of file
+# The public classes are imported on first access (PEP 562), so importing the
+# package does not load langchain, selenium or inquirer
+_EXPORTS = {
+    "ResumeGenerator": ".resume_generator",
+    "StyleManager": ".style_manager",
+    "ResumeFacade": ".resume_facade",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
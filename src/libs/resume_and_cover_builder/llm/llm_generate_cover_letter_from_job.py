@@ -2,32 +2,28 @@
 This creates the cover letter (in html, utils will then convert in PDF) matching with job description and plain-text resume
 """
 # app/libs/resume_and_cover_builder/llm_generate_cover_letter_from_job.py
-import os
 import textwrap
-from ..utils import LoggerChatModel
+from ..utils import LoggerChatModel, create_embeddings_from_config
+from src.libs.job_summarizer import JobSummarizer
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from pathlib import Path
+from src.libs.model_router import COVER_LETTER_GENERATION, JOB_SUMMARY
 from dotenv import load_dotenv
 from requests.exceptions import HTTPError as HTTPStatusError
-from pathlib import Path
 from loguru import logger
+from src.logging import add_log_file
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Configure log file
-log_folder = 'log/cover_letter/gpt_cover_letter_job_descr'
-if not os.path.exists(log_folder):
-    os.makedirs(log_folder)
-log_path = Path(log_folder).resolve()
-logger.add(log_path / "gpt_cover_letter_job_descr.log", rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+# Log file, added on first use rather than at import
+LOG_FILE = "log/cover_letter/gpt_cover_letter_job_descr/gpt_cover_letter_job_descr.log"
 
 class LLMCoverLetterJobDescription:
     def __init__(self, openai_api_key, strings):
-        self.llm_cheap = LoggerChatModel(ChatOpenAI(model_name="gpt-4o-mini", openai_api_key=openai_api_key, temperature=0.4))
-        self.llm_embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
+        # Load environment variables from .env file
+        load_dotenv()
+        add_log_file(LOG_FILE, rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+        self.llm_cheap = LoggerChatModel.for_task(openai_api_key, COVER_LETTER_GENERATION)
+        self.llm_summary = LoggerChatModel.for_task(openai_api_key, JOB_SUMMARY)
+        self.llm_embeddings = create_embeddings_from_config(openai_api_key)
         self.strings = strings
 
     @staticmethod
@@ -56,10 +52,8 @@ class LLMCoverLetterJobDescription:
             job_description_text (str): The plain text job description to be used.
         """
         logger.debug("Starting job description summarization...")
-        prompt = ChatPromptTemplate.from_template(self.strings.summarize_prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"text": job_description_text})
-        self.job_description = output
+        summarizer = JobSummarizer(self.llm_summary, self.strings.summarize_prompt_template)
+        self.job_description = summarizer.summarize(job_description_text)
         logger.debug(f"Job description summarization complete: {self.job_description}")
 
     def generate_cover_letter(self) -> str:
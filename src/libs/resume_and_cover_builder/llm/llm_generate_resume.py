@@ -2,34 +2,25 @@
 Create a class that generates a resume based on a resume and a resume template.
 """
 # app/libs/resume_and_cover_builder/gpt_resume.py
-import os
 import textwrap
 from src.libs.resume_and_cover_builder.utils import LoggerChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+from src.libs.model_router import RESUME_GENERATION
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from loguru import logger
-from pathlib import Path
+from src.logging import add_log_file
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Configure log file
-log_folder = 'log/resume/gpt_resume'
-if not os.path.exists(log_folder):
-    os.makedirs(log_folder)
-log_path = Path(log_folder).resolve()
-logger.add(log_path / "gpt_resume.log", rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+# Log file, added on first use rather than at import
+LOG_FILE = "log/resume/gpt_resume/gpt_resume.log"
 
 class LLMResumer:
     def __init__(self, openai_api_key, strings):
-        self.llm_cheap = LoggerChatModel(
-            ChatOpenAI(
-                model_name="gpt-4o-mini", openai_api_key=openai_api_key, temperature=0.4
-            )
-        )
+        # Load environment variables from .env file
+        load_dotenv()
+        add_log_file(LOG_FILE, rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+        self.llm_cheap = LoggerChatModel.for_task(openai_api_key, RESUME_GENERATION)
         self.strings = strings
 
     @staticmethod
@@ -2,28 +2,22 @@
 Create a class that generates a job description based on a resume and a job description template.
 """
 # app/libs/resume_and_cover_builder/llm_generate_resume_from_job.py
-import os
 from src.libs.resume_and_cover_builder.llm.llm_generate_resume import LLMResumer
 from src.libs.resume_and_cover_builder.utils import LoggerChatModel
+from src.libs.job_summarizer import JobSummarizer
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
-from loguru import logger
-from pathlib import Path
+from src.libs.model_router import JOB_SUMMARY
+from src.logging import add_log_file
 
-# Load environment variables from .env file
-load_dotenv()
-
-log_folder = 'log/resume/gpt_resum_job_descr'
-if not os.path.exists(log_folder):
-    os.makedirs(log_folder)
-log_path = Path(log_folder).resolve()
-logger.add(log_path / "gpt_resum_job_descr.log", rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+# Log file, added on first use rather than at import
+LOG_FILE = "log/resume/gpt_resum_job_descr/gpt_resum_job_descr.log"
 
 class LLMResumeJobDescription(LLMResumer):
     def __init__(self, openai_api_key, strings):
         super().__init__(openai_api_key, strings)
+        add_log_file(LOG_FILE, rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+        self.llm_summary = LoggerChatModel.for_task(openai_api_key, JOB_SUMMARY)
 
     def set_job_description_from_text(self, job_description_text) -> None:
         """
@@ -31,10 +25,9 @@ class LLMResumeJobDescription(LLMResumer):
         Args:
             job_description_text (str): The plain text job description to be used.
         """
-        prompt = ChatPromptTemplate.from_template(self.strings.summarize_prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"text": job_description_text})
-        self.job_description = output
+        # Shared with LLMCoverLetterJobDescription through the job summary cache
+        summarizer = JobSummarizer(self.llm_summary, self.strings.summarize_prompt_template)
+        self.job_description = summarizer.summarize(job_description_text)
     
     def generate_header(self) -> str:
         """
@@ -3,43 +3,29 @@ import tempfile
 import textwrap
 import time
 import re  # For email validation
-from src.libs.resume_and_cover_builder.utils import LoggerChatModel
+from src.libs.resume_and_cover_builder.utils import LoggerChatModel, create_embeddings_from_config
+from src.libs.model_router import JOB_PARSING
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from loguru import logger
-from pathlib import Path
 from langchain_core.prompt_values import StringPromptValue
 from langchain_core.runnables import RunnablePassthrough
-from langchain_text_splitters import TokenTextSplitter
-from langchain_community.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-from lib_resume_builder_AIHawk.config import global_config
-from langchain_community.document_loaders import TextLoader
 from requests.exceptions import HTTPError as HTTPStatusError  # HTTP error handling
-import openai
+from src.logging import add_log_file
 
-# Load environment variables from the .env file
-load_dotenv()
-
-# Configure the log file
-log_folder = 'log/resume/gpt_resume'
-if not os.path.exists(log_folder):
-    os.makedirs(log_folder)
-log_path = Path(log_folder).resolve()
-logger.add(log_path / "gpt_resume.log", rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+# Log file, added on first use rather than at import
+LOG_FILE = "log/resume/gpt_resume/gpt_resume.log"
 
 
 class LLMParser:
     def __init__(self, openai_api_key):
-        self.llm = LoggerChatModel(
-            ChatOpenAI(
-                model_name="gpt-4o-mini", openai_api_key=openai_api_key, temperature=0.4
-            )
-        )
-        self.llm_embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)  # Initialize embeddings
+        # Load environment variables from the .env file
+        load_dotenv()
+        add_log_file(LOG_FILE, rotation="1 day", compression="zip", retention="7 days", level="DEBUG")
+        self.llm = LoggerChatModel.for_task(openai_api_key, JOB_PARSING)
+        self.llm_embeddings = create_embeddings_from_config(openai_api_key)  # Initialize embeddings
         self.vectorstore = None  # Will be initialized after document loading
 
     @staticmethod
@@ -60,6 +46,11 @@ class LLMParser:
             body_html (str): The HTML content to process.
         """
 
+        # Document loading, splitting and FAISS are only needed here
+        from langchain_community.document_loaders import TextLoader
+        from langchain_community.vectorstores import FAISS
+        from langchain_text_splitters import TokenTextSplitter
+
         # Save the HTML content to a temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as temp_file:
             temp_file.write(body_html)
@@ -3,28 +3,30 @@ This module contains utility functions for the Resume and Cover Letter Builder s
 """
 
 # app/libs/resume_and_cover_builder/utils.py
-import json
-import openai
-import time
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from langchain_core.messages.ai import AIMessage
 from langchain_core.prompt_values import StringPromptValue
 from .config import global_config
 from loguru import logger
-from requests.exceptions import HTTPError as HTTPStatusError
+from src.libs.llm_cache import render_prompt
+from src.libs.llm_call_log import estimate_cost, get_call_log_writer
+from src.libs.llm_rate_limiter import call_with_retry, estimate_tokens, get_rate_limiter
+from src.libs.model_router import DEFAULT_TIER, record_tier_usage, resolve_task_model
+from src.libs.prompt_cache import cached_input_tokens, prepare_prompt, record_prompt_cache
 
 
-def create_llm_from_config(api_key: str) -> Any:
+def create_llm_from_config(api_key: str, task: Optional[str] = None) -> Any:
     """
     Create a LangChain chat model based on the LLM_MODEL_TYPE and LLM_MODEL
     settings in config.py.  Supported types: openai, gemini, claude, ollama,
-    huggingface, perplexity.
+    huggingface, perplexity.  With ``task``, the model comes from the task's
+    tier in LLM_TASK_TIERS / LLM_MODEL_TIERS.
     """
     import config as cfg
 
-    llm_model_type = getattr(cfg, "LLM_MODEL_TYPE", "openai").lower()
-    llm_model = getattr(cfg, "LLM_MODEL", "gpt-4o-mini")
+    _tier, llm_model_type, llm_model = resolve_task_model(task)
+    llm_model_type = (llm_model_type or "openai").lower()
     llm_api_url = getattr(cfg, "LLM_API_URL", "")
 
     logger.debug(f"Creating LLM of type '{llm_model_type}' with model '{llm_model}'")
@@ -92,99 +94,70 @@ class LLMLogger:
         self.llm = llm
 
     @staticmethod
-    def log_request(prompts, parsed_reply: Dict[str, Dict]):
-        calls_log = global_config.LOG_OUTPUT_FILE_PATH / "open_ai_calls.json"
+    def log_request(prompts, parsed_reply: Dict[str, Dict], latency_seconds: Optional[float] = None):
         if isinstance(prompts, StringPromptValue):
             prompts = prompts.text
-        elif isinstance(prompts, Dict):
-            # Convert prompts to a dictionary if they are not in the expected format
-            prompts = {
-                f"prompt_{i+1}": prompt.content
-                for i, prompt in enumerate(prompts.messages)
-            }
-        else:
+        elif hasattr(prompts, "messages"):
             prompts = {
                 f"prompt_{i+1}": prompt.content
                 for i, prompt in enumerate(prompts.messages)
             }
 
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Extract token usage details from the response
+        # Extract token usage and model details from the response
         token_usage = parsed_reply["usage_metadata"]
         output_tokens = token_usage["output_tokens"]
         input_tokens = token_usage["input_tokens"]
-        total_tokens = token_usage["total_tokens"]
-
-        # Extract model details from the response
         model_name = parsed_reply["response_metadata"]["model_name"]
-        prompt_price_per_token = 0.00000015
-        completion_price_per_token = 0.0000006
 
-        # Calculate the total cost of the API call
-        total_cost = (input_tokens * prompt_price_per_token) + (
-            output_tokens * completion_price_per_token
-        )
-
-        # Create a log entry with all relevant information
-        log_entry = {
+        # Serialisation, file I/O and rotation happen on the call-log writer thread
+        get_call_log_writer(global_config.LOG_OUTPUT_FILE_PATH / "open_ai_calls.jsonl").write({
             "model": model_name,
-            "time": current_time,
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "prompts": prompts,
             "replies": parsed_reply["content"],  # Response content
-            "total_tokens": total_tokens,
+            "total_tokens": token_usage["total_tokens"],
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
-            "total_cost": total_cost,
-        }
-
-        # Write the log entry to the log file in JSON format
-        with open(calls_log, "a", encoding="utf-8") as f:
-            json_string = json.dumps(log_entry, ensure_ascii=False, indent=4)
-            f.write(json_string + "\n")
+            "cached_input_tokens": token_usage.get("cached_input_tokens", 0),
+            "total_cost": estimate_cost(model_name, input_tokens, output_tokens),
+            "latency_seconds": round(latency_seconds, 3) if latency_seconds is not None else None,
+        })
 
 
 class LoggerChatModel:
 
-    def __init__(self, llm: Any):
+    def __init__(self, llm: Any, tier: str = DEFAULT_TIER, task: Optional[str] = None, provider: str = ""):
         self.llm = llm
+        self.tier = tier
+        self.task = task
+        self.provider = provider
+
+    @classmethod
+    def for_task(cls, api_key: str, task: str) -> "LoggerChatModel":
+        """Chat model for ``task``, routed to its configured tier."""
+        tier, provider, _model = resolve_task_model(task)
+        return cls(create_llm_from_config(api_key, task), tier=tier, task=task, provider=(provider or "").lower())
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
-        max_retries = 15
-        retry_delay = 10
-
-        for attempt in range(max_retries):
-            try:
-                reply = self.llm.invoke(messages)
-                parsed_reply = self.parse_llmresult(reply)
-                LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
-                return reply
-            except openai.RateLimitError as err:
-                wait_time = self.parse_wait_time_from_error_message(str(err))
-                logger.warning(f"OpenAI rate limit exceeded. Waiting {wait_time}s before retrying (Attempt {attempt + 1}/{max_retries})...")
-                time.sleep(wait_time)
-            except HTTPStatusError as err:
-                if err.response.status_code == 429:
-                    logger.warning(f"HTTP 429 Too Many Requests: Waiting for {retry_delay} seconds before retrying (Attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    logger.error(f"HTTP error {err.response.status_code}: {err}")
-                    raise
-            except Exception as e:
-                # Catch Gemini / Anthropic / HuggingFace rate-limit and transient errors
-                err_str = str(e)
-                if "429" in err_str or "quota" in err_str.lower() or "rate" in err_str.lower() or "resource exhausted" in err_str.lower():
-                    logger.warning(f"Rate limit / quota error from LLM. Waiting {retry_delay}s before retrying (Attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    logger.error(f"Unexpected error occurred: {err_str}, retrying in {retry_delay} seconds... (Attempt {attempt + 1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-
-        logger.critical("Failed to get a response from the model after multiple attempts.")
-        raise Exception("Failed to get a response from the model after multiple attempts.")
+        import config as cfg
+
+        # Same provider buckets, backoff, deadline and circuit breaker as AIAdapter
+        limiter = get_rate_limiter(getattr(cfg, "LLM_MODEL_TYPE", "openai").lower())
+        prepared = prepare_prompt(messages, cache_control=self.provider == "claude")
+        reply, report = call_with_retry(
+            lambda: self.llm.invoke(prepared),
+            limiter,
+            estimated_tokens=estimate_tokens(render_prompt(messages)),
+        )
+        if report.queue_wait_seconds:
+            logger.debug(f"LLM call waited {report.queue_wait_seconds:.2f}s in the rate-limit queue")
+        parsed_reply = self.parse_llmresult(reply)
+        LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply, latency_seconds=report.elapsed_seconds)
+        record_tier_usage(
+            self.tier, parsed_reply["response_metadata"]["model_name"], report.elapsed_seconds, reply
+        )
+        record_prompt_cache(self.task, self.provider, parsed_reply["response_metadata"]["model_name"], reply)
+        return reply
 
     def parse_llmresult(self, llmresult: AIMessage) -> Dict[str, Dict]:
         # Parse the LLM result into a structured format.
@@ -206,6 +179,7 @@ class LoggerChatModel:
                 "input_tokens": usage_metadata.get("input_tokens", 0),
                 "output_tokens": usage_metadata.get("output_tokens", 0),
                 "total_tokens": usage_metadata.get("total_tokens", 0),
+                "cached_input_tokens": cached_input_tokens(llmresult),
             },
         }
         return parsed_result
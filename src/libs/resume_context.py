@@ -0,0 +1,347 @@
+"""
+resume_context.py
+=================
+Relevance-trimmed resume context for LLM prompts.
+
+``ResumeContext`` serialises a resume (the ``Resume`` model, a
+``JobApplicationProfile``, a dict, or the raw YAML text) once into a compact
+canonical form: no YAML comments, no ``None`` fields, one line per fact. Each
+line is a chunk in a local BM25 index.
+
+  context = ResumeContext.from_resume(resume)
+  context.select(question, task=OPTIONS_MATCHING)  ->  text for the prompt
+
+``select`` keeps the chunks that match the question or job description best,
+within the token budget for the task (``RESUME_CONTEXT_TOKEN_BUDGETS``, else
+``RESUME_CONTEXT_DEFAULT_TOKENS``), and renders them in resume order. The
+heading of every list entry (position, company and period of each job, each
+degree, ...) is always kept so the model still sees the whole timeline. When
+nothing in the resume matches, the budget is filled in resume order instead.
+
+Tasks in ``RESUME_CONTEXT_STABLE_TASKS`` repeat the resume for every job in a
+batch, so they get the same query-independent text each time: a prefix the
+provider's prompt cache can reuse (see prompt_cache.py). When the resume
+does not fit, summary, skill and certification lines are kept first and the
+rest ranked by how much they mention those skills, not cut by position.
+
+Tokens sent versus the previous full-object prompt are counted per task; see
+``context_stats()``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+from src.libs.llm_rate_limiter import estimate_tokens
+from src.logging import logger
+
+
+DEFAULT_TOKEN_BUDGET = 800
+
+# Fields that identify a list entry; the first ones present form its heading
+HEADING_FIELDS = (
+    "position", "company", "employment_period",
+    "education_level", "field_of_study", "institution", "year_of_completion",
+    "name", "language", "proficiency",
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how i in is it of on or our the this "
+    "to was what when where which who will with would you your".split()
+)
+
+# Sections and fields kept first in the query-independent context of stable tasks
+CORE_MARKERS = ("summary", "objective", "skill", "certification")
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+@dataclasses.dataclass
+class Chunk:
+    section: str
+    entry: Optional[int]      # index of the list entry, None for section-level facts
+    text: str
+    heading: bool = False
+    tokens: int = 0
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents: Iterable[str]):
+        self.docs = [Counter(tokenize(doc)) for doc in documents]
+        self.lengths = [sum(doc.values()) for doc in self.docs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        frequencies: Counter = Counter()
+        for doc in self.docs:
+            frequencies.update(doc.keys())
+        n = len(self.docs)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in frequencies.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        results = []
+        for doc, length in zip(self.docs, self.lengths):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_length) if self.avg_length else BM25_K1
+            score = 0.0
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Canonical serialisation
+# ---------------------------------------------------------------------------
+
+def _plain(obj: Any) -> Any:
+    """Resume objects -> dicts/lists/scalars, dropping empty values."""
+    if hasattr(obj, "model_dump"):
+        obj = obj.model_dump(exclude_none=True)
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        obj = dataclasses.asdict(obj)
+    if isinstance(obj, dict):
+        plain = {str(k): _plain(v) for k, v in obj.items()}
+        return {k: v for k, v in plain.items() if v not in (None, "", [], {})}
+    if isinstance(obj, (list, tuple)):
+        return [v for v in (_plain(v) for v in obj) if v not in (None, "", [], {})]
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return str(obj)
+
+
+def _inline(value: Any) -> str:
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {_inline(v)}" for k, v in value.items())
+    if isinstance(value, list):
+        return ", ".join(_inline(v) for v in value)
+    return str(value)
+
+
+def _entry_chunks(section: str, index: int, entry: Any) -> List[Chunk]:
+    if not isinstance(entry, dict):
+        return [Chunk(section, None, _inline(entry))]
+    heading_parts = [str(entry[f]) for f in HEADING_FIELDS if f in entry and not isinstance(entry[f], (dict, list))]
+    if not heading_parts:
+        first = next(iter(entry))
+        heading_parts = [_inline(entry[first])]
+        rest = {k: v for k, v in entry.items() if k != first}
+    else:
+        rest = {k: v for k, v in entry.items() if k not in HEADING_FIELDS}
+    chunks = [Chunk(section, index, " | ".join(heading_parts), heading=True)]
+    for field, value in rest.items():
+        # Bullet lists (key_responsibilities, exam) become one chunk per bullet
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            chunks.extend(Chunk(section, index, _inline(list(v.values()))) for v in value)
+        else:
+            chunks.append(Chunk(section, index, f"{field}: {_inline(value)}"))
+    return chunks
+
+
+def canonical_chunks(data: Any) -> List[Chunk]:
+    chunks: List[Chunk] = []
+    data = _plain(data)
+    if not isinstance(data, dict):
+        return [Chunk("resume", None, _inline(data))] if data else []
+    for section, value in data.items():
+        if isinstance(value, list):
+            for index, entry in enumerate(value):
+                if isinstance(entry, dict):
+                    chunks.extend(_entry_chunks(section, index, entry))
+                else:
+                    chunks.append(Chunk(section, None, _inline(entry)))
+        elif isinstance(value, dict):
+            chunks.extend(Chunk(section, None, f"{field}: {_inline(v)}") for field, v in value.items())
+        else:
+            chunks.append(Chunk(section, None, str(value)))
+    for chunk in chunks:
+        chunk.tokens = estimate_tokens(chunk.text) + 1
+    return chunks
+
+
+def render(chunks: Iterable[Chunk]) -> str:
+    lines: List[str] = []
+    section = None
+    for chunk in chunks:
+        if chunk.section != section:
+            section = chunk.section
+            lines.append(f"## {section}")
+        if chunk.heading:
+            lines.append(f"- {chunk.text}")
+        elif chunk.entry is not None:
+            lines.append(f"  * {chunk.text}")
+        else:
+            lines.append(f"- {chunk.text}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Context selection
+# ---------------------------------------------------------------------------
+
+class ResumeContext:
+    """Compact resume text plus a BM25 index over its lines."""
+
+    def __init__(self, data: Any, baseline_tokens: Optional[int] = None):
+        self.chunks = canonical_chunks(data)
+        self.text = render(self.chunks)
+        self.tokens = estimate_tokens(self.text) if self.chunks else 0
+        # What the prompt carried before: the object's str() or the raw YAML
+        self.baseline_tokens = baseline_tokens if baseline_tokens is not None else estimate_tokens(str(data))
+        # Section names only help for section-level facts ("interests: Chess"); on
+        # entry lines they would make every job match "experience"
+        self.index = BM25Index(
+            c.text.replace("_", " ") if c.entry is not None else f"{c.section.replace('_', ' ')} {c.text.replace('_', ' ')}"
+            for c in self.chunks
+        )
+
+    @classmethod
+    def from_resume(cls, resume: Any) -> "ResumeContext":
+        return cls(resume)
+
+    @classmethod
+    def from_yaml(cls, yaml_text: str) -> "ResumeContext":
+        try:
+            data = yaml.safe_load(yaml_text) or {}
+        except yaml.YAMLError as e:
+            logger.warning(f"Resume YAML could not be parsed for context selection: {e}")
+            data = yaml_text
+        return cls(data, baseline_tokens=estimate_tokens(yaml_text))
+
+    def select(self, query: str, task: str = "", budget_tokens: Optional[int] = None) -> str:
+        """The most relevant lines for ``query`` within the task's token budget."""
+        budget = budget_tokens if budget_tokens is not None else token_budget(task)
+        if self.tokens <= budget:
+            text = self.text
+        elif task in stable_tasks():
+            text = render(self._stable_pick(budget))
+        else:
+            text = render(self._pick(query, budget))
+        _record(task or "default", self.baseline_tokens, estimate_tokens(text))
+        return text
+
+    def _stable_pick(self, budget: int) -> List[Chunk]:
+        """Query-independent selection: core lines first, then the lines that use the core skills."""
+        core = [i for i, chunk in enumerate(self.chunks) if not chunk.heading and _is_core(chunk)]
+        return self._pick(" ".join(self.chunks[i].text for i in core), budget, first=core)
+
+    def _pick(self, query: str, budget: int, first: Iterable[int] = ()) -> List[Chunk]:
+        scores = self.index.scores(query)
+        chosen = set()
+        used = 0
+        for i, chunk in enumerate(self.chunks):
+            if chunk.heading:
+                chosen.add(i)
+                used += chunk.tokens
+        for i in first:
+            if used + self.chunks[i].tokens <= budget:
+                chosen.add(i)
+                used += self.chunks[i].tokens
+        ranked = sorted(
+            (i for i, s in enumerate(scores) if s > 0 and i not in chosen),
+            key=lambda i: (-scores[i], i),
+        )
+        if not ranked:
+            # Nothing matches: keep the resume's own order
+            ranked = [i for i in range(len(self.chunks)) if i not in chosen]
+        for i in ranked:
+            cost = self.chunks[i].tokens
+            if used + cost > budget:
+                continue
+            chosen.add(i)
+            used += cost
+        return [self.chunks[i] for i in sorted(chosen)]
+
+
+def _is_core(chunk: Chunk) -> bool:
+    field = chunk.text.split(":", 1)[0] if ":" in chunk.text else ""
+    return any(marker in chunk.section.lower() or marker in field.lower() for marker in CORE_MARKERS)
+
+
+def token_budget(task: str) -> int:
+    import config as cfg
+
+    budgets = getattr(cfg, "RESUME_CONTEXT_TOKEN_BUDGETS", {}) or {}
+    return int(budgets.get(task, getattr(cfg, "RESUME_CONTEXT_DEFAULT_TOKENS", DEFAULT_TOKEN_BUDGET)))
+
+
+def stable_tasks() -> List[str]:
+    import config as cfg
+
+    return list(getattr(cfg, "RESUME_CONTEXT_STABLE_TASKS", ()) or ())
+
+
+def context_enabled() -> bool:
+    import config as cfg
+
+    return bool(getattr(cfg, "RESUME_CONTEXT_ENABLED", True))
+
+
+# ---------------------------------------------------------------------------
+# Per-task token savings
+# ---------------------------------------------------------------------------
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(task: str, baseline_tokens: int, context_tokens: int) -> None:
+    with _stats_lock:
+        counts = _stats.setdefault(task, {"calls": 0, "baseline_tokens": 0, "context_tokens": 0})
+        counts["calls"] += 1
+        counts["baseline_tokens"] += baseline_tokens
+        counts["context_tokens"] += context_tokens
+
+
+def context_stats() -> Dict[str, Dict[str, Any]]:
+    """Per task: calls, resume tokens before and after trimming, and the share saved."""
+    with _stats_lock:
+        report = {}
+        for task, counts in _stats.items():
+            saved = counts["baseline_tokens"] - counts["context_tokens"]
+            report[task] = {
+                **counts,
+                "saved_tokens": saved,
+                "saved_rate": round(saved / counts["baseline_tokens"], 4) if counts["baseline_tokens"] else 0.0,
+            }
+        return report
+
+
+def reset_context_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+_yaml_contexts: Dict[int, ResumeContext] = {}
+_yaml_contexts_lock = threading.Lock()
+
+
+def context_for_yaml(yaml_text: str) -> ResumeContext:
+    """``ResumeContext.from_yaml`` memoised on the text, for callers that re-read the file."""
+    key = hash(yaml_text)
+    with _yaml_contexts_lock:
+        context = _yaml_contexts.get(key)
+    if context is None:
+        context = ResumeContext.from_yaml(yaml_text)
+        with _yaml_contexts_lock:
+            if len(_yaml_contexts) >= 8:
+                _yaml_contexts.clear()
+            _yaml_contexts[key] = context
+    return context
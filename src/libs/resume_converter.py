@@ -161,14 +161,18 @@ def save_resume(file_bytes: bytes, filename: str, dest_path: Path) -> Dict[str,
 def resume_to_text(resume_yaml_path: Path) -> str:
     """
     Load a resume YAML (possibly from a converted non-YAML source) and return
-    a single string LLMs can read.
+    a single string LLMs can read. Served from the shared resume snapshot.
     """
+    from src.libs.resume_snapshot import resume_snapshot
+
     try:
-        with open(resume_yaml_path, "r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh) or {}
+        return resume_snapshot(resume_yaml_path).flat_text
     except Exception:
         return ""
 
+
+def flatten_resume(data: Dict[str, Any]) -> str:
+    """``resume_to_text`` for an already parsed resume dict."""
     if data.get("_converted"):
         return data.get("raw_text", "")
 
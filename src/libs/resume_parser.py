@@ -3,9 +3,13 @@ resume_parser.py
 Extracts structured targeting data from plain_text_resume.yaml.
 Handles both structured YAML resumes and converted documents (PDF/DOCX/TXT).
 Used to drive bot search terms and ATS domain alignment.
+
+The path-based helpers read through the shared resume snapshot
+(``resume_snapshot.py``), so the file is parsed once until it changes; the
+``*_from_resume`` functions work on an already parsed dict.
 """
+import copy
 import re
-import yaml
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -27,15 +31,21 @@ def _real(value: str) -> bool:
     return bool(value and not str(value).strip().startswith(_PLACEHOLDER_PREFIX))
 
 
-def load_resume(resume_path: Path) -> Dict[str, Any]:
-    """Load resume YAML and return as dict (empty dict on any error)."""
+def _snapshot_data(resume_path: Path) -> Dict[str, Any]:
+    """The shared parsed resume (read-only; empty dict on any error)."""
+    from src.libs.resume_snapshot import resume_snapshot
+
     try:
-        with open(resume_path, "r", encoding="utf-8") as fh:
-            return yaml.safe_load(fh) or {}
+        return resume_snapshot(resume_path).data
     except Exception:
         return {}
 
 
+def load_resume(resume_path: Path) -> Dict[str, Any]:
+    """Load resume YAML and return as dict (empty dict on any error)."""
+    return copy.deepcopy(_snapshot_data(resume_path))
+
+
 # ---------------------------------------------------------------------------
 # Raw-text helpers (for converted PDF/DOCX/TXT resumes)
 # ---------------------------------------------------------------------------
@@ -120,8 +130,33 @@ def _extract_name_from_text(text: str) -> str:
 # ---------------------------------------------------------------------------
 
 def extract_positions(resume_path: Path) -> List[str]:
-    resume = load_resume(resume_path)
+    from src.libs.resume_snapshot import resume_snapshot
+
+    try:
+        return list(resume_snapshot(resume_path).positions)
+    except Exception:
+        return []
+
+
+def extract_skills(resume_path: Path) -> List[str]:
+    from src.libs.resume_snapshot import resume_snapshot
 
+    try:
+        return list(resume_snapshot(resume_path).skills)
+    except Exception:
+        return []
+
+
+def extract_industries(resume_path: Path) -> List[str]:
+    from src.libs.resume_snapshot import resume_snapshot
+
+    try:
+        return list(resume_snapshot(resume_path).industries)
+    except Exception:
+        return []
+
+
+def positions_from_resume(resume: Dict[str, Any]) -> List[str]:
     if resume.get("_converted"):
         return _extract_positions_from_text(resume.get("raw_text", ""))
 
@@ -144,9 +179,7 @@ def extract_positions(resume_path: Path) -> List[str]:
     return positions
 
 
-def extract_skills(resume_path: Path) -> List[str]:
-    resume = load_resume(resume_path)
-
+def skills_from_resume(resume: Dict[str, Any]) -> List[str]:
     if resume.get("_converted"):
         return _extract_skills_from_text(resume.get("raw_text", ""))
 
@@ -161,8 +194,7 @@ def extract_skills(resume_path: Path) -> List[str]:
     return skills
 
 
-def extract_industries(resume_path: Path) -> List[str]:
-    resume = load_resume(resume_path)
+def industries_from_resume(resume: Dict[str, Any]) -> List[str]:
     if resume.get("_converted"):
         return []   # too unreliable from raw text
 
@@ -181,7 +213,7 @@ def extract_summary(resume_path: Path) -> Dict[str, Any]:
     Return a lightweight summary dict for the web UI.
     Works for both structured YAML and converted (PDF/DOCX/TXT) resumes.
     """
-    resume = load_resume(resume_path)
+    resume = _snapshot_data(resume_path)
 
     if resume.get("_converted"):
         raw = resume.get("raw_text", "")
@@ -203,9 +235,9 @@ def extract_summary(resume_path: Path) -> Dict[str, Any]:
     last = str(pi.get("surname", "")).strip()
     name = " ".join(p for p in [first, last] if _real(p)) or "Unknown"
 
-    positions = extract_positions(resume_path)
-    skills = extract_skills(resume_path)
-    industries = extract_industries(resume_path)
+    positions = positions_from_resume(resume)
+    skills = skills_from_resume(resume)
+    industries = industries_from_resume(resume)
 
     exp_count = sum(
         1
@@ -0,0 +1,131 @@
+"""
+resume_snapshot.py
+==================
+One parsed copy of each resume file, shared by every consumer.
+
+``ATSScorer``, ``ResumeTailor``, ``RecruiterPrepEngine``, the web server and
+the ``resume_parser`` helpers each used to open and parse the resume again,
+so a 100-job batch parsed it hundreds of times. They now ask for a snapshot:
+
+  resume_snapshot(path) -> ResumeSnapshot   # raises OSError like open()
+
+A snapshot holds the raw text, the parsed dict, the flattened LLM text
+(``resume_to_text``), positions, skills, industries and token estimates. It
+is keyed by the resolved path and revalidated with one ``stat`` per call:
+while the file's mtime and size are unchanged the cached snapshot is returned.
+When they change the file is read again, and it is only re-parsed if the
+content hash differs as well. Loads, hits and re-reads are counted; see
+``snapshot_stats()``.
+
+Snapshots are shared: treat ``data`` and the lists as read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+from src.libs.llm_rate_limiter import estimate_tokens
+from src.libs.resume_converter import flatten_resume
+from src.libs.resume_parser import industries_from_resume, positions_from_resume, skills_from_resume
+from src.logging import logger
+
+
+@dataclass(frozen=True)
+class ResumeSnapshot:
+    path: str
+    content_hash: str
+    text: str                   # the file as written
+    data: Dict[str, Any]        # parsed YAML ({} when it does not parse to a mapping)
+    flat_text: str              # readable text for LLM prompts
+    positions: List[str]
+    skills: List[str]
+    industries: List[str]
+    tokens: int                 # estimated tokens of ``text``
+    flat_tokens: int            # estimated tokens of ``flat_text``
+
+    @classmethod
+    def from_text(cls, path: str, text: str) -> "ResumeSnapshot":
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            logger.warning(f"Resume at {path} is not valid YAML: {e}")
+            data = None
+        if not isinstance(data, dict):
+            data = {}
+        flat_text = flatten_resume(data)
+        return cls(
+            path=path,
+            content_hash=_content_hash(text),
+            text=text,
+            data=data,
+            flat_text=flat_text,
+            positions=positions_from_resume(data),
+            skills=skills_from_resume(data),
+            industries=industries_from_resume(data),
+            tokens=estimate_tokens(text),
+            flat_tokens=estimate_tokens(flat_text),
+        )
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# path -> ((mtime_ns, size), snapshot)
+_snapshots: Dict[str, Tuple[Tuple[int, int], ResumeSnapshot]] = {}
+_stats = {"loads": 0, "hits": 0, "rereads": 0}
+_stats_lock = threading.Lock()
+
+
+def resume_snapshot(resume_path: Any) -> ResumeSnapshot:
+    """The current snapshot of ``resume_path``, re-read only when the file changed."""
+    path = os.path.abspath(os.fspath(resume_path))
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _stats_lock:
+        cached = _snapshots.get(path)
+        if cached is not None and cached[0] == version:
+            _stats["hits"] += 1
+            return cached[1]
+
+    text = Path(path).read_text(encoding="utf-8")
+    if cached is not None and cached[1].content_hash == _content_hash(text):
+        # Touched or rewritten with the same content: keep the parse
+        snapshot = cached[1]
+        outcome = "rereads"
+    else:
+        snapshot = ResumeSnapshot.from_text(path, text)
+        outcome = "loads"
+        logger.debug(f"Parsed resume {path} ({snapshot.tokens} tokens)")
+    with _stats_lock:
+        _snapshots[path] = (version, snapshot)
+        _stats[outcome] += 1
+    return snapshot
+
+
+def invalidate_snapshots() -> None:
+    with _stats_lock:
+        _snapshots.clear()
+
+
+def snapshot_stats() -> Dict[str, Any]:
+    """Cached resumes, parses, cache hits and re-reads that found unchanged content."""
+    with _stats_lock:
+        lookups = sum(_stats.values())
+        return {
+            "resumes": sorted(_snapshots),
+            **_stats,
+            "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+def reset_snapshot_stats() -> None:
+    with _stats_lock:
+        _stats.update(loads=0, hits=0, rereads=0)
@@ -27,11 +27,16 @@ import textwrap
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import yaml
+from pydantic import BaseModel
 
+from src.libs.model_router import TAILORING
+from src.libs.prompt_cache import CACHE_BREAKPOINT
 from src.libs.resume_converter import resume_to_text
+from src.libs.resume_snapshot import resume_snapshot
+from src.libs.structured_output import StructuredOutput
 from src.logging import logger
 
 
@@ -73,6 +78,13 @@ class TailoredResume:
 # Tailoring engine
 # ---------------------------------------------------------------------------
 
+class TailoringResult(BaseModel):
+    """Schema of the LLM tailoring reply."""
+
+    tailored_resume: str
+    interview_highlights: List[str] = []
+
+
 class ResumeTailor:
     """
     Uses an LLM to produce a job-specific resume variant.
@@ -144,6 +156,38 @@ class ResumeTailor:
         self._save_metadata(tailored)
         logger.info(f"Temp resume discarded for job {tailored.job_id}")
 
+    async def astream_tailoring(
+        self,
+        base_resume_path: Path,
+        job_description: str,
+        ats_analysis: Dict[str, Any],
+        job_title: str,
+        company: str,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Preview of the tailored text as the LLM writes it: ``("partial", fields
+        so far)`` events, then ``("result", {"tailored_resume", "interview_highlights"})``.
+        Nothing is saved; ``tailor`` produces the files.
+        """
+        resume_text = resume_to_text(base_resume_path)
+        if self.ai_adapter:
+            structured = StructuredOutput(TailoringResult, TAILORING)
+            prompt = self._tailor_prompt(resume_text, job_description, ats_analysis, job_title, company)
+            try:
+                async for event, value in structured.astream(self.ai_adapter, prompt):
+                    if event == "result":
+                        value = value.model_dump()
+                        value["tailored_resume"] = value["tailored_resume"] or resume_text
+                    yield event, value
+                return
+            except Exception as exc:
+                logger.error(f"LLM tailoring failed: {exc}")
+        tailored_text, _highlights = self._rule_tailor(resume_text, ats_analysis)
+        yield "result", {
+            "tailored_resume": tailored_text,
+            "interview_highlights": list(ats_analysis.get("survival_tweaks", [])),
+        }
+
     def confirm(self, tailored: TailoredResume) -> Dict[str, Any]:
         """Mark as confirmed (pipeline). Returns delivery payload."""
         tailored.status = "confirmed"
@@ -163,27 +207,33 @@ class ResumeTailor:
         job_title: str,
         company: str,
     ):
+        prompt = self._tailor_prompt(resume_text, job_description, ats_analysis, job_title, company)
+        try:
+            result = StructuredOutput(TailoringResult, TAILORING).invoke(self.ai_adapter, prompt)
+            tailored_text = result.tailored_resume or resume_text
+            highlights = self._format_highlights(result.interview_highlights, job_title, company)
+            return tailored_text, highlights
+        except Exception as exc:
+            logger.error(f"LLM tailoring failed: {exc}")
+            return self._rule_tailor(resume_text, ats_analysis)
+
+    @staticmethod
+    def _tailor_prompt(
+        resume_text: str,
+        job_description: str,
+        ats_analysis: Dict[str, Any],
+        job_title: str,
+        company: str,
+    ) -> str:
         missing = ats_analysis.get("missing_keywords", [])
         tweaks = ats_analysis.get("survival_tweaks", [])
         strong = ats_analysis.get("strong_points", [])
 
-        prompt = f"""
+        # Instructions and resume lead so the prefix is shared by every job
+        return f"""
 You are an expert resume writer specialising in Supply Chain, Operations and Logistics management.
 
-TASK: Rewrite the candidate's resume to maximise ATS match for the target role below.
-
-TARGET ROLE: {job_title} at {company}
-
-JOB DESCRIPTION (excerpt):
-{job_description[:3000]}
-
-CURRENT RESUME:
-{resume_text}
-
-ATS ANALYSIS:
-- Missing keywords: {json.dumps(missing)}
-- Suggested tweaks: {json.dumps(tweaks)}
-- Strong points already present: {json.dumps(strong)}
+TASK: Rewrite the candidate's resume to maximise ATS match for the target role given after it.
 
 RULES:
 1. Keep ALL real experience, education and dates — do NOT invent facts.
@@ -196,22 +246,20 @@ RULES:
      talking point the candidate should prepare for this role/company.
 
 Return ONLY the JSON.
+
+CURRENT RESUME:
+{resume_text}
+{CACHE_BREAKPOINT}
+TARGET ROLE: {job_title} at {company}
+
+JOB DESCRIPTION (excerpt):
+{job_description[:3000]}
+
+ATS ANALYSIS:
+- Missing keywords: {json.dumps(missing)}
+- Suggested tweaks: {json.dumps(tweaks)}
+- Strong points already present: {json.dumps(strong)}
 """
-        try:
-            response = self.ai_adapter.invoke(prompt)
-            content = getattr(response, "content", str(response))
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            data = json.loads(content)
-            tailored_text = data.get("tailored_resume", resume_text)
-            highlights_list = data.get("interview_highlights", [])
-            highlights = self._format_highlights(highlights_list, job_title, company)
-            return tailored_text, highlights
-        except Exception as exc:
-            logger.error(f"LLM tailoring failed: {exc}")
-            return self._rule_tailor(resume_text, ats_analysis)
 
     # ------------------------------------------------------------------
     # Rule-based fallback
@@ -242,8 +290,7 @@ Return ONLY the JSON.
     ) -> None:
         """Store tailored content alongside original structured data."""
         try:
-            with open(base_path, "r", encoding="utf-8") as fh:
-                base_data = yaml.safe_load(fh) or {}
+            base_data = dict(resume_snapshot(base_path).data)
         except Exception:
             base_data = {}
 
@@ -0,0 +1,347 @@
+"""
+section_router.py
+=================
+Local classifier that routes a form question to one of the 13 resume /
+application-profile sections without an LLM round trip.
+
+Two signals are combined:
+
+* keyword/regex rules per section (``SECTION_RULES``), and
+* a NumPy TF-IDF nearest-centroid model trained on seed phrases
+  (``SECTION_SEEDS``) plus every question the LLM has routed before.
+
+``route()`` returns a ``RouteDecision`` with a confidence in ``[0, 1]``
+(margin between the best and runner-up section). ``GPTAnswerer`` only asks
+the LLM when the confidence is below ``SECTION_ROUTER_CONFIDENCE``; every
+decision is appended to ``SECTION_ROUTER_LOG_PATH`` and the LLM-labelled ones
+are read back as training data the next time the router is built.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.libs.llm_call_log import get_call_log_writer, iter_entries
+from src.logging import logger
+from src.utils.constants import (
+    AVAILABILITY,
+    CERTIFICATIONS,
+    COVER_LETTER,
+    EDUCATION_DETAILS,
+    EXPERIENCE_DETAILS,
+    INTERESTS,
+    LANGUAGES,
+    LEGAL_AUTHORIZATION,
+    PERSONAL_INFORMATION,
+    PROJECTS,
+    SALARY_EXPECTATIONS,
+    SELF_IDENTIFICATION,
+    WORK_PREFERENCES,
+)
+
+
+SECTIONS: List[str] = [
+    PERSONAL_INFORMATION,
+    SELF_IDENTIFICATION,
+    LEGAL_AUTHORIZATION,
+    WORK_PREFERENCES,
+    EDUCATION_DETAILS,
+    EXPERIENCE_DETAILS,
+    PROJECTS,
+    AVAILABILITY,
+    SALARY_EXPECTATIONS,
+    CERTIFICATIONS,
+    LANGUAGES,
+    INTERESTS,
+    COVER_LETTER,
+]
+
+SECTION_RULES: Dict[str, List[str]] = {
+    PERSONAL_INFORMATION: [
+        r"\b(first|last|full|legal|preferred)\s+name\b", r"\be-?mail\b", r"\bphone\b",
+        r"\b(street|mailing|home)\s+address\b", r"\bzip\b|\bpostal code\b", r"\blinkedin\b",
+        r"\bgithub (profile|url)\b", r"\bdate of birth\b",
+    ],
+    SELF_IDENTIFICATION: [
+        r"\bgender\b", r"\bpronouns?\b", r"\brace\b", r"\bethnicity\b", r"\bveteran\b",
+        r"\bdisabilit(y|ies)\b", r"\bhispanic\b|\blatino\b", r"\bsexual orientation\b",
+    ],
+    LEGAL_AUTHORIZATION: [
+        r"\bsponsor(ship)?\b", r"\bvisa\b", r"\b(legally )?authori[sz]ed to work\b",
+        r"\bwork (permit|authori[sz]ation)\b", r"\bcitizen(ship)?\b", r"\bgreen card\b",
+        r"\bright to work\b",
+    ],
+    WORK_PREFERENCES: [
+        r"\bremote\b", r"\bhybrid\b", r"\bon-?site\b", r"\brelocat(e|ion)\b", r"\btravel\b",
+        r"\bcommut(e|ing)\b", r"\bshifts?\b", r"\bovertime\b", r"\bbackground check\b",
+        r"\bdrug (test|screen)\b",
+    ],
+    EDUCATION_DETAILS: [
+        r"\bdegree\b", r"\buniversity\b|\bcollege\b", r"\bgpa\b", r"\bbachelor'?s?\b",
+        r"\bmaster'?s?\b", r"\bph\.?d\b", r"\bgraduat(e|ed|ion)\b", r"\bfield of study\b|\bmajor\b",
+    ],
+    EXPERIENCE_DETAILS: [
+        r"\byears of (professional |relevant |work )?experience\b", r"\bexperience (with|in)\b",
+        r"\bprevious (role|job|employer|position)\b", r"\bcurrent (employer|role|title)\b",
+        r"\bresponsibilit(y|ies)\b", r"\bmanaged\b|\bled a team\b",
+    ],
+    PROJECTS: [r"\bprojects?\b", r"\bportfolio\b", r"\bside project\b", r"\bopen[- ]source\b"],
+    AVAILABILITY: [
+        r"\bnotice period\b", r"\bstart date\b", r"\bwhen can you start\b", r"\bavailab(le|ility)\b",
+        r"\bearliest\b",
+    ],
+    SALARY_EXPECTATIONS: [
+        r"\bsalary\b", r"\bcompensation\b", r"\bpay (range|rate|expectations?)\b",
+        r"\bhourly rate\b", r"\bexpected (pay|wage|ctc)\b", r"\bwages?\b",
+    ],
+    CERTIFICATIONS: [r"\bcertifi(ed|cate|cation)s?\b", r"\blicen[cs](e|ed)\b", r"\bclearance\b"],
+    LANGUAGES: [
+        r"\blanguages?\b", r"\bfluen(t|cy)\b", r"\bspeak\b", r"\bbilingual\b",
+        r"\b(english|spanish|french|german|mandarin) proficiency\b",
+    ],
+    INTERESTS: [r"\bhobb(y|ies)\b", r"\binterests?\b", r"\bfree time\b", r"\boutside of work\b"],
+    COVER_LETTER: [
+        r"\bcover letter\b", r"\bwhy do you want\b", r"\bwhy are you interested\b",
+        r"\bwhy (this|our) (company|role|position)\b", r"\btell us about yourself\b",
+        r"\bmotivation\b",
+    ],
+}
+
+SECTION_SEEDS: Dict[str, List[str]] = {
+    PERSONAL_INFORMATION: ["personal information name email phone address city country linkedin website"],
+    SELF_IDENTIFICATION: ["self identification gender pronouns race ethnicity veteran status disability"],
+    LEGAL_AUTHORIZATION: ["legal authorization work visa sponsorship authorized citizen permit eligible"],
+    WORK_PREFERENCES: ["work preferences remote hybrid onsite relocate travel commute shift schedule"],
+    EDUCATION_DETAILS: ["education details degree university college school gpa graduation major"],
+    EXPERIENCE_DETAILS: ["experience details years experience worked role skills technologies employer"],
+    PROJECTS: ["projects portfolio built side project open source github"],
+    AVAILABILITY: ["availability notice period start date available join"],
+    SALARY_EXPECTATIONS: ["salary expectations compensation pay expected range hourly rate"],
+    CERTIFICATIONS: ["certifications certified certificate license credential"],
+    LANGUAGES: ["languages speak fluent proficiency native bilingual"],
+    INTERESTS: ["interests hobbies free time passion outside work"],
+    COVER_LETTER: ["cover letter why interested company role motivation tell us about yourself"],
+}
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from have how i if in is it of on or "
+    "our please the this to us we what when which with you your".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+RULE_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass
+class RouteDecision:
+    section: str
+    confidence: float
+    source: str  # "rules", "tfidf" or "llm"
+
+
+class TfidfCentroidClassifier:
+    """Nearest-centroid classifier over L2-normalised TF-IDF vectors."""
+
+    def __init__(self, labels: List[str]):
+        self.labels = labels
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0)
+        self.centroids = np.zeros((len(labels), 0))
+
+    def fit(self, documents: List[str], targets: List[str]) -> "TfidfCentroidClassifier":
+        tokenized = [tokenize(doc) for doc in documents]
+        self.vocabulary = {}
+        for tokens in tokenized:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        counts = np.zeros((len(documents), len(self.vocabulary)))
+        for row, tokens in enumerate(tokenized):
+            for token in tokens:
+                counts[row, self.vocabulary[token]] += 1
+        df = np.count_nonzero(counts, axis=0)
+        self.idf = np.log((1 + len(documents)) / (1 + df)) + 1.0
+        vectors = self._normalise(self._weight(counts))
+
+        index = {label: i for i, label in enumerate(self.labels)}
+        self.centroids = np.zeros((len(self.labels), len(self.vocabulary)))
+        for vector, target in zip(vectors, targets):
+            self.centroids[index[target]] += vector
+        self.centroids = self._normalise(self.centroids)
+        return self
+
+    def scores(self, text: str) -> np.ndarray:
+        counts = np.zeros((1, len(self.vocabulary)))
+        for token in tokenize(text):
+            column = self.vocabulary.get(token)
+            if column is not None:
+                counts[0, column] += 1
+        query = self._normalise(self._weight(counts))[0]
+        return self.centroids @ query
+
+    def _weight(self, counts: np.ndarray) -> np.ndarray:
+        tf = np.where(counts > 0, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0)
+        return tf * self.idf
+
+    @staticmethod
+    def _normalise(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class SectionRouter:
+    """Rules + TF-IDF router with a confidence threshold and a decision log."""
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        log_path: Optional[Path] = None,
+        audit_rate: float = 0.0,
+    ):
+        self.threshold = threshold
+        self.log_path = Path(log_path) if log_path else None
+        self.audit_rate = audit_rate
+        self._rules = {
+            section: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for section, patterns in SECTION_RULES.items()
+        }
+        self._examples: List[Tuple[str, str]] = []
+        self._classifier: Optional[TfidfCentroidClassifier] = None
+        self._lock = threading.Lock()
+        self._stats = {"local": 0, "llm": 0, "audited": 0, "labelled": 0, "agreed": 0}
+        if self.log_path:
+            self._load_examples()
+
+    # -- routing -----------------------------------------------------------
+
+    def route(self, question: str) -> RouteDecision:
+        scores = self._classifier_for_routing().scores(question)
+        rule_hits = {section for section, patterns in self._rules.items()
+                     if any(p.search(question) for p in patterns)}
+        for section in rule_hits:
+            scores[SECTIONS.index(section)] += RULE_WEIGHT
+
+        order = np.argsort(scores)[::-1]
+        best, runner_up = float(scores[order[0]]), float(scores[order[1]])
+        section = SECTIONS[int(order[0])]
+        confidence = max(0.0, min(1.0, best - runner_up))
+        source = "rules" if section in rule_hits else "tfidf"
+        return RouteDecision(section=section, confidence=round(confidence, 4), source=source)
+
+    def is_confident(self, decision: RouteDecision) -> bool:
+        """True when ``decision`` can be used without asking the LLM."""
+        if decision.confidence < self.threshold:
+            return False
+        if self.audit_rate and random.random() < self.audit_rate:
+            with self._lock:
+                self._stats["audited"] += 1
+            return False
+        return True
+
+    # -- feedback ------------------------------------------------------------
+
+    def record(self, question: str, decision: RouteDecision, llm_section: Optional[str] = None) -> None:
+        """
+        Log a routing decision. ``llm_section`` is the LLM's answer when it was
+        consulted; it becomes a training example and scores the local guess.
+        """
+        with self._lock:
+            if llm_section is None:
+                self._stats["local"] += 1
+            else:
+                self._stats["llm"] += 1
+                self._stats["labelled"] += 1
+                self._stats["agreed"] += int(llm_section == decision.section)
+                if llm_section in SECTIONS:
+                    self._examples.append((question, llm_section))
+                    self._classifier = None
+
+        if self.log_path:
+            get_call_log_writer(self.log_path).write({
+                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "question": question,
+                "predicted": decision.section,
+                "confidence": decision.confidence,
+                "source": decision.source,
+                "label": llm_section,
+            })
+        logger.debug(
+            f"Section route: {decision.section} ({decision.source}, {decision.confidence:.2f})"
+            + (f", llm said {llm_section}" if llm_section else "")
+        )
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["local"] + stats["llm"]
+        stats["local_rate"] = round(stats["local"] / total, 4) if total else 0.0
+        stats["accuracy"] = round(stats["agreed"] / stats["labelled"], 4) if stats["labelled"] else None
+        stats["examples"] = len(self._examples)
+        return stats
+
+    # -- training ------------------------------------------------------------
+
+    def _classifier_for_routing(self) -> TfidfCentroidClassifier:
+        classifier = self._classifier
+        if classifier is None:
+            with self._lock:
+                if self._classifier is None:
+                    documents, targets = [], []
+                    for section in SECTIONS:
+                        for seed in SECTION_SEEDS[section]:
+                            documents.append(seed)
+                            targets.append(section)
+                    for question, section in self._examples:
+                        documents.append(question)
+                        targets.append(section)
+                    self._classifier = TfidfCentroidClassifier(SECTIONS).fit(documents, targets)
+                classifier = self._classifier
+        return classifier
+
+    def _load_examples(self) -> None:
+        try:
+            for entry in iter_entries(self.log_path):
+                label = entry.get("label")
+                if label in SECTIONS and entry.get("question"):
+                    self._examples.append((entry["question"], label))
+        except Exception as exc:
+            logger.warning(f"Could not load section routing history from {self.log_path}: {exc}")
+
+
+_router: Optional[SectionRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_section_router() -> Optional[SectionRouter]:
+    """Process-wide router built from config, or None when disabled."""
+    global _router
+    import config as cfg
+
+    if not getattr(cfg, "SECTION_ROUTER_ENABLED", True):
+        return None
+    with _router_lock:
+        if _router is None:
+            _router = SectionRouter(
+                threshold=getattr(cfg, "SECTION_ROUTER_CONFIDENCE", 0.5),
+                log_path=getattr(cfg, "SECTION_ROUTER_LOG_PATH", None),
+                audit_rate=getattr(cfg, "SECTION_ROUTER_AUDIT_RATE", 0.0),
+            )
+        return _router
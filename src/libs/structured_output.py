@@ -0,0 +1,413 @@
+"""
+structured_output.py
+====================
+Schema-validated JSON replies from the LLM, shared by ``ATSScorer``,
+``ResumeTailor`` and ``RecruiterPrepEngine``.
+
+  StructuredOutput(schema, task).invoke(adapter, prompt) -> schema instance
+
+1. The prompt goes out with the provider's native JSON mode when the adapter
+   supports it (``AIAdapter.invoke(..., json_mode=True)``).
+2. The reply is reduced to its JSON value: code fences and prose around it
+   are dropped, and a reply cut off mid-object is closed at the last complete
+   value.
+3. Common defects are repaired in one pass: trailing commas, unescaped quotes
+   and raw newlines inside strings, Python ``True``/``False``/``None``.
+4. The result is validated against the pydantic ``schema``. If that still
+   fails, the model is asked once more with the validation error; a second
+   failure raises ``StructuredOutputError`` so the caller can fall back.
+
+Outcomes (clean, repaired, re-asked, failed) are counted per task; see
+``structured_output_stats()``. ``JSONStreamParser`` applies the same
+extraction to streamed text and yields the partial object seen so far;
+``StructuredOutput.astream`` uses it to emit partial objects while the reply
+streams in, then the validated result.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from src.libs.prompt_cache import record_prompt_cache
+from src.logging import logger
+
+
+T = TypeVar("T", bound=BaseModel)
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|\Z)", re.DOTALL)
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_STRING_END_FOLLOWERS = ",}]:"
+_DECODER = json.JSONDecoder()
+
+
+class StructuredOutputError(ValueError):
+    """The reply could not be turned into a valid instance of the task's schema."""
+
+
+# ---------------------------------------------------------------------------
+# Extraction and repair
+# ---------------------------------------------------------------------------
+
+def _json_start(text: str) -> int:
+    fence = _FENCE_RE.search(text)
+    offset = fence.start(1) if fence else 0
+    for opener in "{[":
+        index = text.find(opener, offset)
+        if index >= 0:
+            return index
+    return -1
+
+
+def _drop_trailing(out: List[str], chars: str) -> None:
+    while out and (out[-1].isspace() or out[-1] in chars):
+        out.pop()
+
+
+class _RepairScan:
+    """
+    State of ``repair_json``'s single pass, kept between calls so streamed
+    text is scanned once. With ``final=False`` the scan stops before anything
+    whose meaning depends on text that has not arrived yet.
+    """
+
+    def __init__(self, start: int):
+        self.i = start
+        self.out: List[str] = []
+        self.closers: List[str] = []
+        self.expect_key: List[bool] = []
+        self.in_string = False
+        self.complete = False
+        self.safe: Tuple[int, Tuple[str, ...]] = (0, ())
+        self.marks = 0
+
+    def _mark_safe(self) -> None:
+        self.safe = (len(self.out), tuple(self.closers))
+        self.marks += 1
+
+    def scan(self, text: str, final: bool = True) -> None:
+        out, closers, expect_key = self.out, self.closers, self.expect_key
+        i, n = self.i, len(text)
+        while i < n and not self.complete:
+            ch = text[i]
+            if self.in_string:
+                if ch == "\\":
+                    if i + 1 < n:
+                        out.append(text[i:i + 2])
+                        i += 2
+                        continue
+                    if not final:
+                        break
+                if ch == '"':
+                    j = i + 1
+                    while j < n and text[j] in " \t\r\n":
+                        j += 1
+                    if j >= n and not final:
+                        break
+                    if j >= n or text[j] in _STRING_END_FOLLOWERS:
+                        self.in_string = False
+                        out.append('"')
+                        if not (closers and closers[-1] == "}" and expect_key[-1]):
+                            self._mark_safe()
+                    else:
+                        out.append('\\"')
+                elif ch == "\n":
+                    out.append("\\n")
+                elif ch == "\r":
+                    out.append("\\r")
+                elif ch == "\t":
+                    out.append("\\t")
+                elif ord(ch) >= 0x20:
+                    out.append(ch)
+                i += 1
+                continue
+
+            if ch == '"':
+                self.in_string = True
+                out.append(ch)
+            elif ch in "{[":
+                closers.append("}" if ch == "{" else "]")
+                expect_key.append(ch == "{")
+                out.append(ch)
+                self._mark_safe()
+            elif ch in "}]":
+                _drop_trailing(out, ",")
+                if closers:
+                    closers.pop()
+                    expect_key.pop()
+                out.append(ch)
+                self._mark_safe()
+                if not closers:
+                    self.complete = True
+            elif ch == ",":
+                _drop_trailing(out, "")
+                if out and out[-1] not in ",{[":
+                    self._mark_safe()
+                    out.append(",")
+                if closers and closers[-1] == "}":
+                    expect_key[-1] = True
+            elif ch == ":":
+                out.append(ch)
+                if closers and closers[-1] == "}":
+                    expect_key[-1] = False
+            else:
+                if not final and n - i < 5 and any(word.startswith(text[i:]) for word in _LITERALS):
+                    break
+                literal = next((word for word in _LITERALS if text.startswith(word, i)), None)
+                if literal and not (i and text[i - 1].isalnum()):
+                    out.append(_LITERALS[literal])
+                    i += len(literal)
+                    continue
+                out.append(ch)
+            i += 1
+        self.i = i
+
+    def result(self) -> str:
+        if self.complete:
+            return "".join(self.out)
+        # Truncated: keep everything up to the last complete value and close what is open
+        length, open_closers = self.safe
+        out = self.out[:length]
+        _drop_trailing(out, ",:")
+        return "".join(out) + "".join(reversed(open_closers))
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    Return the first JSON object/array in ``text`` as parseable JSON text, or
+    None when there is none. Unterminated input is cut back to the last
+    complete value and closed.
+    """
+    start = _json_start(text)
+    if start < 0:
+        return None
+    state = _RepairScan(start)
+    state.scan(text)
+    return state.result()
+
+
+def loads_lenient(text: str) -> Tuple[Any, bool]:
+    """``(value, repaired)`` for the JSON in ``text``; raises ValueError when there is none."""
+    start = _json_start(text)
+    if start < 0:
+        raise ValueError("no JSON object in reply")
+    try:
+        return _DECODER.raw_decode(text, start)[0], False
+    except ValueError:
+        pass
+    repaired = repair_json(text)
+    if not repaired:
+        raise ValueError("no JSON object in reply")
+    return json.loads(repaired), True
+
+
+class JSONStreamParser:
+    """Feed streamed text chunks; ``feed`` returns the partial JSON value parsed so far."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.value: Any = None
+        self._scan: Optional[_RepairScan] = None
+
+    def feed(self, chunk: str) -> Any:
+        """Scan only the new text; the value is re-parsed when a chunk completes one."""
+        self.buffer += chunk or ""
+        if self._scan is None:
+            start = _json_start(self.buffer)
+            if start < 0:
+                return self.value
+            self._scan = _RepairScan(start)
+        marks = self._scan.marks
+        self._scan.scan(self.buffer, final=False)
+        if self._scan.marks != marks:
+            try:
+                self.value = json.loads(self._scan.result())
+            except ValueError:
+                pass
+        return self.value
+
+
+# ---------------------------------------------------------------------------
+# Per-task outcome stats
+# ---------------------------------------------------------------------------
+
+_OUTCOMES = ("clean", "repaired", "reasked", "failed")
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(task: str, outcome: str) -> None:
+    with _stats_lock:
+        counts = _stats.setdefault(task, {name: 0 for name in _OUTCOMES})
+        counts[outcome] += 1
+
+
+def structured_output_stats() -> Dict[str, Dict[str, Any]]:
+    """Per task: outcome counts, first-pass parse failure rate and final failure rate."""
+    with _stats_lock:
+        report = {}
+        for task, counts in _stats.items():
+            calls = sum(counts.values())
+            report[task] = {
+                "calls": calls,
+                **counts,
+                "parse_failure_rate": round((counts["reasked"] + counts["failed"]) / calls, 4) if calls else 0.0,
+                "failure_rate": round(counts["failed"] / calls, 4) if calls else 0.0,
+            }
+        return report
+
+
+def reset_structured_output_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+# ---------------------------------------------------------------------------
+# Structured calls
+# ---------------------------------------------------------------------------
+
+class StructuredOutput(Generic[T]):
+    """Ask an ``AIAdapter`` for a reply matching ``schema``, with repair and one re-ask."""
+
+    def __init__(self, schema: Type[T], task: str, max_reasks: int = 1):
+        self.schema = schema
+        self.task = task
+        self.max_reasks = max_reasks
+
+    def parse(self, text: str) -> Tuple[T, bool]:
+        """``(instance, repaired)``; raises ``StructuredOutputError``."""
+        try:
+            value, repaired = loads_lenient(text or "")
+            return self.schema.model_validate(value), repaired
+        except (ValueError, ValidationError) as exc:
+            raise StructuredOutputError(_describe(exc)) from exc
+
+    def invoke(self, adapter: Any, prompt: str) -> T:
+        asked = prompt
+        reply = _content(self._call(adapter, asked))
+        for reask in range(self.max_reasks + 1):
+            try:
+                result, repaired = self.parse(reply)
+            except StructuredOutputError as exc:
+                _discard_cached(adapter, asked)
+                if reask == self.max_reasks:
+                    self._fail(exc)
+                logger.warning(f"{self.task}: reply did not match the schema ({exc}); asking again")
+                asked = self.reask_prompt(prompt, reply, exc)
+                reply = _content(self._call(adapter, asked))
+                continue
+            self._succeed(reask, repaired)
+            return result
+
+    async def ainvoke(self, adapter: Any, prompt: str) -> T:
+        asked = prompt
+        reply = _content(await self._acall(adapter, asked))
+        for reask in range(self.max_reasks + 1):
+            try:
+                result, repaired = self.parse(reply)
+            except StructuredOutputError as exc:
+                _discard_cached(adapter, asked)
+                if reask == self.max_reasks:
+                    self._fail(exc)
+                logger.warning(f"{self.task}: reply did not match the schema ({exc}); asking again")
+                asked = self.reask_prompt(prompt, reply, exc)
+                reply = _content(await self._acall(adapter, asked))
+                continue
+            self._succeed(reask, repaired)
+            return result
+
+    async def astream(self, adapter: Any, prompt: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yield ``("partial", dict)`` each time the streamed reply adds to the
+        object, then ``("result", instance)``. A reply that fails validation is
+        re-asked without streaming, as in ``ainvoke``.
+        """
+        if not hasattr(adapter, "astream"):
+            yield "result", await self.ainvoke(adapter, prompt)
+            return
+        parser = JSONStreamParser()
+        last = None
+        async for text in adapter.astream(prompt, json_mode=getattr(adapter, "supports_json_mode", False)):
+            partial = parser.feed(text)
+            if partial is not None and partial != last:
+                last = partial
+                yield "partial", partial
+        try:
+            result, repaired = self.parse(parser.buffer)
+        except StructuredOutputError as exc:
+            _discard_cached(adapter, prompt)
+            if not self.max_reasks:
+                self._fail(exc)
+            logger.warning(f"{self.task}: streamed reply did not match the schema ({exc}); asking again")
+            asked = self.reask_prompt(prompt, parser.buffer, exc)
+            reply = _content(await self._acall(adapter, asked))
+            try:
+                result, _repaired = self.parse(reply)
+            except StructuredOutputError as again:
+                _discard_cached(adapter, asked)
+                self._fail(again)
+            self._succeed(1, False)
+        else:
+            self._succeed(0, repaired)
+        yield "result", result
+
+    def reask_prompt(self, prompt: str, reply: str, error: Exception) -> str:
+        schema = json.dumps(self.schema.model_json_schema(), separators=(",", ":"))
+        return (
+            f"{prompt}\n\n"
+            f"Your previous reply could not be used: {error}\n"
+            f"Previous reply (truncated): {reply[:1500]}\n\n"
+            f"Return ONLY a JSON object matching this JSON schema, with no other text:\n{schema}"
+        )
+
+    def _call(self, adapter: Any, prompt: str) -> Any:
+        if getattr(adapter, "supports_json_mode", False):
+            response = adapter.invoke(prompt, json_mode=True)
+        else:
+            response = adapter.invoke(prompt)
+        self._record_usage(adapter, response)
+        return response
+
+    async def _acall(self, adapter: Any, prompt: str) -> Any:
+        if getattr(adapter, "supports_json_mode", False):
+            response = await adapter.ainvoke(prompt, json_mode=True)
+        else:
+            response = await adapter.ainvoke(prompt)
+        self._record_usage(adapter, response)
+        return response
+
+    def _record_usage(self, adapter: Any, response: Any) -> None:
+        record_prompt_cache(self.task, getattr(adapter, "provider", ""), getattr(adapter, "model_name", ""), response)
+
+    def _succeed(self, reasks: int, repaired: bool) -> None:
+        _record(self.task, "reasked" if reasks else "repaired" if repaired else "clean")
+
+    def _fail(self, error: StructuredOutputError) -> None:
+        _record(self.task, "failed")
+        raise error
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        problems = [
+            f"{'.'.join(str(part) for part in item['loc']) or 'value'}: {item['msg']}"
+            for item in error.errors()[:5]
+        ]
+        return "; ".join(problems)
+    return str(error)
+
+
+def _discard_cached(adapter: Any, prompt: str) -> None:
+    """A rejected reply must not come back from the response cache on the next call."""
+    discard = getattr(adapter, "discard_cached", None)
+    if discard is not None:
+        discard(prompt)
+
+
+def _content(response: Any) -> str:
+    return getattr(response, "content", response if isinstance(response, str) else str(response)) or ""
+
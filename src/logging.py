@@ -1,12 +1,39 @@
+"""
+logging.py
+==========
+Application logging. ``logger`` is loguru's logger; importing this module
+adds no sinks, creates no folders and does not import selenium.
+
+Entry points (``main.py``, ``run_web.py`` and the web server's start-up) call
+``init_logging()`` once: it sets up the console and ``log/app.log`` sinks from
+the ``LOG_*`` keys in config.py and sends selenium's connection logger to
+``log/selenium.log``. Modules that keep a log file of their own call
+``add_log_file`` when they are first used.
+"""
+
 import logging.handlers
 import os
 import sys
 import logging
+import threading
+from typing import Dict
+
 from loguru import logger
-from selenium.webdriver.remote.remote_connection import LOGGER as selenium_logger
 
 from config import LOG_LEVEL, LOG_SELENIUM_LEVEL, LOG_TO_CONSOLE, LOG_TO_FILE
 
+# Name of selenium's remote_connection LOGGER, configured without importing selenium
+SELENIUM_LOGGER_NAME = "selenium.webdriver.remote.remote_connection"
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+_initialised = False
+_file_sinks: Dict[str, int] = {}
+_lock = threading.Lock()
+
 
 def remove_default_loggers():
     """Remove default loggers from root logger."""
@@ -26,7 +53,11 @@ def init_loguru_logger():
 
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
-    logger.remove()
+    # Only loguru's default stderr handler; sinks added by add_log_file stay
+    try:
+        logger.remove(0)
+    except ValueError:
+        pass
 
     # Add file logger if LOG_TO_FILE is True
     if LOG_TO_FILE:
@@ -36,7 +67,7 @@ def init_loguru_logger():
             rotation="10 MB",
             retention="1 week",
             compression="zip",
-            format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            format=LOG_FORMAT,
             backtrace=True,
             diagnose=True,
         )
@@ -46,7 +77,7 @@ def init_loguru_logger():
         logger.add(
             sys.stderr,
             level=LOG_LEVEL,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            format=LOG_FORMAT,
             backtrace=True,
             diagnose=True,
         )
@@ -57,6 +88,7 @@ def init_selenium_logger():
     log_file = "log/selenium.log"
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
+    selenium_logger = logging.getLogger(SELENIUM_LOGGER_NAME)
     selenium_logger.handlers.clear()
 
     selenium_logger.setLevel(LOG_SELENIUM_LEVEL)
@@ -75,6 +107,22 @@ def init_selenium_logger():
     selenium_logger.addHandler(file_handler)
 
 
-remove_default_loggers()
-init_loguru_logger()
-init_selenium_logger()
+def init_logging() -> None:
+    """Configure the application's sinks; later calls do nothing."""
+    global _initialised
+    with _lock:
+        if _initialised:
+            return
+        _initialised = True
+        remove_default_loggers()
+        init_loguru_logger()
+        init_selenium_logger()
+
+
+def add_log_file(path: str, **options) -> None:
+    """Add a loguru file sink for ``path`` once, creating its folder."""
+    with _lock:
+        if path in _file_sinks:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        _file_sinks[path] = logger.add(path, **options)
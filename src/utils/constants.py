@@ -24,6 +24,7 @@ USAGE_METADATA = "usage_metadata"
 OUTPUT_TOKENS = "output_tokens"
 INPUT_TOKENS = "input_tokens"
 TOTAL_TOKENS = "total_tokens"
+CACHED_INPUT_TOKENS = "cached_input_tokens"
 TOKEN_USAGE = "token_usage"
 
 MODEL = "model"
@@ -32,6 +33,7 @@ PROMPTS = "prompts"
 REPLIES = "replies"
 CONTENT = "content"
 TOTAL_COST = "total_cost"
+LATENCY_SECONDS = "latency_seconds"
 
 RESPONSE_METADATA = "response_metadata"
 MODEL_NAME = "model_name"
@@ -75,3 +77,5 @@ OLLAMA = "ollama"
 GEMINI = "gemini"
 HUGGINGFACE = "huggingface"
 PERPLEXITY = "perplexity"
+STUB = "stub"
+REPLAY = "replay"
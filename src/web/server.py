@@ -1,33 +1,45 @@
+import json
 import shutil
 import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 import yaml
 
 from src.application_stats import ApplicationStatsService
 from src.bots.bot_manager import BotManager
+from src.libs.ats_cache import ats_cache_stats
+from src.libs.job_dedup import dedup_stats
 from src.libs.ats_scorer import ATSScorer
 from src.libs.email_monitor import (
     EmailMonitor, load_email_config, save_email_config,
 )
-from src.libs.llm_manager import AIAdapter
+from src.libs.job_funnel import funnel_stats
+from src.libs.llm_clients import client_registry_stats, invalidate_clients
+from src.libs.llm_failover import provider_health_stats
+from src.libs.model_router import (
+    ATS_SCORING, BRIEFING, COVER_LETTER_GENERATION, TAILORING, ModelRouter, tier_stats,
+)
+from src.libs.prompt_cache import prompt_cache_stats
 from src.libs.recruiter_prep import RecruiterPrepEngine
 from src.libs.resume_converter import (
     SUPPORTED_EXTENSIONS, save_resume,
 )
+from src.libs.resume_context import context_for_yaml, context_stats
 from src.libs.resume_parser import extract_summary, extract_positions
+from src.libs.resume_snapshot import resume_snapshot, snapshot_stats
+from src.libs.structured_output import structured_output_stats
 from src.libs.resume_tailor import (
     ResumeTailor, list_tailored_resumes, load_tailored_resume,
 )
 from src.libs.profile_manager import ProfileManager, Profile
 from src.libs.email_oauth2 import OAUTH_PROVIDERS
-from src.logging import logger
+from src.logging import init_logging, logger
 
 # ---------------------------------------------------------------------------
 # Global state for batch logging
@@ -66,6 +78,17 @@ class RecruiterBriefingRequest(BaseModel):
     role: str = Field(min_length=2)
 
 
+class TailorPreviewRequest(BaseModel):
+    job_description: str = Field(min_length=20)
+    job_title: str = ""
+    company: str = ""
+
+
+class CoverLetterRequest(BaseModel):
+    job_description: str = Field(min_length=20)
+    company: str = ""
+
+
 class EmailConfigRequest(BaseModel):
     imap_host: str
     imap_port: int = 993
@@ -140,6 +163,23 @@ def _load_runtime():
     return config, secrets, llm_api_key
 
 
+def _warm_llm_clients() -> None:
+    try:
+        config, _s, llm_api_key = _load_runtime()
+    except HTTPException as e:
+        logger.debug(f"LLM clients not warmed: {e.detail}")
+        return
+    if llm_api_key:
+        ModelRouter(config, llm_api_key).warm()
+
+
+@app.on_event("startup")
+def warm_llm_clients():
+    init_logging()
+    # Provider imports and client construction happen off the request path
+    threading.Thread(target=_warm_llm_clients, daemon=True, name="llm-warmup").start()
+
+
 def _load_secrets() -> Dict[str, Any]:
     secrets_path = Path("data_folder/secrets.yaml")
     if not secrets_path.exists():
@@ -237,6 +277,7 @@ def update_secrets(payload: Dict[str, str]):
                 secrets[key] = value
     
     _save_secrets(secrets)
+    invalidate_clients()
     return {"status": "saved", "message": "Credentials updated successfully"}
 
 
@@ -246,6 +287,66 @@ def stats():
     return summary.as_dict()
 
 
+@app.get("/api/llm-tiers")
+def llm_tiers():
+    """Per-tier LLM call counts, tokens, estimated cost and latency for this process."""
+    return tier_stats()
+
+
+@app.get("/api/llm-providers")
+def llm_providers():
+    """Per-provider success rate, failovers, hedges and latency for this process."""
+    return provider_health_stats()
+
+
+@app.get("/api/llm-structured")
+def llm_structured():
+    """Per-task structured-output outcomes: clean, repaired, re-asked and failed parses."""
+    return structured_output_stats()
+
+
+@app.get("/api/llm-context")
+def llm_context():
+    """Per-task resume tokens sent to the LLM before and after relevance trimming."""
+    return context_stats()
+
+
+@app.get("/api/llm-prompt-cache")
+def llm_prompt_cache():
+    """Per-task provider prompt-cache hit rate, cached input tokens and estimated saving."""
+    return prompt_cache_stats()
+
+
+@app.get("/api/llm-clients")
+def llm_clients():
+    """Shared LLM clients, builds, reuses and the construction time reuse saved."""
+    return client_registry_stats()
+
+
+@app.get("/api/llm-funnel")
+def llm_funnel():
+    """Jobs entering each funnel stage, rejections, stage timings and LLM scorings saved."""
+    return funnel_stats()
+
+
+@app.get("/api/ats-cache")
+def ats_cache():
+    """Stored ATS analyses, hits, misses and evictions of the persistent result cache."""
+    return ats_cache_stats()
+
+
+@app.get("/api/resume-snapshots")
+def resume_snapshots():
+    """Cached resume parses, hits and re-reads of unchanged files for this process."""
+    return snapshot_stats()
+
+
+@app.get("/api/job-dedup")
+def job_dedup():
+    """Job postings checked against the seen-posting index, duplicates per key and lookup latency."""
+    return dedup_stats()
+
+
 # ---------------------------------------------------------------------------
 # Resume management
 # ---------------------------------------------------------------------------
@@ -393,10 +494,10 @@ def get_batch_status():
 # ---------------------------------------------------------------------------
 
 @app.post("/api/ats-score")
-def ats_score(payload: ATSRequest):
+async def ats_score(payload: ATSRequest):
     config, _s, llm_api_key = _load_runtime()
-    scorer = ATSScorer(AIAdapter(config, llm_api_key) if llm_api_key else None)
-    return scorer.score_job(RESUME_PATH, payload.job_description)
+    scorer = ATSScorer(ModelRouter(config, llm_api_key).for_task(ATS_SCORING) if llm_api_key else None)
+    return await scorer.ascore_job(RESUME_PATH, payload.job_description)
 
 
 # ---------------------------------------------------------------------------
@@ -404,15 +505,102 @@ def ats_score(payload: ATSRequest):
 # ---------------------------------------------------------------------------
 
 @app.post("/api/recruiter-briefing")
-def recruiter_briefing(payload: RecruiterBriefingRequest):
+async def recruiter_briefing(payload: RecruiterBriefingRequest):
     config, _s, llm_api_key = _load_runtime()
     if not llm_api_key:
         raise HTTPException(status_code=400, detail="LLM API key missing in secrets.yaml")
-    engine = RecruiterPrepEngine(AIAdapter(config, llm_api_key))
-    briefing = engine.generate_briefing(payload.company, payload.role, str(RESUME_PATH))
+    engine = RecruiterPrepEngine(ModelRouter(config, llm_api_key).for_task(BRIEFING))
+    briefing = await engine.agenerate_briefing(payload.company, payload.role, str(RESUME_PATH))
     return briefing
 
 
+# ---------------------------------------------------------------------------
+# Streaming generation (server-sent events)
+# ---------------------------------------------------------------------------
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _event_stream(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/recruiter-briefing/stream")
+async def recruiter_briefing_stream(payload: RecruiterBriefingRequest):
+    """Briefing card as SSE: ``partial`` events with the fields so far, then ``done``."""
+    config, _s, llm_api_key = _load_runtime()
+    if not llm_api_key:
+        raise HTTPException(status_code=400, detail="LLM API key missing in secrets.yaml")
+    engine = RecruiterPrepEngine(ModelRouter(config, llm_api_key).for_task(BRIEFING))
+
+    async def events():
+        async for event, value in engine.astream_briefing(payload.company, payload.role, str(RESUME_PATH)):
+            yield _sse("partial" if event == "partial" else "done", value)
+
+    return _event_stream(events())
+
+
+@app.post("/api/tailor/stream")
+async def tailor_stream(payload: TailorPreviewRequest):
+    """Tailoring preview as SSE: the ``ats`` analysis, ``partial`` tailored fields, then ``done``."""
+    if not RESUME_PATH.exists():
+        raise HTTPException(status_code=404, detail="No resume uploaded")
+    config, _s, llm_api_key = _load_runtime()
+    router = ModelRouter(config, llm_api_key) if llm_api_key else None
+    scorer = ATSScorer(router.for_task(ATS_SCORING) if router else None)
+    tailor = ResumeTailor(router.for_task(TAILORING) if router else None)
+
+    async def events():
+        analysis = await scorer.ascore_job(RESUME_PATH, payload.job_description)
+        yield _sse("ats", analysis)
+        async for event, value in tailor.astream_tailoring(
+            RESUME_PATH, payload.job_description, analysis, payload.job_title, payload.company
+        ):
+            yield _sse("partial" if event == "partial" else "done", value)
+
+    return _event_stream(events())
+
+
+@app.post("/api/cover-letter/stream")
+async def cover_letter_stream(payload: CoverLetterRequest):
+    """Cover letter as SSE: ``delta`` events with new text, then ``done`` with the whole letter."""
+    if not RESUME_PATH.exists():
+        raise HTTPException(status_code=404, detail="No resume uploaded")
+    config, _s, llm_api_key = _load_runtime()
+    if not llm_api_key:
+        raise HTTPException(status_code=400, detail="LLM API key missing in secrets.yaml")
+    adapter = ModelRouter(config, llm_api_key).for_task(COVER_LETTER_GENERATION)
+    resume = context_for_yaml(resume_snapshot(RESUME_PATH).text).select(
+        payload.job_description, COVER_LETTER_GENERATION
+    )
+    from src.libs.llm_manager import prompt_registry
+
+    prompt = prompt_registry.get("coverletter_template").invoke({
+        "resume": resume,
+        "company": payload.company or "the company",
+        "job_description": payload.job_description,
+    })
+
+    async def events():
+        letter = []
+        try:
+            async for text in adapter.astream(prompt):
+                letter.append(text)
+                yield _sse("delta", text)
+        except Exception as e:
+            logger.error(f"Cover letter stream failed: {e}")
+            yield _sse("error", {"detail": str(e)})
+            return
+        yield _sse("done", {"cover_letter": "".join(letter).strip()})
+
+    return _event_stream(events())
+
+
 # ---------------------------------------------------------------------------
 # Tailored resumes
 # ---------------------------------------------------------------------------
@@ -491,6 +679,7 @@ def switch_profile(payload: ProfileSwitchRequest):
     """Switch to a different profile."""
     try:
         ProfileManager.set_active_profile(payload.name)
+        invalidate_clients()
         profile = Profile(payload.name)
         return {
             "status": "switched",
@@ -0,0 +1,88 @@
+import time
+
+from langchain_core.messages.ai import AIMessage
+
+import config as cfg
+import src.libs.job_summarizer as job_summarizer
+import src.libs.answer_memory as answer_memory
+from src.libs.answer_memory import AnswerMemory, normalize_question, profile_fingerprint
+from src.libs.job_summarizer import JobSummaryCache
+from src.libs.llm_manager import AIAdapter, AIModel, GPTAnswerer
+
+
+class CountingModel(AIModel):
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return AIMessage(
+            content=self.reply,
+            response_metadata={"model_name": "counting"},
+            usage_metadata={"input_tokens": 1, "output_tokens": 1, "total_tokens": 2},
+        )
+
+
+def test_exact_and_fuzzy_recall(tmp_path):
+    memory = AnswerMemory(tmp_path / "answers.sqlite3")
+    memory.set_profile("p1")
+    memory.remember("numeric", "How many years of experience do you have with Python?*", "6")
+
+    assert normalize_question("  Years  of Experience: PYTHON? ") == "years of experience python"
+    assert memory.recall("numeric", "how many years of experience do you have with python") == "6"
+    assert memory.recall("numeric", "How many years of experience do you have in Python?") == "6"
+    assert memory.recall("numeric", "How many years of experience do you have with Pythn?") == "6"
+    assert memory.recall("numeric", "How many years of experience do you have with Java?") is None
+    assert memory.recall("options", "How many years of experience do you have with Python?") is None
+    assert memory.stats()["fuzzy_hits"] == 2
+
+
+def test_options_are_part_of_the_key(tmp_path):
+    memory = AnswerMemory(tmp_path / "answers.sqlite3")
+    memory.set_profile("p1")
+    memory.remember("options", "Do you need sponsorship?", "No", ["Yes", "No"])
+
+    assert memory.recall("options", "Do you need sponsorship?", ["No", "Yes"]) == "No"
+    assert memory.recall("options", "Do you need sponsorship?", ["Yes", "No", "Maybe"]) is None
+
+
+def test_profile_change_invalidates_and_memory_persists(tmp_path):
+    path = tmp_path / "answers.sqlite3"
+    memory = AnswerMemory(path)
+    memory.set_profile("p1")
+    memory.remember("textual", "What is your notice period?", "Two weeks")
+    memory.close()
+
+    reopened = AnswerMemory(path)
+    reopened.set_profile("p1")
+    assert reopened.recall("textual", "What is your notice period?") == "Two weeks"
+    reopened.set_profile("p2")
+    assert reopened.recall("textual", "What is your notice period?") is None
+    reopened.set_profile("p1")
+    assert reopened.recall("textual", "What is your notice period?") is None
+
+
+def test_answerer_reuses_answers_across_jobs(monkeypatch, tmp_path):
+    model = CountingModel("5")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_CALL_LOG_PATH", str(tmp_path / "calls.jsonl"))
+    monkeypatch.setattr(job_summarizer, "_cache", JobSummaryCache(tmp_path / "summaries.sqlite3"))
+    monkeypatch.setattr(answer_memory, "_memory", AnswerMemory(tmp_path / "answers.sqlite3"))
+    monkeypatch.setattr(AIAdapter, "_create_model", lambda self, config, api_key: model)
+    resume = type("Resume", (), {"education_details": "", "experience_details": "", "projects": ""})()
+
+    answerer = GPTAnswerer({}, "key")
+    answerer.set_resume(resume)
+    answerer.set_job_application_profile("profile-v1")
+    assert answerer.answer_question_numeric("Years of experience with SQL?") == "5"
+
+    started = time.perf_counter()
+    assert answerer.answer_question_numeric("years of experience with SQL") == "5"
+    assert time.perf_counter() - started < 0.01
+    assert model.calls == 1
+
+    answerer.set_job_application_profile("profile-v2")
+    answerer.answer_question_numeric("Years of experience with SQL?")
+    assert model.calls == 2
+    assert profile_fingerprint(resume, "profile-v1") != profile_fingerprint(resume, "profile-v2")
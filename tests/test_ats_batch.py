@@ -0,0 +1,104 @@
+import json
+import re
+
+import pytest
+
+import config as cfg
+from src.libs.ats_scorer import ATSScorer
+from src.libs.structured_output import reset_structured_output_stats
+
+RESUME = """
+basic_information:
+  name: Alex
+experience_details:
+  - position: Operations Manager
+    company: Acme Logistics
+    key_responsibilities:
+      - responsibility: Ran warehouse inventory planning and vendor management
+"""
+
+
+class BatchAdapter:
+    """Scores each numbered job in the prompt; optionally breaks big batches or drops a job."""
+
+    supports_json_mode = True
+
+    def __init__(self, invalid_above=None, drop_job=None, error=None):
+        self.invalid_above = invalid_above
+        self.drop_job = drop_job
+        self.error = error
+        self.prompts = []
+
+    async def ainvoke(self, prompt, json_mode=False):
+        self.prompts.append(prompt)
+        if self.error:
+            raise ConnectionError(self.error)
+        jobs = [int(n) for n in re.findall(r"=== JOB DESCRIPTION (\d+) ===", prompt.split("Your previous reply")[0])]
+        if not jobs:
+            return json.dumps({"score": 60, "match_summary": "single"})
+        score = 150 if self.invalid_above and len(jobs) > self.invalid_above else 70
+        return json.dumps({"results": [
+            {"job": n, "score": score, "match_summary": f"job {n}"} for n in jobs if n != self.drop_job
+        ]})
+
+    def invoke(self, prompt, json_mode=False):
+        raise AssertionError("score_jobs should use the async path")
+
+
+@pytest.fixture
+def resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "ATS_BATCH_MAX_JOBS", 10)
+    monkeypatch.setattr(cfg, "ATS_CACHE_ENABLED", False)
+    reset_structured_output_stats()
+    path = tmp_path / "resume.yaml"
+    path.write_text(RESUME)
+    return path
+
+
+def _jobs(n):
+    return [f"Job {i}: warehouse operations lead, inventory and logistics planning." for i in range(n)]
+
+
+def test_packs_jobs_into_a_few_requests_and_keeps_order(resume):
+    adapter = BatchAdapter()
+    scorer = ATSScorer(adapter)
+    jobs = _jobs(25) + ["Backend software engineer, full stack, devops engineer on call."]
+
+    results = scorer.score_jobs(resume, jobs)
+
+    assert len(adapter.prompts) == 3
+    assert [r["match_summary"] for r in results[:3]] == ["job 1", "job 2", "job 3"]
+    assert results[0]["base_score"] == 70 and results[0]["score"] > 70
+    assert results[-1]["score"] <= 45 and results[-1]["alignment_notes"]["hard_mismatch"]
+    assert scorer.stats() == {"requests": 3, "batched_jobs": 26}
+
+
+def test_batch_that_fails_validation_is_split(resume):
+    adapter = BatchAdapter(invalid_above=3)
+
+    results = ATSScorer(adapter).score_jobs(resume, _jobs(8))
+
+    assert all(r["base_score"] == 70 for r in results)
+    # 8 fails (+ re-ask), its halves of 4 fail (+ re-ask), then four batches of 2 pass
+    assert len(adapter.prompts) == 2 + 4 + 4
+
+
+def test_jobs_left_out_of_a_reply_are_scored_again(resume):
+    adapter = BatchAdapter(drop_job=2)
+
+    results = ATSScorer(adapter).score_jobs(resume, _jobs(3))
+
+    assert [r["match_summary"] for r in results] == ["job 1", "single", "job 3"]
+
+
+def test_duplicates_are_scored_once_and_errors_fall_back_to_heuristics(resume):
+    jobs = _jobs(2) + _jobs(1)
+    adapter = BatchAdapter()
+
+    results = ATSScorer(adapter).score_jobs(resume, jobs)
+
+    assert len(re.findall(r"=== JOB DESCRIPTION \d+ ===", adapter.prompts[0])) == 2
+    assert results[2] == results[0] and results[2] is not results[0]
+
+    failing = ATSScorer(BatchAdapter(error="503 unavailable")).score_jobs(resume, jobs)
+    assert all("heuristic" in r["match_summary"] for r in failing)
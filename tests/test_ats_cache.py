@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+import config as cfg
+from src.libs import ats_cache
+from src.libs.ats_cache import ATSResultCache, make_key, normalise_description
+from src.libs.ats_scorer import ATSScorer
+from src.libs.llm_async import run_sync
+
+RESUME = """
+experience_details:
+  - position: Operations Manager
+    key_responsibilities:
+      - responsibility: Ran warehouse inventory planning and vendor management
+"""
+
+JD = "Operations manager for a regional warehouse: inventory planning and vendor management."
+
+
+class CountingAdapter:
+    supports_json_mode = True
+    provider = "stub"
+    model_name = "ats"
+
+    def __init__(self):
+        self.calls = 0
+
+    def _reply(self, prompt):
+        self.calls += 1
+        if "=== JOB DESCRIPTION" in prompt:
+            count = prompt.count("=== JOB DESCRIPTION")
+            return json.dumps({"results": [
+                {"job": n, "score": 80, "missing_keywords": ["SAP"], "survival_tweaks": ["Add SAP"]}
+                for n in range(1, count + 1)
+            ]})
+        return json.dumps({"score": 80, "missing_keywords": ["SAP"], "survival_tweaks": ["Add SAP"]})
+
+    def invoke(self, prompt, json_mode=False):
+        return self._reply(prompt)
+
+    async def ainvoke(self, prompt, json_mode=False):
+        return self._reply(prompt)
+
+
+def _score(scorer, resume, job_description):
+    return run_sync(scorer.ascore_job(resume, job_description))
+
+
+@pytest.fixture
+def resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "ATS_CACHE_ENABLED", True)
+    monkeypatch.setattr(cfg, "ATS_CACHE_PATH", str(tmp_path / "ats_cache.sqlite3"))
+    monkeypatch.setattr(cfg, "ATS_DICTIONARIES_PATH", str(tmp_path / "keyword_dictionaries.yaml"))
+    monkeypatch.setattr(ats_cache, "_shared_cache", None)
+    path = tmp_path / "resume.yaml"
+    path.write_text(RESUME)
+    yield path
+    if ats_cache._shared_cache is not None:
+        ats_cache._shared_cache.close()
+
+
+def test_rescoring_a_known_job_is_a_lookup(resume):
+    adapter = CountingAdapter()
+    first = _score(ATSScorer(adapter), resume, JD)
+    # A repost with different case and spacing, scored by a fresh scorer (as after a restart)
+    again = _score(ATSScorer(adapter), resume, "  OPERATIONS manager for a regional\n warehouse: inventory planning and vendor management.")
+
+    assert adapter.calls == 1
+    assert again == first
+    assert again["missing_keywords"] == ["SAP"] and again["survival_tweaks"] == ["Add SAP"]
+    assert "alignment_notes" in again
+    assert ats_cache.ats_cache_stats()["hits"] == 1
+
+
+def test_batches_only_send_uncached_jobs(resume):
+    adapter = CountingAdapter()
+    scorer = ATSScorer(adapter)
+    _score(scorer, resume, JD)
+    others = [f"Logistics planner {i}: inventory and transport planning." for i in range(3)]
+
+    results = scorer.score_jobs(resume, [JD] + others)
+
+    assert adapter.calls == 2
+    assert scorer.stats()["batched_jobs"] == 3
+    assert [r["score"] for r in results] == [results[0]["score"]] + [results[1]["score"]] * 3
+    scorer.score_jobs(resume, others)
+    assert adapter.calls == 2
+
+
+def test_resume_or_rule_changes_miss(resume, tmp_path):
+    adapter = CountingAdapter()
+    _score(ATSScorer(adapter), resume, JD)
+
+    resume.write_text(RESUME + "    skills_acquired: [SAP]\n")
+    _score(ATSScorer(adapter), resume, JD)
+    assert adapter.calls == 2
+
+    (tmp_path / "keyword_dictionaries.yaml").write_text("in_scope:\n  - vendor management\n")
+    _score(ATSScorer(adapter), resume, JD)
+    assert adapter.calls == 3
+
+
+def test_failed_llm_calls_are_not_stored(resume):
+    class FailingAdapter(CountingAdapter):
+        def _reply(self, prompt):
+            self.calls += 1
+            raise ConnectionError("provider down")
+
+    adapter = FailingAdapter()
+    assert "heuristic" in _score(ATSScorer(adapter), resume, JD)["match_summary"]
+    _score(ATSScorer(adapter), resume, JD)
+    assert adapter.calls == 2
+    assert ats_cache.ats_cache_stats()["stores"] == 0
+
+
+def test_cache_expiry_and_lru_eviction(tmp_path):
+    cache = ATSResultCache(tmp_path / "cache.sqlite3", ttl_seconds=0, max_entries=2)
+    for n in range(3):
+        cache.put(make_key("resume", f"job {n}", "v1"), {"score": n})
+    assert cache.get(make_key("resume", "job 0", "v1")) is None
+    assert cache.get(make_key("resume", "job 2", "v1")) == {"score": 2}
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+    assert normalise_description(" A\n\tB ") == "a b"
+    cache.close()
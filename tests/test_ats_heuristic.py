@@ -0,0 +1,71 @@
+from src.libs.ats_heuristic import ResumeIndex, extract_terms, resume_index, stem
+from src.libs.ats_scorer import ATSScorer
+
+RESUME = """
+basic_information:
+  name: Alex
+experience_details:
+  - position: Operations Manager
+    company: Acme Logistics
+    key_responsibilities:
+      - responsibility: Ran warehouse inventory planning and vendor management
+      - responsibility: Led S&OP meetings and demand forecasting in SAP
+"""
+
+OPERATIONS_JD = (
+    "Operations Manager. You will own inventory planning, vendor management and S&OP. "
+    "Experience with SAP and demand forecasting required; Lean Six Sigma is a plus."
+)
+SOFTWARE_JD = "Senior Software Engineer: Python, Kubernetes, React, distributed systems and CI/CD pipelines."
+
+
+def test_stemming_and_phrases():
+    assert stem("planning") == stem("planned") == stem("plans") == "plan"
+    assert stem("supplies") == "supply"
+    counts, surfaces, length = extract_terms("Strong experience in inventory planning. Vendor management")
+    assert "inventory plan" in counts and "vendor management" in counts
+    # Words split by a sentence break or a stopword do not form a phrase; boilerplate is dropped
+    assert "plan vendor" not in counts and "experience" not in counts
+    assert surfaces["inventory plan"] == "inventory planning"
+    assert length == 4
+
+
+def test_yaml_keys_do_not_count_as_resume_terms():
+    index = ResumeIndex(RESUME)
+    assert index.covers("warehouse") and index.covers("vendor management")
+    assert not index.covers("key_responsibilities") and not index.covers("position")
+
+
+def test_score_ranks_relevant_jobs_and_lists_missing_keywords():
+    relevant, unrelated = ResumeIndex(RESUME).score_many([OPERATIONS_JD, SOFTWARE_JD])
+    assert relevant["score"] > 60 > 20 > unrelated["score"]
+    assert "lean six" in relevant["missing_keywords"] or "six sigma" in relevant["missing_keywords"]
+    assert "inventory planning" in relevant["strong_points"]
+    # A word already inside a listed phrase is not listed again
+    assert "sigma" not in relevant["missing_keywords"]
+    assert "kubernetes" in unrelated["missing_keywords"]
+
+
+def test_score_many_matches_score_and_handles_empty_input():
+    index = ResumeIndex(RESUME)
+    batch = index.score_many([SOFTWARE_JD, "", OPERATIONS_JD])
+    assert batch[0] == index.score(SOFTWARE_JD)
+    assert batch[2] == index.score(OPERATIONS_JD)
+    assert batch[1]["score"] == 0 and batch[1]["missing_keywords"] == []
+    assert index.score_many([]) == []
+
+
+def test_index_is_memoised_per_resume():
+    assert resume_index(RESUME) is resume_index(RESUME)
+    assert resume_index(RESUME + "\n# edited") is not resume_index(RESUME)
+
+
+def test_scorer_without_adapter_uses_the_index(tmp_path):
+    path = tmp_path / "resume.yaml"
+    path.write_text(RESUME)
+    scorer = ATSScorer(None)
+    results = scorer.score_jobs(path, [OPERATIONS_JD, SOFTWARE_JD])
+    assert results[0]["score"] > results[1]["score"]
+    assert results[0]["missing_keywords"] and "base_score" in results[0]
+    assert results[0]["survival_tweaks"][0].startswith("Work these posting keywords")
+    assert scorer.heuristic_scores(path, [OPERATIONS_JD]) == results[:1]
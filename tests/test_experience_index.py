@@ -0,0 +1,66 @@
+from datetime import date
+
+from src.libs.experience_index import ExperienceIndex, merge_intervals, parse_employment_period
+
+TODAY = date(2026, 3, 1)
+
+RESUME = {
+    "experience_details": [
+        {
+            "position": "Senior Engineer",
+            "employment_period": "06/2019 - Present",
+            "industry": "Technology",
+            "skills_acquired": ["React", "Node.js", "Python"],
+        },
+        {
+            "position": "Contractor",
+            "employment_period": "Jan 2021 – Dec 2021",
+            "industry": "Finance",
+            "skills_acquired": ["Python", "C"],
+        },
+        {
+            "position": "Developer",
+            "employment_period": "2014 - 2016",
+            "industry": "Technology",
+            "skills_acquired": ["Java"],
+        },
+    ]
+}
+
+
+def test_parse_employment_period_formats():
+    assert parse_employment_period("06/2019 - Present", TODAY) == (date(2019, 6, 1), TODAY)
+    assert parse_employment_period("Jan 2014 – May 2015", TODAY) == (date(2014, 1, 1), date(2015, 6, 1))
+    assert parse_employment_period("2019-06 to 2020-01", TODAY) == (date(2019, 6, 1), date(2020, 2, 1))
+    assert parse_employment_period("2016-2018", TODAY) == (date(2016, 1, 1), date(2019, 1, 1))
+    assert parse_employment_period("n/a", TODAY) is None
+
+
+def test_overlapping_intervals_merge():
+    merged = merge_intervals([
+        (date(2020, 1, 1), date(2021, 1, 1)),
+        (date(2020, 6, 1), date(2022, 1, 1)),
+        (date(2023, 1, 1), date(2024, 1, 1)),
+    ])
+    assert merged == [(date(2020, 1, 1), date(2022, 1, 1)), (date(2023, 1, 1), date(2024, 1, 1))]
+
+
+def test_answers_per_skill_industry_and_total():
+    index = ExperienceIndex.from_resume(RESUME, TODAY)
+
+    # Python appears in two overlapping jobs and is counted once
+    assert index.answer("How many years of experience do you have with Python?") == 7
+    assert index.answer("Years of experience with nodejs?") == 7
+    assert index.answer("How many years of C experience do you have?") == 1
+    assert index.answer("How many years of Java experience do you have?") == 3
+    assert index.answer("How many years of experience in the Technology industry?") == 10
+    assert index.answer("How many years of professional experience do you have?") == 10
+
+
+def test_unknown_subjects_and_other_questions_defer_to_llm():
+    index = ExperienceIndex.from_resume(RESUME, TODAY)
+
+    assert index.answer("How many years of experience do you have with Kubernetes?") is None
+    assert index.answer("How many years of C++ experience do you have?") is None
+    assert index.answer("How many direct reports have you managed?") is None
+    assert ExperienceIndex.from_resume({}, TODAY).answer("Years of experience?") is None
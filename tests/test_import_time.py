@@ -0,0 +1,75 @@
+"""
+Cold-start budget for the CLI and the web server.
+
+Each entry point is imported in a fresh interpreter under ``-X importtime``.
+The test fails when the import takes longer than its budget or loads one of
+the heavy dependencies that should only be imported on first use.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds for a cold import, with headroom for slow CI machines
+IMPORT_BUDGETS = {
+    "main": 1.5,
+    "run_web": 2.5,
+    "src.bots.bot_manager": 1.0,
+    "src.libs.recruiter_prep": 1.0,
+}
+
+HEAVY_MODULES = (
+    "selenium", "webdriver_manager", "langchain_core", "langchain_community", "langchain_openai",
+    "langchain_anthropic", "langchain_google_genai", "openai", "anthropic", "faiss", "numpy",
+)
+
+# Third-party modules each entry point needs before it can be imported at all
+REQUIRED = {
+    "main": ("inquirer", "click"),
+    "run_web": ("fastapi", "multipart"),
+}
+
+
+def _cold_import(module: str, cwd: Path = ROOT):
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _self, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                timings.append((int(cumulative) / 1e6, name.strip()))
+    total = next(seconds for seconds, name in reversed(timings) if name == module)
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return total, loaded, sorted(timings, reverse=True)[:10]
+
+
+@pytest.mark.parametrize("module", list(IMPORT_BUDGETS))
+def test_cold_import_stays_within_budget(module):
+    missing = [dep for dep in REQUIRED.get(module, ()) if importlib.util.find_spec(dep) is None]
+    if missing:
+        pytest.skip(f"{module} needs {', '.join(missing)}")
+
+    total, loaded, slowest = _cold_import(module)
+
+    assert not loaded, f"{module} imports {loaded} at start-up"
+    assert total <= IMPORT_BUDGETS[module], f"{module} took {total:.2f}s; slowest imports: {slowest}"
+
+
+def test_importing_logging_and_the_builder_has_no_side_effects(tmp_path):
+    _cold_import("src.logging", cwd=tmp_path)
+    _cold_import("src.libs.resume_and_cover_builder", cwd=tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,102 @@
+import pytest
+
+import config as cfg
+from src.job import Job
+from src.libs import job_dedup
+from src.libs.job_dedup import JobIndex, canonical_url, description_words, simhash
+
+DESCRIPTION = (
+    "We are hiring an Operations Manager to run our regional distribution centre. You will own "
+    "inventory planning, vendor management and the weekly S&OP process, lead a team of twelve "
+    "supervisors, and report warehouse KPIs to the VP of Supply Chain. Five years of operations "
+    "leadership and hands-on WMS experience are required; SAP and Lean certification are a plus."
+)
+
+
+def make_job(link="https://www.linkedin.com/jobs/view/1234567/", description=DESCRIPTION, **fields):
+    values = {"role": "Operations Manager", "company": "Acme", "location": "Dallas, TX"}
+    values.update(fields)
+    return Job(link=link, description=description, **values)
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    job_dedup.reset_dedup_stats()
+    yield
+    job_dedup.reset_dedup_stats()
+
+
+def test_canonical_url_drops_tracking_and_keeps_job_ids():
+    assert canonical_url("https://www.linkedin.com/jobs/view/1234567/?refId=abc&trk=public") == "linkedin.com/jobs/view/1234567"
+    assert canonical_url("https://linkedin.com/jobs/search/?currentJobId=1234567&keywords=ops") == "linkedin.com/jobs/view/1234567"
+    assert canonical_url("https://www.indeed.com/viewjob?jk=9f8e7d&from=serp&tk=1") == "indeed.com/viewjob?jk=9f8e7d"
+    assert canonical_url("https://www.indeed.com/rc/clk?vjk=9f8e7d") == "indeed.com/viewjob?jk=9f8e7d"
+    assert canonical_url("HTTPS://Careers.Acme.com/jobs/42/?utm_source=x#apply") == "careers.acme.com/jobs/42"
+    assert canonical_url("") == ""
+
+
+def test_simhash_is_close_for_light_edits_and_far_for_other_postings():
+    original = simhash(description_words(DESCRIPTION))
+    edited = simhash(description_words(DESCRIPTION.replace("twelve", "12") + " Apply today!"))
+    other = simhash(description_words(
+        "Senior backend engineer to build payment APIs in Go and Kubernetes. You will design event "
+        "driven services, own on-call for the ledger platform and mentor three junior engineers."
+    ))
+    assert bin(original ^ edited).count("1") <= 8
+    assert bin(original ^ other).count("1") > 16
+
+
+def test_index_drops_repeats_by_url_description_and_listing():
+    index = JobIndex(path=None)
+    first = make_job()
+    by_url = make_job(link="https://linkedin.com/jobs/view/1234567?trk=other-search", role="Ops Manager")
+    reposted = make_job(link="https://www.indeed.com/viewjob?jk=abc", description=DESCRIPTION + " Apply today!")
+    short = make_job(link="", description="Forklift driver, nights.", role="Forklift Driver")
+    short_again = make_job(link="", description="Forklift  driver, NIGHTS.", role="Forklift Driver")
+    unrelated = make_job(link="https://www.indeed.com/viewjob?jk=xyz", description="Barista wanted.", role="Barista")
+
+    kept = index.deduplicate([first, by_url, reposted, short, short_again, unrelated])
+
+    assert kept == [first, short, unrelated]
+    assert by_url.cluster_id == reposted.cluster_id == first.cluster_id
+    assert short_again.cluster_id == short.cluster_id != first.cluster_id
+    stats = job_dedup.dedup_stats()
+    assert stats["lookups"] == 6
+    assert stats["by_key"] == {"url": 1, "near_duplicate": 1, "listing": 1}
+    assert stats["dedupe_rate"] == 0.5
+
+
+def test_only_recorded_postings_persist_between_runs(tmp_path):
+    path = tmp_path / "job_index.sqlite3"
+    index = JobIndex(path=path)
+    run = JobIndex(path=None)
+    applied, skipped = make_job(), make_job(link="https://www.indeed.com/viewjob?jk=zzz", description="Barista wanted.")
+    assert index.deduplicate([applied, skipped], batch=run) == [applied, skipped]
+    assert index.deduplicate([make_job()], batch=run) == []
+    assert len(index) == 0
+    index.record(applied)
+    index.close()
+
+    reopened = JobIndex(path=path)
+    assert reopened.deduplicate([skipped]) == [skipped]
+    repeat = make_job(link="https://www.linkedin.com/jobs/view/1234567")
+    assert reopened.deduplicate([repeat]) == []
+    assert repeat.cluster_id
+    reopened.close()
+
+    expired = JobIndex(path=path, ttl_seconds=-1)
+    assert len(expired) == 0
+    expired.close()
+
+
+def test_shared_index_follows_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_dedup, "_shared_index", None)
+    monkeypatch.setattr(cfg, "JOB_DEDUP_ENABLED", False, raising=False)
+    assert job_dedup.get_job_index() is None
+
+    monkeypatch.setattr(cfg, "JOB_DEDUP_ENABLED", True)
+    monkeypatch.setattr(cfg, "JOB_DEDUP_PATH", str(tmp_path / "index.sqlite3"), raising=False)
+    index = job_dedup.get_job_index()
+    assert index is not None and index.path == tmp_path / "index.sqlite3"
+    assert job_dedup.get_job_index() is index
+    index.close()
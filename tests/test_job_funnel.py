@@ -0,0 +1,92 @@
+import pytest
+
+import config as cfg
+from src.job import Job
+from src.libs.ats_scorer import ATSScorer
+from src.libs.job_funnel import JobFunnel, funnel_stats, reset_funnel_stats
+
+RESUME = """
+experience_details:
+  - position: Operations Manager
+    key_responsibilities:
+      - responsibility: Ran warehouse inventory planning, vendor management and S&OP in SAP
+"""
+
+GOOD = "Operations Manager: inventory planning, vendor management, S&OP and SAP."
+PARTIAL = "Warehouse lead for inventory planning, forklift safety, shift scheduling and OSHA audits."
+OUT_OF_SCOPE = "Software Engineer, backend and frontend: Python, React, Kubernetes."
+
+
+class RecordingScorer(ATSScorer):
+    """Heuristic scoring from ATSScorer; LLM scoring records which descriptions reached it."""
+
+    def __init__(self, with_llm=True):
+        super().__init__(None)
+        self.ai_adapter = object() if with_llm else None
+        self.llm_calls = []
+
+    def score_jobs(self, resume_yaml_path, job_descriptions):
+        self.llm_calls.append(list(job_descriptions))
+        return [{"score": 90 - 10 * i, "match_summary": "llm"} for i, _jd in enumerate(job_descriptions)]
+
+
+@pytest.fixture
+def resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "ATS_FUNNEL_MIN_SCORE", 15)
+    monkeypatch.setattr(cfg, "ATS_FUNNEL_TOP_K", 10)
+    reset_funnel_stats()
+    path = tmp_path / "resume.yaml"
+    path.write_text(RESUME)
+    return path
+
+
+def _jobs():
+    return [
+        Job(role="Operations Manager", company="Acme", location="Denver, CO", description=GOOD),
+        Job(role="Operations Manager", company="Wayfair Inc", location="Boston, MA", description=GOOD),
+        Job(role="Senior Operations Manager", company="Beta", location="Rio, Brazil", description=GOOD),
+        Job(role="Operations Intern", company="Gamma", location="Austin, TX", description=GOOD),
+        Job(role="Software Engineer", company="Delta", location="Austin, TX", description=OUT_OF_SCOPE),
+        Job(role="Warehouse Lead", company="Epsilon", location="Reno, NV", description=PARTIAL),
+        Job(role="Barista", company="Zeta", location="Reno, NV", description="Espresso and latte art."),
+    ]
+
+
+CONFIG = {"company_blacklist": ["wayfair"], "title_blacklist": ["intern"], "location_blacklist": ["Brazil"]}
+
+
+def test_filter_drops_blacklisted_out_of_scope_and_weak_jobs(resume):
+    scorer = RecordingScorer()
+    result = JobFunnel(scorer, CONFIG, resume).run(_jobs())
+
+    assert result.rejected == {
+        "company_blacklist": 1, "title_blacklist": 1, "location_blacklist": 1, "out_of_scope": 1, "low_score": 1,
+    }
+    assert [job.company for job, _analysis in result.candidates] == ["Acme", "Epsilon"]
+    assert scorer.llm_calls == [[GOOD, PARTIAL]]
+    assert result.counts == {"filter": 7, "rank": 2, "score": 2, "candidates": 2}
+    assert set(result.seconds) == {"filter", "rank", "score"}
+
+
+def test_only_top_k_reach_the_llm_and_savings_are_reported(resume):
+    scorer = RecordingScorer()
+    result = JobFunnel(scorer, {**CONFIG, "funnel_top_k": 1}, resume).run(_jobs())
+
+    # The strongest heuristic match is the one sent on
+    assert scorer.llm_calls == [[GOOD]]
+    assert result.candidates[0][1]["match_summary"] == "llm"
+    stats = funnel_stats()
+    assert stats["llm_scored"] == 1 and stats["llm_saved"] == 6
+    assert stats["llm_saved_rate"] == round(6 / 7, 4)
+    assert stats["jobs"]["score"] == 1
+
+
+def test_without_llm_the_heuristic_analyses_are_final(resume):
+    scorer = RecordingScorer(with_llm=False)
+    result = JobFunnel(scorer, {}, resume).run(_jobs())
+
+    assert scorer.llm_calls == []
+    scores = [analysis["score"] for _job, analysis in result.candidates]
+    assert scores == sorted(scores, reverse=True)
+    assert "missing_keywords" in result.candidates[0][1]
+    assert funnel_stats()["llm_saved"] == 0
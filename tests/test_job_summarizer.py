@@ -0,0 +1,82 @@
+import re
+
+from langchain_core.messages.ai import AIMessage
+
+from src.job import Job
+from src.libs.job_summarizer import JobSummarizer, JobSummaryCache
+
+TEMPLATE = "Summarize this job.\n\n{text}\n\nSummary:"
+
+
+class BatchingLLM:
+    """Replies to batched prompts with one marked summary per job description."""
+
+    def __init__(self, drop=()):
+        self.prompts = []
+        self.drop = set(drop)
+
+    def __call__(self, prompt):
+        text = prompt if isinstance(prompt, str) else prompt.to_string()
+        self.prompts.append(text)
+        jobs = re.findall(r"=== JOB DESCRIPTION (\d+) ===\n(.+)", text)
+        if not jobs:
+            body = text.split("Summarize this job.")[1].split("Summary:")[0].strip()
+            return AIMessage(content=f"summary of {body}")
+        parts = [f"### JOB {n}\nsummary of {desc}" for n, desc in jobs if desc not in self.drop]
+        return AIMessage(content="\n\n".join(parts))
+
+
+def _summarizer(tmp_path, llm, **kwargs):
+    cache = JobSummaryCache(tmp_path / "summaries.sqlite3")
+    return JobSummarizer(llm, TEMPLATE, cache=cache, **kwargs), cache
+
+
+def test_summarize_many_packs_jobs_and_caches_results(tmp_path):
+    llm = BatchingLLM()
+    summarizer, cache = _summarizer(tmp_path, llm, max_jobs_per_request=3)
+    descriptions = [f"job {i}" for i in range(7)] + ["job 0"]
+
+    summaries = summarizer.summarize_many(descriptions)
+
+    assert summaries == [f"summary of job {i}" for i in range(7)] + ["summary of job 0"]
+    assert summarizer.requests == 3  # 3 + 3 + 1 unique descriptions
+    assert summarizer.summarize("job 4") == "summary of job 4"
+    assert summarizer.requests == 3
+
+
+def test_token_budget_limits_batch_size(tmp_path):
+    llm = BatchingLLM()
+    summarizer, _ = _summarizer(tmp_path, llm, token_budget=100, max_jobs_per_request=10)
+
+    summarizer.summarize_many(["x" * 100, "y" * 100, "z" * 100])
+
+    assert summarizer.requests == 2
+
+
+def test_jobs_missing_from_batch_reply_are_retried_alone(tmp_path):
+    llm = BatchingLLM(drop={"job b"})
+    summarizer, _ = _summarizer(tmp_path, llm)
+
+    summaries = summarizer.summarize_many(["job a", "job b", "job c"])
+
+    assert summaries == ["summary of job a", "summary of job b", "summary of job c"]
+    assert summarizer.requests == 2
+
+
+def test_cache_is_shared_by_template_and_persists(tmp_path):
+    first, _ = _summarizer(tmp_path, BatchingLLM())
+    first.summarize("job a")
+
+    llm = BatchingLLM()
+    reopened = JobSummarizer(llm, TEMPLATE, cache=JobSummaryCache(tmp_path / "summaries.sqlite3"))
+    other_template = JobSummarizer(llm, "Other.\n{text}", cache=reopened.cache)
+
+    assert reopened.summarize("job a") == "summary of job a"
+    assert llm.prompts == []
+    assert other_template._key("job a") != reopened._key("job a")
+
+
+def test_job_summary_setter():
+    job = Job(role="Engineer", description="Build things")
+    job.set_summarize_job_description("Builds things")
+    assert job.summarize_job_description == "Builds things"
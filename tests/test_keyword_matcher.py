@@ -0,0 +1,64 @@
+import os
+
+from src.libs.ats_scorer import ATSScorer
+from src.libs.keyword_matcher import KeywordMatcher, dictionary_matcher, load_dictionaries
+
+DICTIONARIES = {
+    "in_scope": ["supply chain", "chain planning", "supply chain planning", "erp", "s&op"],
+    "out_of_scope": ["full stack", "c++", "erp"],
+}
+
+
+def test_matches_overlapping_phrases_on_word_boundaries():
+    hits = KeywordMatcher(DICTIONARIES).match("Supply-chain planning in our ERP; S&OP. Full-stack C++ devs welcome.")
+    assert hits == {
+        "in_scope": ["supply chain", "chain planning", "supply chain planning", "erp", "s&op"],
+        # A term in several categories keeps the position of its first definition
+        "out_of_scope": ["erp", "full stack", "c++"],
+    }
+    # No matches inside words
+    assert KeywordMatcher(DICTIONARIES).match("interpersonal supply-chained") == {"in_scope": [], "out_of_scope": []}
+
+
+def test_hit_matrix_agrees_with_match():
+    matcher = KeywordMatcher(DICTIONARIES)
+    texts = ["erp and s&op", "nothing relevant", "supply chain planning"]
+    matrix = matcher.hit_matrix(texts)
+    assert matrix.shape == (3, len(matcher.terms))
+    for row, text in enumerate(texts):
+        found = [term for term, hit in zip(matcher.terms, matrix[row]) if hit]
+        assert sorted(found) == sorted(set(sum(matcher.match(text).values(), [])))
+    in_scope = matcher.category_mask("in_scope")
+    assert (matrix & in_scope).sum(axis=1).tolist() == [2, 0, 3]
+
+
+def test_dictionary_file_replaces_categories_and_reloads_on_change(tmp_path):
+    path = tmp_path / "keyword_dictionaries.yaml"
+    path.write_text("in_scope:\n  - clinical trials\ntools:\n  - veeva\n")
+    matcher = dictionary_matcher(path, DICTIONARIES)
+    assert load_dictionaries(path) == {"in_scope": ["clinical trials"], "tools": ["veeva"]}
+    assert matcher.categories == ["in_scope", "out_of_scope", "tools"]
+    assert matcher.match("Clinical trials in Veeva, ERP")["in_scope"] == ["clinical trials"]
+    assert dictionary_matcher(path, DICTIONARIES) is matcher
+
+    path.write_text("in_scope:\n  - pharmacovigilance\n")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert dictionary_matcher(path, DICTIONARIES).match("pharmacovigilance")["in_scope"] == ["pharmacovigilance"]
+
+    path.write_text("in_scope: not a list\n")
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert dictionary_matcher(path, DICTIONARIES).match("erp")["in_scope"] == ["erp"]
+
+
+def test_role_alignment_uses_profile_dictionaries(tmp_path):
+    path = tmp_path / "keyword_dictionaries.yaml"
+    path.write_text("in_scope:\n  - clinical trials\nout_of_scope:\n  - sales quota\n  - cold calling\ntools:\n  - veeva\n")
+    scorer = ATSScorer(None)
+    scorer.dictionaries_path = str(path)
+
+    notes = scorer._compute_role_alignment("Ran clinical trials", "Clinical trials lead using Veeva")["notes"]
+    assert notes["in_scope_hits"] == ["clinical trials"] and notes["resume_strength_hits"] == ["clinical trials"]
+    assert notes["dictionary_hits"] == {"tools": ["veeva"]}
+
+    mismatch = scorer._compute_role_alignment("Ran clinical trials", "Sales rep: cold calling to hit a sales quota")
+    assert mismatch["hard_mismatch"]
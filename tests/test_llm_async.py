@@ -0,0 +1,50 @@
+import asyncio
+
+from langchain_core.messages.ai import AIMessage
+
+import config as cfg
+from src.libs.llm_manager import AIAdapter, AIModel
+
+
+class FakeAsyncModel(AIModel):
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def invoke(self, prompt):
+        return AIMessage(content=f"sync:{prompt}")
+
+    async def ainvoke(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return AIMessage(content=f"async:{prompt}")
+
+
+def _adapter(monkeypatch, provider):
+    model = FakeAsyncModel()
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", provider)
+    monkeypatch.setattr(cfg, "LLM_PROVIDER_CONCURRENCY", {provider: 2})
+    monkeypatch.setattr(AIAdapter, "_create_model", lambda self, config, api_key: model)
+    return AIAdapter({}, "key"), model
+
+
+def test_batch_preserves_order_and_caps_concurrency(monkeypatch):
+    adapter, model = _adapter(monkeypatch, "fake-batch")
+
+    replies = adapter.batch([f"p{i}" for i in range(6)])
+
+    assert [r.content for r in replies] == [f"async:p{i}" for i in range(6)]
+    assert model.max_in_flight == 2
+
+
+def test_ainvoke_from_caller_event_loop(monkeypatch):
+    adapter, _model = _adapter(monkeypatch, "fake-ainvoke")
+
+    async def _call():
+        return await adapter.abatch(["a", "b"])
+
+    replies = asyncio.run(_call())
+    assert [r.content for r in replies] == ["async:a", "async:b"]
@@ -0,0 +1,76 @@
+import time
+
+from langchain_core.messages.ai import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.libs.llm_cache import LLMResponseCache, render_prompt
+
+
+def _message(text: str) -> AIMessage:
+    return AIMessage(
+        content=text,
+        response_metadata={"model_name": "test-model"},
+        usage_metadata={"input_tokens": 3, "output_tokens": 2, "total_tokens": 5},
+        id="run-1",
+    )
+
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite3")
+    key = cache.make_key("hello", "gemini", "gemini-2.5-flash", 0.4)
+
+    assert cache.get(key) is None
+    cache.put(key, _message("world"), provider="gemini", model="gemini-2.5-flash")
+
+    cached = cache.get(key)
+    assert cached.content == "world"
+    assert cached.usage_metadata["total_tokens"] == 5
+    assert cached.response_metadata["model_name"] == "test-model"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_key_depends_on_provider_model_and_temperature():
+    base = LLMResponseCache.make_key("prompt", "openai", "gpt-4o-mini", 0.4)
+    assert base == LLMResponseCache.make_key("prompt", "openai", "gpt-4o-mini", 0.4)
+    assert base != LLMResponseCache.make_key("prompt", "claude", "gpt-4o-mini", 0.4)
+    assert base != LLMResponseCache.make_key("prompt", "openai", "gpt-4o", 0.4)
+    assert base != LLMResponseCache.make_key("prompt", "openai", "gpt-4o-mini", 0.0)
+
+
+def test_render_prompt_handles_prompt_values():
+    prompt = ChatPromptTemplate.from_template("Question: {question}")
+    rendered = render_prompt(prompt.invoke({"question": "Why?"}))
+    assert "Question: Why?" in rendered
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite3", ttl_seconds=0.01)
+    key = cache.make_key("hello", "gemini", "m", 0.4)
+    cache.put(key, _message("world"))
+    time.sleep(0.05)
+
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite3", max_entries=2)
+    keys = [cache.make_key(f"p{i}", "gemini", "m", 0.4) for i in range(3)]
+
+    cache.put(keys[0], _message("a"))
+    time.sleep(0.01)
+    cache.put(keys[1], _message("b"))
+    time.sleep(0.01)
+    cache.get(keys[0])
+    time.sleep(0.01)
+    cache.put(keys[2], _message("c"))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]).content == "a"
+    assert cache.get(keys[2]).content == "c"
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,90 @@
+import json
+
+from src.libs.llm_call_log import LLMCallLogWriter, iter_entries, summarize
+
+
+def _entry(day, model, latency, tokens=100):
+    return {
+        "model": model,
+        "time": f"{day} 12:00:00",
+        "prompts": "p",
+        "replies": "r",
+        "input_tokens": tokens,
+        "output_tokens": tokens // 2,
+        "total_tokens": tokens + tokens // 2,
+        "total_cost": 0.001,
+        "latency_seconds": latency,
+    }
+
+
+def test_writer_appends_one_json_line_per_entry(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    writer = LLMCallLogWriter(path)
+    for i in range(3):
+        writer.write(_entry("2026-03-01", "gpt-4o-mini", 0.1 * (i + 1)))
+    writer.flush()
+    writer.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[0])["model"] == "gpt-4o-mini"
+
+
+def test_rotation_keeps_backups_and_reader_sees_everything(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    writer = LLMCallLogWriter(path, max_bytes=1, backup_count=2, batch_size=1)
+    for _ in range(5):
+        writer.write(_entry("2026-03-01", "m", 1.0))
+        writer.flush()
+    writer.close()
+
+    rotated = sorted(p.name for p in tmp_path.glob("calls.*.jsonl"))
+    assert rotated == ["calls.1.jsonl", "calls.2.jsonl"]
+    assert len(list(iter_entries(path))) == 2
+
+
+def test_summarize_groups_by_day_and_model():
+    entries = [
+        _entry("2026-03-01", "a", 1.0),
+        _entry("2026-03-01", "a", 3.0),
+        _entry("2026-03-01", "b", 2.0),
+        _entry("2026-03-02", "a", 5.0),
+    ]
+
+    rows = summarize(entries, since="2026-03-01", model="a")
+
+    assert [(r["day"], r["calls"]) for r in rows] == [("2026-03-01", 2), ("2026-03-02", 1)]
+    assert rows[0]["input_tokens"] == 200
+    assert rows[0]["avg_latency_seconds"] == 2.0
+    assert rows[0]["total_cost"] == 0.002
+
+
+def test_cached_replies_are_logged_without_usage_or_cost(monkeypatch, tmp_path):
+    import config as cfg
+    from src.libs.llm_cache import LLMResponseCache
+    from src.libs.llm_call_log import get_call_log_writer
+    from src.libs.llm_manager import AIAdapter, LoggerChatModel
+    from src.libs.prompt_cache import prompt_cache_stats, reset_prompt_cache_stats
+
+    log_path = tmp_path / "calls.jsonl"
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "stub")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "gpt-4o-mini")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {})
+    monkeypatch.setattr(cfg, "LLM_CALL_LOG_PATH", str(log_path))
+    reset_prompt_cache_stats()
+    adapter = AIAdapter({}, "")
+    adapter.cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+    adapter.model.reply = "Operations"
+    chat = LoggerChatModel(adapter, task="cached_task")
+
+    chat("Which section?")
+    chat("Which section?")
+    get_call_log_writer(log_path).flush()
+
+    first, second = list(iter_entries(log_path))
+    assert first["total_cost"] > 0 and first["input_tokens"] > 0
+    assert second["cache_hit"] is True
+    assert (second["total_cost"], second["input_tokens"], second["total_tokens"]) == (0.0, 0, 0)
+    assert prompt_cache_stats()["cached_task"]["calls"] == 1
+    reset_prompt_cache_stats()
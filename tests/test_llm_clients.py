@@ -0,0 +1,55 @@
+import pytest
+
+import config as cfg
+from src.libs.llm_clients import client_registry_stats, invalidate_clients, reset_client_registry_stats
+from src.libs.llm_manager import AIAdapter
+from src.libs.model_router import ModelRouter
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "openai")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "gpt-4o")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    invalidate_clients()
+    reset_client_registry_stats()
+    yield
+    invalidate_clients()
+    reset_client_registry_stats()
+
+
+def test_adapters_with_the_same_key_share_one_client():
+    first = AIAdapter({}, "sk-test-one")
+    second = AIAdapter({}, "sk-test-one")
+    other_key = AIAdapter({}, "sk-test-two")
+
+    assert second.model is first.model
+    assert other_key.model is not first.model
+    stats = client_registry_stats()
+    assert (stats["builds"], stats["hits"]) == (2, 1)
+    assert stats["saved_seconds"] > 0
+    assert "sk-test" not in str(stats)
+
+
+def test_invalidation_forces_a_rebuild():
+    before = AIAdapter({}, "sk-test").model
+
+    assert invalidate_clients() == 1
+    assert AIAdapter({}, "sk-test").model is not before
+    assert client_registry_stats()["invalidations"] == 1
+
+
+def test_stub_models_are_not_shared(monkeypatch):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "stub")
+
+    assert AIAdapter({}, "").model is not AIAdapter({}, "").model
+    assert client_registry_stats()["builds"] == 0
+
+
+def test_router_warm_builds_every_tier_model(monkeypatch):
+    monkeypatch.setattr(cfg, "LLM_TASK_TIERS", {"job_summary": "fast", "tailoring": "strong"})
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {"fast": {"openai": "gpt-4o-mini"}, "strong": {}})
+
+    ModelRouter({}, "sk-test").warm()
+
+    assert client_registry_stats()["clients"] == ["openai/gpt-4o", "openai/gpt-4o-mini"]
@@ -0,0 +1,105 @@
+import pytest
+
+import config as cfg
+from src.libs import llm_failover, llm_rate_limiter
+from src.libs.llm_failover import LLMFailoverError, parse_provider_entries
+from src.libs.llm_manager import AIAdapter
+
+
+def _adapter(monkeypatch, fallbacks, **settings):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "stub")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "primary")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_FAILOVER_MAX_RETRIES", 0)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {})
+    for name, value in settings.items():
+        monkeypatch.setattr(cfg, name, value)
+    monkeypatch.setattr(llm_rate_limiter, "_limiters", {})
+    llm_failover.reset_provider_health()
+    return AIAdapter({"llm_providers": fallbacks}, "")
+
+
+def test_parse_provider_entries_defaults_keys_and_keeps_order():
+    secrets = {
+        "openai_api_key": "sk-openai",
+        "llm_api_key": "generic",
+        "llm_providers": [
+            {"provider": "OpenAI", "model": "gpt-4o-mini"},
+            {"provider": "claude", "model": "haiku", "api_key": "explicit"},
+            {"provider": "gemini", "model": "flash"},
+            {"model": "no-provider"},
+            {"provider": "stub", "reply": "ok"},
+        ],
+    }
+
+    entries = parse_provider_entries(secrets)
+
+    assert [(e.provider, e.model, e.api_key) for e in entries] == [
+        ("openai", "gpt-4o-mini", "sk-openai"),
+        ("claude", "haiku", "explicit"),
+        ("gemini", "flash", "generic"),
+        ("stub", "", "generic"),
+    ]
+    assert entries[-1].options == {"reply": "ok"}
+
+
+def test_fails_over_to_next_provider_and_records_health(monkeypatch):
+    adapter = _adapter(monkeypatch, [{"provider": "stub", "model": "backup", "reply": "from backup"}])
+    adapter.model.error = "429 quota exceeded"
+
+    reply = adapter.invoke("Summarise this job")
+
+    assert reply.content == "from backup"
+    health = adapter.provider_health()
+    assert list(health) == ["stub/primary", "stub/backup"]
+    assert health["stub/primary"]["failures"] == 1
+    assert health["stub/primary"]["failovers"] == 1
+    assert "quota exceeded" in health["stub/primary"]["last_error"]
+    assert health["stub/backup"]["successes"] == 1
+
+
+def test_slow_provider_times_out_and_fails_over(monkeypatch):
+    adapter = _adapter(
+        monkeypatch,
+        [{"provider": "stub", "model": "backup", "reply": "fast"}],
+        LLM_FAILOVER_TIMEOUT_SECONDS=0.05,
+    )
+    adapter.model.delay_seconds = 1.0
+
+    assert adapter.invoke("hello").content == "fast"
+    assert adapter.provider_health()["stub/primary"]["timeouts"] == 1
+
+
+def test_hedges_to_backup_when_primary_exceeds_its_p95(monkeypatch):
+    adapter = _adapter(
+        monkeypatch,
+        [{"provider": "stub", "model": "backup", "reply": "hedged"}],
+        LLM_HEDGE_ENABLED=True,
+        LLM_HEDGE_MIN_SAMPLES=3,
+    )
+    for _ in range(3):
+        adapter.backends[0].health.record_success(0.01)
+    adapter.model.delay_seconds = 1.0
+
+    assert adapter.invoke("hello").content == "hedged"
+    primary = adapter.provider_health()["stub/primary"]
+    assert primary["hedges"] == 1
+    assert primary["hedge_wins"] == 1
+
+
+def test_raises_when_every_provider_fails(monkeypatch):
+    adapter = _adapter(monkeypatch, [{"provider": "stub", "model": "backup", "error": "down"}])
+    adapter.model.error = "down too"
+
+    with pytest.raises(LLMFailoverError):
+        adapter.invoke("hello")
+
+
+def test_single_provider_errors_propagate_unchanged(monkeypatch):
+    adapter = _adapter(monkeypatch, [])
+    monkeypatch.setattr(adapter.rate_limiter, "max_retries", 0)
+    adapter.model.error = "boom"
+
+    with pytest.raises(ConnectionError):
+        adapter.invoke("hello")
+    assert adapter.provider_health()["stub/primary"]["failures"] == 1
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import pytest
+
+from src.libs.llm_rate_limiter import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMCallTimeout,
+    LLMDeadlineExceeded,
+    ProviderRateLimiter,
+    TokenBucket,
+    acall_with_retry,
+    call_with_retry,
+    is_retryable,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+def _limiter(**kwargs):
+    defaults = dict(rpm=6000, tpm=10_000_000, base_delay=0.001, max_delay=0.002)
+    defaults.update(kwargs)
+    return ProviderRateLimiter("test", **defaults)
+
+
+def test_token_bucket_reports_wait_once_empty():
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_retries_transient_errors_then_succeeds():
+    limiter = _limiter()
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise FakeHTTPError(429, {"retry-after-ms": "1"})
+        return "ok"
+
+    result, report = call_with_retry(flaky, limiter)
+
+    assert result == "ok"
+    assert report.attempts == 3
+    assert limiter.stats()["retries"] == 2
+
+
+def test_client_errors_are_not_retried():
+    limiter = _limiter()
+    assert not is_retryable(FakeHTTPError(401))
+    assert is_retryable(FakeHTTPError(503))
+
+    with pytest.raises(FakeHTTPError):
+        call_with_retry(lambda: (_ for _ in ()).throw(FakeHTTPError(400)), limiter)
+    assert limiter.stats()["failures"] == 1
+
+
+def test_deadline_stops_retrying():
+    limiter = _limiter(base_delay=5, max_delay=5)
+
+    def always_fails():
+        raise FakeHTTPError(500)
+
+    with pytest.raises(LLMDeadlineExceeded):
+        call_with_retry(always_fails, limiter, deadline=0.5)
+
+
+def test_circuit_breaker_fails_fast_after_threshold():
+    limiter = _limiter(max_retries=0, breaker_threshold=2, breaker_reset_seconds=60)
+
+    def always_fails():
+        raise FakeHTTPError(500)
+
+    for _ in range(2):
+        with pytest.raises(FakeHTTPError):
+            call_with_retry(always_fails, limiter)
+
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(lambda: "ok", limiter)
+    assert limiter.stats()["circuit_state"] == "open"
+
+
+def test_queue_wait_is_reported_when_rpm_is_exhausted():
+    limiter = ProviderRateLimiter("slow", rpm=600, tpm=10_000_000)
+    limiter.requests.tokens = 0
+
+    async def call():
+        return "ok"
+
+    result, report = asyncio.run(acall_with_retry(call, limiter))
+
+    assert result == "ok"
+    assert report.queue_wait_seconds > 0
+    assert limiter.stats()["max_queue_wait_seconds"] > 0
+
+
+def test_hung_calls_are_cut_off_at_the_deadline():
+    assert is_retryable(LLMCallTimeout("test: no reply within 0.2s"))
+    limiter = _limiter(max_retries=0)
+
+    async def hangs():
+        await asyncio.sleep(10)
+
+    started = time.monotonic()
+    with pytest.raises(LLMCallTimeout):
+        asyncio.run(acall_with_retry(hangs, limiter, deadline=0.2))
+    with pytest.raises(LLMCallTimeout):
+        call_with_retry(lambda: time.sleep(10), limiter, deadline=0.2)
+    assert time.monotonic() - started < 2
+    assert limiter.stats()["failures"] == 2
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
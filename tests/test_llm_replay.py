@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+import config as cfg
+from src.libs import llm_rate_limiter
+from src.libs.llm_manager import AIAdapter
+from src.libs.llm_replay import ReplayMissError, ReplayStore
+
+
+def _adapter(monkeypatch, tmp_path, mode, **settings):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "replay")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "recorded-model")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {})
+    monkeypatch.setattr(cfg, "LLM_REPLAY_MODE", mode)
+    monkeypatch.setattr(cfg, "LLM_REPLAY_PATH", str(tmp_path / "replay.jsonl"))
+    monkeypatch.setattr(cfg, "LLM_REPLAY_UPSTREAM", ("stub", "upstream"))
+    for name, value in settings.items():
+        monkeypatch.setattr(cfg, name, value)
+    monkeypatch.setattr(llm_rate_limiter, "_limiters", {})
+    # A fresh store per adapter, as in a new process
+    monkeypatch.setattr("src.libs.llm_replay._stores", {})
+    return AIAdapter({}, "")
+
+
+def test_record_then_replay_offline(monkeypatch, tmp_path):
+    recorder = _adapter(monkeypatch, tmp_path, "record")
+    recorded = recorder.invoke("Score this job")
+    assert recorder.model.store.stats()["recorded"] == 1
+
+    player = _adapter(monkeypatch, tmp_path, "replay")
+    assert player.model.upstream is None
+    replayed = player.invoke("Score this job")
+
+    assert replayed.content == recorded.content
+    assert replayed.usage_metadata["output_tokens"] == recorded.usage_metadata["output_tokens"]
+    assert len(ReplayStore(tmp_path / "replay.jsonl")) == 1
+
+
+def test_replay_miss_raises_or_falls_back_to_stub(monkeypatch, tmp_path):
+    player = _adapter(monkeypatch, tmp_path, "replay")
+    with pytest.raises(ReplayMissError):
+        player.invoke("never recorded")
+
+    lenient = _adapter(monkeypatch, tmp_path, "replay", LLM_REPLAY_ON_MISS="stub")
+    assert "never recorded" in lenient.invoke("never recorded").content
+
+
+def test_synthetic_latency_and_token_scale(monkeypatch, tmp_path):
+    _adapter(monkeypatch, tmp_path, "record").invoke("prompt")
+    base = _adapter(monkeypatch, tmp_path, "replay").invoke("prompt").usage_metadata
+
+    player = _adapter(
+        monkeypatch, tmp_path, "replay", LLM_REPLAY_LATENCY_SECONDS=0.05, LLM_REPLAY_TOKEN_SCALE=3.0
+    )
+    started = time.monotonic()
+    reply = player.invoke("prompt")
+
+    assert time.monotonic() - started >= 0.05
+    assert reply.usage_metadata["input_tokens"] == base["input_tokens"] * 3
+    assert reply.usage_metadata["total_tokens"] == (
+        reply.usage_metadata["input_tokens"] + reply.usage_metadata["output_tokens"]
+    )
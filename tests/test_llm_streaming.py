@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from langchain_core.messages.ai import AIMessageChunk
+from pydantic import BaseModel
+
+import config as cfg
+from src.libs import llm_failover, llm_rate_limiter
+from src.libs.llm_cache import LLMResponseCache
+from src.libs.llm_failover import EmptyStreamError
+from src.libs.llm_async import run_sync, stream_on_llm_loop
+from src.libs.llm_manager import AIAdapter
+from src.libs.structured_output import StructuredOutput, reset_structured_output_stats
+
+
+class Briefing(BaseModel):
+    summary: str
+    talking_points: list = []
+
+
+def _adapter(monkeypatch, reply, fallbacks=()):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "stub")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "primary")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_FAILOVER_MAX_RETRIES", 0)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {})
+    monkeypatch.setattr(llm_rate_limiter, "_limiters", {})
+    llm_failover.reset_provider_health()
+    adapter = AIAdapter({"llm_providers": list(fallbacks)}, "")
+    adapter.model.reply = reply
+    return adapter
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+def test_streamed_chunks_join_to_the_full_reply(monkeypatch):
+    adapter = _adapter(monkeypatch, "Dear Hiring Manager, I am writing to apply for the role.")
+
+    chunks = asyncio.run(_collect(adapter.astream("Write a cover letter")))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == adapter.invoke("Write a cover letter").content
+
+
+def test_fails_over_before_the_first_chunk(monkeypatch):
+    adapter = _adapter(monkeypatch, "unused", [{"provider": "stub", "model": "backup", "reply": "from the backup"}])
+    adapter.model.error = "503 unavailable"
+
+    chunks = asyncio.run(_collect(adapter.astream("Brief me")))
+
+    assert "".join(chunks) == "from the backup"
+    assert adapter.provider_health()["stub/primary"]["failovers"] == 1
+
+
+class FlakyStream:
+    """Fails the first ``failures`` requests, then streams ``chunks``."""
+
+    def __init__(self, chunks, failures=0):
+        self.chunks = chunks
+        self.failures = failures
+        self.requests = 0
+
+    async def astream(self, prompt):
+        self.requests += 1
+        if self.requests <= self.failures:
+            raise ConnectionError("503 unavailable")
+        for chunk in self.chunks:
+            yield AIMessageChunk(content=chunk)
+
+
+def _flaky_adapter(monkeypatch, tmp_path, model):
+    adapter = _adapter(monkeypatch, "unused")
+    adapter.backends[0].model = model
+    adapter.backends[0].rate_limiter.max_retries = 2
+    adapter.backends[0].rate_limiter.base_delay = 0.001
+    adapter.cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+    return adapter
+
+
+def test_retry_sends_the_request_again_on_a_new_stream(monkeypatch, tmp_path):
+    model = FlakyStream(["Dear ", "Hiring Manager"], failures=1)
+    adapter = _flaky_adapter(monkeypatch, tmp_path, model)
+
+    chunks = asyncio.run(_collect(adapter.astream("Write a cover letter")))
+
+    assert model.requests == 2
+    assert "".join(chunks) == "Dear Hiring Manager"
+    assert adapter.cache.stats()["entries"] == 1
+
+
+def test_empty_stream_fails_and_is_not_cached(monkeypatch, tmp_path):
+    model = FlakyStream([])
+    adapter = _flaky_adapter(monkeypatch, tmp_path, model)
+
+    with pytest.raises(EmptyStreamError):
+        asyncio.run(_collect(adapter.astream("Write a cover letter")))
+
+    assert model.requests == 3
+    assert adapter.cache.stats()["entries"] == 0
+    assert adapter.provider_health()["stub/primary"]["failures"] == 1
+
+
+def test_structured_stream_yields_partials_then_the_result(monkeypatch):
+    reset_structured_output_stats()
+    reply = '{"summary": "Logistics leader with strong vendor management", "talking_points": ["S&OP", "SAP"]}'
+    adapter = _adapter(monkeypatch, reply)
+
+    events = asyncio.run(_collect(StructuredOutput(Briefing, "briefing").astream(adapter, "Brief me")))
+
+    kinds = [kind for kind, _value in events]
+    assert kinds[-1] == "result" and kinds.count("partial") >= 2
+    assert events[-1][1] == Briefing.model_validate_json(reply)
+    assert events[-2][1]["talking_points"] == ["S&OP", "SAP"]
+
+
+def test_stream_on_llm_loop_relays_across_event_loops():
+    async def produce():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield i
+
+    async def consume():
+        return [item async for item in stream_on_llm_loop(produce())]
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+    assert run_sync(consume(), timeout=5) == [0, 1, 2]
@@ -0,0 +1,119 @@
+from langchain_core.messages.ai import AIMessage
+
+import config as cfg
+from src.libs import job_summarizer, model_router
+from src.libs.job_summarizer import JobSummaryCache
+from src.libs.llm_manager import AIAdapter, AIModel, GPTAnswerer
+from src.libs.model_router import (
+    ATS_SCORING,
+    DEFAULT_TIER,
+    JOB_SUMMARY,
+    SECTION_CLASSIFICATION,
+    TAILORING,
+    ModelRouter,
+    resolve_task_model,
+)
+
+
+TASK_TIERS = {SECTION_CLASSIFICATION: "fast", JOB_SUMMARY: "fast", TAILORING: "strong"}
+MODEL_TIERS = {
+    "fast": {"fake": "fake-mini"},
+    "standard": {},
+    "strong": {"fake": "fake-pro", "other": "other-pro"},
+}
+
+
+class RecordingModel(AIModel):
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return AIMessage(
+            content="Personal information",
+            usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+        )
+
+
+def _configure(monkeypatch, tmp_path):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "fake")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "fake-default")
+    monkeypatch.setattr(cfg, "LLM_TASK_TIERS", TASK_TIERS)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", MODEL_TIERS)
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "ANSWER_MEMORY_ENABLED", False)
+    monkeypatch.setattr(cfg, "SECTION_ROUTER_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_CALL_LOG_PATH", str(tmp_path / "calls.jsonl"))
+    monkeypatch.setattr(job_summarizer, "_cache", JobSummaryCache(tmp_path / "summaries.sqlite3"))
+    models = {}
+
+    def create_model(self, config, api_key):
+        return models.setdefault(self.model_name, RecordingModel(self.model_name))
+
+    monkeypatch.setattr(AIAdapter, "_create_model", create_model)
+    model_router.reset_tier_stats()
+    return models
+
+
+def test_resolve_task_model_uses_tier_for_active_provider(monkeypatch, tmp_path):
+    _configure(monkeypatch, tmp_path)
+
+    assert resolve_task_model(SECTION_CLASSIFICATION) == ("fast", "fake", "fake-mini")
+    assert resolve_task_model(TAILORING) == ("strong", "fake", "fake-pro")
+    # Unlisted task, and a tier without a model for this provider, use LLM_MODEL
+    assert resolve_task_model(ATS_SCORING) == (DEFAULT_TIER, "fake", "fake-default")
+    assert resolve_task_model(None) == (DEFAULT_TIER, "fake", "fake-default")
+
+
+def test_tier_falls_back_to_default_model_for_other_provider(monkeypatch, tmp_path):
+    _configure(monkeypatch, tmp_path)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "other")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "other-default")
+
+    assert resolve_task_model(SECTION_CLASSIFICATION) == ("fast", "other", "other-default")
+    assert resolve_task_model(TAILORING) == ("strong", "other", "other-pro")
+
+
+def test_router_reuses_one_adapter_per_tier(monkeypatch, tmp_path):
+    _configure(monkeypatch, tmp_path)
+    router = ModelRouter({}, "key")
+
+    fast = router.for_task(SECTION_CLASSIFICATION)
+    assert router.for_task(JOB_SUMMARY) is fast
+    assert router.for_task(TAILORING) is not fast
+    assert (fast.tier, fast.model_name) == ("fast", "fake-mini")
+
+
+def test_warm_skips_tasks_whose_client_fails(monkeypatch, tmp_path):
+    _configure(monkeypatch, tmp_path)
+    router = ModelRouter({}, "key")
+    built = []
+    for_task = router.for_task
+
+    def failing_for_task(task):
+        if task == SECTION_CLASSIFICATION:
+            raise RuntimeError("no client")
+        built.append(task)
+        return for_task(task)
+
+    monkeypatch.setattr(router, "for_task", failing_for_task)
+    router.warm()
+    assert built == [None, JOB_SUMMARY, TAILORING]
+
+
+def test_gpt_answerer_routes_templates_and_records_tier_stats(monkeypatch, tmp_path):
+    models = _configure(monkeypatch, tmp_path)
+    answerer = GPTAnswerer({}, "key")
+
+    answerer.summarize_job_description("We need a forklift operator.")
+    answerer.determine_section("What is your phone number?")
+
+    assert len(models["fake-mini"].prompts) == 2
+    assert "fake-default" not in models or not models["fake-default"].prompts
+
+    stats = model_router.tier_stats()
+    assert stats["fast"]["calls"] == 2
+    assert stats["fast"]["input_tokens"] == 20
+    assert stats["fast"]["models"] == {"fake-mini": 2}
+    assert stats["fast"]["avg_latency_seconds"] is not None
@@ -0,0 +1,91 @@
+from langchain_core.messages import HumanMessage
+from langchain_core.messages.ai import AIMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+import config as cfg
+from src.libs import llm_rate_limiter
+from src.libs.llm_manager import AIAdapter, prompt_registry
+from src.libs.prompt_cache import (
+    CACHE_BREAKPOINT,
+    cached_input_tokens,
+    prepare_prompt,
+    prompt_cache_stats,
+    record_prompt_cache,
+    reset_prompt_cache_stats,
+)
+from src.libs.resume_context import ResumeContext
+
+PROMPT = f"Instructions\nRESUME:\nAda, operations manager\n{CACHE_BREAKPOINT}\nJOB: Planner at Acme"
+
+
+def test_template_puts_resume_before_the_breakpoint_and_job_after():
+    prompt = prompt_registry.get("is_relavant_position_template").invoke(
+        {"resume": "RESUME TEXT", "job_description": "JOB TEXT"}
+    )
+    text = prompt.messages[0].content
+
+    assert text.index("RESUME TEXT") < text.index(CACHE_BREAKPOINT) < text.index("JOB TEXT")
+
+
+def test_prepare_strips_marker_or_adds_claude_cache_control():
+    assert prepare_prompt(PROMPT) == "Instructions\nRESUME:\nAda, operations manager\nJOB: Planner at Acme"
+
+    chat = ChatPromptValue(messages=[HumanMessage(content=PROMPT)])
+    blocks = prepare_prompt(chat, cache_control=True).messages[0].content
+
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert blocks[0]["text"].endswith("operations manager\n")
+    assert blocks[1]["text"] == "JOB: Planner at Acme"
+
+
+def test_adapter_sends_prompt_without_marker(monkeypatch):
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "stub")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {})
+    monkeypatch.setattr(llm_rate_limiter, "_limiters", {})
+    adapter = AIAdapter({}, "")
+
+    assert CACHE_BREAKPOINT not in adapter.invoke(PROMPT).content
+
+
+def test_cached_tokens_are_read_from_each_provider_format():
+    openai = AIMessage(content="", response_metadata={"token_usage": {"prompt_tokens_details": {"cached_tokens": 1024}}})
+    claude = AIMessage(content="", response_metadata={"usage": {"cache_read_input_tokens": 2048}})
+    gemini = AIMessage(content="", response_metadata={"usage_metadata": {"cached_content_token_count": 512}})
+
+    assert [cached_input_tokens(m) for m in (openai, claude, gemini, AIMessage(content=""))] == [1024, 2048, 512, 0]
+
+
+def test_stats_report_hit_rate_and_saving_per_task(monkeypatch):
+    monkeypatch.setattr(cfg, "LLM_PRICING", {"gpt-4o-mini": (0.000001, 0.000002)})
+    reset_prompt_cache_stats()
+    usage = {"input_tokens": 2000, "output_tokens": 10, "total_tokens": 2010}
+    cold = AIMessage(content="", usage_metadata=usage)
+    warm = AIMessage(
+        content="", usage_metadata=usage,
+        response_metadata={"token_usage": {"prompt_tokens_details": {"cached_tokens": 1500}}},
+    )
+
+    record_prompt_cache("ats_scoring", "openai", "gpt-4o-mini", cold)
+    record_prompt_cache("ats_scoring", "openai", "gpt-4o-mini", warm)
+
+    stats = prompt_cache_stats()["ats_scoring"]
+    assert (stats["calls"], stats["hits"], stats["hit_rate"]) == (2, 1, 0.5)
+    assert stats["cached_share"] == 0.375
+    assert stats["saved_usd"] == round(1500 * 0.000001 * 0.5, 6)
+    reset_prompt_cache_stats()
+
+
+def test_stable_tasks_get_the_same_context_for_every_job(monkeypatch):
+    monkeypatch.setattr(cfg, "RESUME_CONTEXT_STABLE_TASKS", ("ats_scoring",))
+    context = ResumeContext({"experience_details": [
+        {"position": "Planner", "key_responsibilities": [{"r": f"Bullet about topic{i} " * 4} for i in range(20)]}
+    ]})
+
+    first = context.select("topic3 planner", "ats_scoring", budget_tokens=60)
+    second = context.select("topic17 planner", "ats_scoring", budget_tokens=60)
+
+    assert first == second
+    assert context.select("topic3", "options_matching", budget_tokens=60) != context.select(
+        "topic17", "options_matching", budget_tokens=60
+    )
@@ -0,0 +1,72 @@
+import threading
+
+from langchain_core.messages.ai import AIMessage
+
+import config as cfg
+import src.libs.job_summarizer as job_summarizer
+from src.libs.job_summarizer import JobSummaryCache
+from src.libs.llm_manager import AIAdapter, AIModel, GPTAnswerer, PromptRegistry, prompts
+
+
+class EchoModel(AIModel):
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return AIMessage(
+            content="Experience Details",
+            response_metadata={"model_name": "echo"},
+            usage_metadata={"input_tokens": 1, "output_tokens": 1, "total_tokens": 2},
+        )
+
+
+def _answerer(monkeypatch, tmp_path):
+    model = EchoModel()
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "ANSWER_MEMORY_ENABLED", False)
+    monkeypatch.setattr(job_summarizer, "_cache", JobSummaryCache(tmp_path / "summaries.sqlite3"))
+    monkeypatch.setattr(cfg, "LLM_CALL_LOG_PATH", "/dev/null")
+    monkeypatch.setattr(cfg, "SECTION_ROUTER_ENABLED", False)
+    monkeypatch.setattr(AIAdapter, "_create_model", lambda self, config, api_key: model)
+    return GPTAnswerer({}, "key"), model
+
+
+def test_registry_compiles_each_template_once_across_threads():
+    registry = PromptRegistry(prompts)
+    results = []
+
+    def worker():
+        results.append(registry.get("options_template"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(r) for r in results}) == 1
+    registry.warm()
+    assert set(registry._compiled) == set(registry.template_names())
+    assert "summarize_prompt_template" in registry.template_names()
+
+
+def test_summarize_leaves_prompts_untouched(monkeypatch, tmp_path):
+    answerer, model = _answerer(monkeypatch, tmp_path)
+    original = prompts.summarize_prompt_template
+
+    answerer.summarize_job_description("first job")
+    answerer.summarize_job_description("second job")
+
+    assert prompts.summarize_prompt_template is original
+    assert "second job" in model.prompts[-1].to_string()
+
+
+def test_textual_answer_uses_only_the_chains_it_needs(monkeypatch, tmp_path):
+    answerer, _model = _answerer(monkeypatch, tmp_path)
+    answerer.set_resume(type("Resume", (), {"experience_details": "5 years of Python"})())
+    answerer.set_job_application_profile(None)
+
+    answerer.answer_question_textual_wide_range("Describe your experience")
+
+    assert set(answerer._chains) == {"determine_section_template", "experience_details_template"}
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+
+import config as cfg
+from src.libs.resume_context import (
+    BM25Index,
+    ResumeContext,
+    context_stats,
+    reset_context_stats,
+)
+
+RESUME_YAML = (Path(__file__).resolve().parents[1] / "data_folder_example" / "plain_text_resume.yaml").read_text()
+
+RESUME = {
+    "personal_information": {"name": "Ada", "city": "Milan", "github": None},
+    "experience_details": [
+        {
+            "position": "Operations Manager",
+            "company": "Acme",
+            "employment_period": "06/2019 - Present",
+            "key_responsibilities": [
+                {"responsibility": "Cut inventory carrying cost 12% with SAP demand planning"},
+                {"responsibility": "Ran weekly S&OP meetings across five plants"},
+                {"responsibility": "Hired and coached a team of nine planners"},
+            ],
+            "skills_acquired": ["SAP", "S&OP", "Lean"],
+        },
+        {
+            "position": "Buyer",
+            "company": "Globex",
+            "employment_period": "2015 - 2019",
+            "key_responsibilities": [{"responsibility": "Negotiated vendor contracts worth $4M"}],
+        },
+    ],
+    "interests": ["Sailing", "Chess"],
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    reset_context_stats()
+    yield
+    reset_context_stats()
+
+
+def test_bm25_ranks_matching_document_first():
+    index = BM25Index(["sap demand planning", "vendor contracts", "sailing and chess"])
+    scores = index.scores("Do you know SAP?")
+    assert scores[0] > 0 and scores[1] == scores[2] == 0
+
+
+def test_canonical_form_drops_empty_fields_and_yaml_comments():
+    context = ResumeContext.from_yaml("# exported from the web UI\n" + RESUME_YAML)
+    assert "exported" not in context.text
+    assert not [line for line in context.text.splitlines() if line.startswith("# ")]
+    assert context.tokens < context.baseline_tokens
+    assert "None" not in ResumeContext(RESUME).text
+
+
+def test_select_keeps_relevant_bullets_and_every_heading_within_budget():
+    context = ResumeContext(RESUME)
+
+    text = context.select("Years of experience with SAP?", "options_matching", budget_tokens=60)
+
+    assert "SAP demand planning" in text
+    assert "Operations Manager | Acme | 06/2019 - Present" in text
+    assert "Buyer | Globex | 2015 - 2019" in text
+    assert "Hired and coached" not in text
+    assert "Sailing" not in text
+
+
+def test_unmatched_query_falls_back_to_resume_order():
+    text = ResumeContext(RESUME).select("zzz", budget_tokens=30)
+    assert text.startswith("## personal_information\n- name: Ada")
+
+
+def test_stable_context_keeps_skill_lines_when_the_resume_does_not_fit(monkeypatch):
+    monkeypatch.setattr(cfg, "RESUME_CONTEXT_STABLE_TASKS", ("ats_scoring",))
+    resume = {
+        **RESUME,
+        "experience_details": RESUME["experience_details"] + [
+            {"position": f"Clerk {i}", "key_responsibilities": [{"responsibility": f"Filed paperwork batch {i} " * 3}]}
+            for i in range(10)
+        ],
+        "skills": ["Kubernetes", "Terraform"],
+        "certifications": [{"name": "APICS CPIM"}],
+    }
+    context = ResumeContext(resume)
+
+    text = context.select("any job", "ats_scoring", budget_tokens=100)
+
+    assert context.tokens > 100
+    assert "Kubernetes" in text and "APICS CPIM" in text
+    assert "skills_acquired: SAP, S&OP, Lean" in text
+    assert text == context.select("another job", "ats_scoring", budget_tokens=100)
+
+
+def test_budget_per_task_and_savings_are_reported(monkeypatch):
+    monkeypatch.setattr(cfg, "RESUME_CONTEXT_TOKEN_BUDGETS", {"ats_scoring": 50})
+    context = ResumeContext.from_yaml(RESUME_YAML)
+
+    text = context.select("Python developer, web development, automated testing", "ats_scoring")
+
+    stats = context_stats()["ats_scoring"]
+    assert stats["calls"] == 1
+    assert stats["context_tokens"] == len(text) // 4
+    assert stats["saved_tokens"] == context.baseline_tokens - stats["context_tokens"]
+    assert 0 < stats["saved_rate"] < 1
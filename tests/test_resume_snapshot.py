@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from src.libs.ats_scorer import ATSScorer
+from src.libs.resume_converter import resume_to_text
+from src.libs.resume_parser import extract_positions, extract_skills, extract_summary, load_resume
+from src.libs.resume_snapshot import invalidate_snapshots, reset_snapshot_stats, resume_snapshot, snapshot_stats
+
+RESUME = """
+personal_information:
+  name: Alex
+experience_details:
+  - position: Operations Manager
+    company: Acme Logistics
+    industry: Logistics
+    key_responsibilities:
+      - responsibility: Ran warehouse inventory planning
+    skills_acquired:
+      - SAP
+      - S&OP
+"""
+
+
+@pytest.fixture
+def resume(tmp_path):
+    invalidate_snapshots()
+    reset_snapshot_stats()
+    path = tmp_path / "resume.yaml"
+    path.write_text(RESUME)
+    return path
+
+
+def _rewrite(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_snapshot_holds_every_derived_view(resume):
+    snapshot = resume_snapshot(resume)
+    assert snapshot.text == RESUME
+    assert snapshot.data["personal_information"]["name"] == "Alex"
+    assert snapshot.positions == ["Operations Manager"]
+    assert snapshot.skills == ["SAP", "S&OP"]
+    assert snapshot.industries == ["Logistics"]
+    assert "[Experience] Operations Manager at Acme Logistics" in snapshot.flat_text
+    assert snapshot.tokens > snapshot.flat_tokens > 0
+
+
+def test_a_batch_parses_the_resume_once(resume):
+    scorer = ATSScorer(None)
+    for i in range(100):
+        scorer.heuristic_scores(resume, [f"Operations manager {i}: inventory planning and SAP."])
+        resume_to_text(resume)
+    extract_positions(resume)
+    extract_skills(resume)
+    extract_summary(resume)
+
+    stats = snapshot_stats()
+    assert stats["loads"] == 1
+    assert stats["hits"] >= 200
+
+
+def test_changed_file_is_reparsed_and_touched_file_is_not(resume):
+    first = resume_snapshot(resume)
+    _rewrite(resume, RESUME, 1_000_000_000)
+    assert resume_snapshot(resume) is first
+    assert snapshot_stats()["rereads"] == 1
+
+    _rewrite(resume, RESUME.replace("Operations Manager", "Logistics Director"), 2_000_000_000)
+    assert resume_snapshot(resume).positions == ["Logistics Director"]
+    assert extract_positions(resume) == ["Logistics Director"]
+    assert snapshot_stats()["loads"] == 2
+
+
+def test_callers_cannot_corrupt_the_shared_snapshot(resume, tmp_path):
+    load_resume(resume)["experience_details"].clear()
+    extract_positions(resume).append("Astronaut")
+    assert resume_snapshot(resume).positions == ["Operations Manager"]
+    assert resume_snapshot(resume).data["experience_details"]
+
+    with pytest.raises(OSError):
+        resume_snapshot(tmp_path / "missing.yaml")
+    assert extract_positions(tmp_path / "missing.yaml") == []
+    assert resume_to_text(tmp_path / "missing.yaml") == ""
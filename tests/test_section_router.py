@@ -0,0 +1,72 @@
+from langchain_core.messages.ai import AIMessage
+
+import config as cfg
+import src.libs.job_summarizer as job_summarizer
+import src.libs.section_router as section_router
+from src.libs.job_summarizer import JobSummaryCache
+from src.libs.llm_manager import AIAdapter, AIModel, GPTAnswerer
+from src.libs.section_router import RouteDecision, SectionRouter
+
+
+class ScriptedModel(AIModel):
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return AIMessage(
+            content=self.replies.pop(0),
+            response_metadata={"model_name": "scripted"},
+            usage_metadata={"input_tokens": 1, "output_tokens": 1, "total_tokens": 2},
+        )
+
+
+def test_clear_questions_route_locally_with_high_confidence():
+    router = SectionRouter()
+    cases = {
+        "What are your salary expectations?": "salary_expectations",
+        "Will you now or in the future require visa sponsorship?": "legal_authorization",
+        "How many years of experience do you have with Python?": "experience_details",
+        "What is your notice period?": "availability",
+        "Which languages do you speak fluently?": "languages",
+    }
+    for question, expected in cases.items():
+        decision = router.route(question)
+        assert decision.section == expected
+        assert router.is_confident(decision)
+
+
+def test_llm_labels_are_logged_and_reloaded_as_training_data(tmp_path):
+    log_path = tmp_path / "routes.jsonl"
+    router = SectionRouter(threshold=0.5, log_path=log_path)
+    question = "Do you enjoy mentoring junior colleagues?"
+    decision = router.route(question)
+
+    router.record(question, decision, llm_section="interests")
+    section_router.get_call_log_writer(log_path).flush()
+
+    stats = router.stats()
+    assert stats["llm"] == 1 and stats["labelled"] == 1
+    reloaded = SectionRouter(threshold=0.5, log_path=log_path)
+    assert reloaded.stats()["examples"] == 1
+    assert reloaded.route(question) == RouteDecision("interests", reloaded.route(question).confidence, "tfidf")
+
+
+def test_answerer_skips_classifier_call_for_confident_route(monkeypatch, tmp_path):
+    model = ScriptedModel(["I expect 120k."])
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "ANSWER_MEMORY_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_CALL_LOG_PATH", str(tmp_path / "calls.jsonl"))
+    monkeypatch.setattr(job_summarizer, "_cache", JobSummaryCache(tmp_path / "summaries.sqlite3"))
+    monkeypatch.setattr(section_router, "_router", SectionRouter())
+    monkeypatch.setattr(AIAdapter, "_create_model", lambda self, config, api_key: model)
+    answerer = GPTAnswerer({}, "key")
+    answerer.set_resume(type("Resume", (), {"salary_expectations": "120k"})())
+    answerer.set_job_application_profile(None)
+
+    answer = answerer.answer_question_textual_wide_range("What is your expected salary?")
+
+    assert answer == "I expect 120k."
+    assert model.calls == 1
+    assert "determine_section_template" not in answerer._chains
@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from src.libs.structured_output import (
+    JSONStreamParser,
+    StructuredOutput,
+    StructuredOutputError,
+    loads_lenient,
+    repair_json,
+    reset_structured_output_stats,
+    structured_output_stats,
+)
+
+
+class Score(BaseModel):
+    score: int
+    missing_keywords: list = []
+
+
+class FakeAdapter:
+    supports_json_mode = True
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+        self.json_modes = []
+
+    def invoke(self, prompt, json_mode=False):
+        self.prompts.append(prompt)
+        self.json_modes.append(json_mode)
+        return self.replies.pop(0)
+
+    async def ainvoke(self, prompt, json_mode=False):
+        return self.invoke(prompt, json_mode)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    reset_structured_output_stats()
+    yield
+    reset_structured_output_stats()
+
+
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        ('Sure! ```json\n{"score": 80, "missing_keywords": ["SAP",],}\n``` Hope it helps', {"score": 80, "missing_keywords": ["SAP"]}),
+        ('{"summary": "He said "hi" to me", "ok": True, "gap": None}', {"summary": 'He said "hi" to me', "ok": True, "gap": None}),
+        ('{"summary": "line one\nline two"}', {"summary": "line one\nline two"}),
+        ('{"score": 72, "missing_keywords": ["SAP", "Oracle", "Tab', {"score": 72, "missing_keywords": ["SAP", "Oracle"]}),
+        ('{"score": 72, "match_summary": "Strong op', {"score": 72}),
+    ],
+)
+def test_repair_json(reply, expected):
+    assert json.loads(repair_json(reply)) == expected
+
+
+def test_clean_json_is_not_marked_repaired():
+    assert loads_lenient('Here: {"score": 1} trailing prose') == ({"score": 1}, False)
+    with pytest.raises(ValueError):
+        loads_lenient("no json here")
+
+
+def test_reasks_once_with_the_validation_error():
+    adapter = FakeAdapter('{"score": "high"}', '{"score": 85}')
+
+    result = StructuredOutput(Score, "ats_scoring").invoke(adapter, "Score it")
+
+    assert result.score == 85
+    assert adapter.json_modes == [True, True]
+    assert "score" in adapter.prompts[1] and "JSON schema" in adapter.prompts[1]
+    assert structured_output_stats()["ats_scoring"]["reasked"] == 1
+
+
+def test_second_failure_raises_and_counts():
+    adapter = FakeAdapter("not json", "still not json")
+
+    with pytest.raises(StructuredOutputError):
+        asyncio.run(StructuredOutput(Score, "briefing").ainvoke(adapter, "Brief me"))
+
+    stats = structured_output_stats()["briefing"]
+    assert stats["failed"] == 1 and stats["failure_rate"] == 1.0
+    assert len(adapter.prompts) == 2
+
+
+def test_rejected_replies_are_dropped_from_the_response_cache(monkeypatch, tmp_path):
+    import config as cfg
+    from src.libs.llm_cache import LLMResponseCache
+    from src.libs.llm_manager import AIAdapter
+
+    monkeypatch.setattr(cfg, "LLM_MODEL_TYPE", "stub")
+    monkeypatch.setattr(cfg, "LLM_MODEL", "primary")
+    monkeypatch.setattr(cfg, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(cfg, "LLM_MODEL_TIERS", {})
+    adapter = AIAdapter({}, "")
+    adapter.cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+    adapter.model.reply = "not json"
+
+    with pytest.raises(StructuredOutputError):
+        StructuredOutput(Score, "ats_scoring").invoke(adapter, "Score it")
+    assert adapter.cache.stats()["entries"] == 0
+
+    adapter.model.reply = '{"score": 70}'
+    assert StructuredOutput(Score, "ats_scoring").invoke(adapter, "Score it").score == 70
+    assert adapter.cache.stats()["entries"] == 1
+
+
+def test_stats_split_clean_and_repaired():
+    parser = StructuredOutput(Score, "ats_scoring")
+    parser.invoke(FakeAdapter('{"score": 1}'), "a")
+    parser.invoke(FakeAdapter('{"score": 2,}'), "b")
+
+    stats = structured_output_stats()["ats_scoring"]
+    assert (stats["calls"], stats["clean"], stats["repaired"], stats["parse_failure_rate"]) == (2, 1, 1, 0.0)
+
+
+def test_stream_parser_yields_growing_partial_objects():
+    parser = JSONStreamParser()
+    seen = [parser.feed(chunk) for chunk in ['{"score": 7', '0, "missing_keywords": ["S', 'AP"]}']]
+
+    assert seen[0] == {}
+    assert seen[1] == {"score": 70, "missing_keywords": []}
+    assert seen[2] == {"score": 70, "missing_keywords": ["SAP"]}
+
+
+def test_stream_parser_waits_for_text_split_across_chunks():
+    parser = JSONStreamParser()
+    seen = [parser.feed(chunk) for chunk in ['{"quote": "say "', 'hi" now", "ok": Tr', 'ue}']]
+
+    assert seen[0] == {}
+    assert seen[1] == {"quote": 'say "hi" now'}
+    assert seen[2] == {"quote": 'say "hi" now', "ok": True}